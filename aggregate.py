@@ -0,0 +1,108 @@
+import threading
+import weakref
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from schema import numeric_values
+
+# ==============================================================================
+# [집계] 담당 선관위 x 구분(총학생회/단과대/학과) 롤업을 스냅샷당 한 번만 계산
+# ==============================================================================
+# - 선거 단위 -> 담당 선관위는 ELECTION_DB 매핑으로 이미 정해져 있고(담당 선관위 컬럼),
+#   구분은 enrich.py의 파생 컬럼(is_college)으로 정함
+# - (선관위, 구분) 칸별 합계를 칸 번호 bincount(grouped reduction) 한 번으로 만든 뒤, 선관위별/구분별 합계와 요약표 칸은 그 칸들을 다시 더해서 얻음
+# - 결과는 스냅샷 객체마다 기억: 워커가 발행할 때 한 번 계산하면 실시간 표(diff.py)와 모든 세션은 같은 결과를 읽음
+#   (발행된 스냅샷은 읽기 전용이라 같은 객체의 값이 바뀌지 않음, schema.py)
+
+TIERS = ['총학생회', '단과대', '학과']
+
+# 요약표 칸: 총학생회/단과대/학과 증가분, value(총학생회 잔여 인원 - 합산 대상 잔여 인원 합)
+SUMMARY_CELLS = ['inc_total', 'inc_college', 'inc_dept', 'value']
+
+# 칸별 합계 컬럼 (투표자 수/총 유권자는 투표율을 계산할 수 있는 행만 더함)
+SUM_COLUMNS = ['단위 수', '투표자 수', '총 유권자', '증가', '잔여 인원', '합산 대상 잔여', '성사 단위']
+COMMISSION_COLUMNS = ['단위 수', '투표율', '투표자 수', '총 유권자', '증가', '잔여 인원', '성사 단위']
+
+
+class Rollup(NamedTuple):
+    groups: pd.DataFrame          # (담당 선관위, 구분) -> SUM_COLUMNS
+    by_commission: pd.DataFrame   # 담당 선관위 -> COMMISSION_COLUMNS (선관위 표시 순서)
+    by_tier: pd.DataFrame         # 구분 -> SUM_COLUMNS (TIERS 순서, 없는 구분은 0)
+    summary: dict                 # SUMMARY_CELLS -> 정수
+
+
+def _commission_codes(col):
+    """(행별 선관위 번호, 선관위 이름 목록) - 범주형이면 카테고리 순서(ORDER_LIST) 그대로, 결측은 맨 뒤 번호"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes, names = col.cat.codes.to_numpy().astype(np.int64), list(col.cat.categories)
+    else:
+        codes, names = pd.factorize(col, sort=True)
+        names = list(names)
+    return np.where(codes < 0, len(names), codes), names + [np.nan]
+
+
+def _compute(df):
+    units = df['선거 단위']
+    is_total = (units == '총학생회').fillna(False).to_numpy(dtype=bool)
+    tier = np.where(is_total, 0, np.where(df['is_college'].to_numpy(dtype=bool), 1, 2))
+    voted, total = numeric_values(df['투표자 수']), numeric_values(df['총 유권자'])
+    counted = (total > 0) & ~np.isnan(voted)
+    remaining = numeric_values(df['remaining_clipped'])
+    codes, names = _commission_codes(df['담당 선관위'])
+
+    # (선관위, 구분) 칸 번호별 합계를 bincount 한 번씩으로 계산 -> [선관위, 구분, 컬럼] 격자
+    key, size = codes * len(TIERS) + tier, len(names) * len(TIERS)
+    weights = [np.ones(len(df)), np.where(counted, voted, 0), np.where(counted, total, 0), np.nan_to_num(numeric_values(df['증가'])),
+               remaining, np.where(df['is_target'].to_numpy(dtype=bool), remaining, 0), numeric_values(df['투표 성사 잔여 인원']) <= 0]
+    grid = np.stack([np.bincount(key, weights=w, minlength=size) for w in weights], axis=1)
+    grid = grid.round().astype(np.int64).reshape(len(names), len(TIERS), len(SUM_COLUMNS))
+
+    filled = grid[:, :, 0] > 0
+    used = filled.any(axis=1)
+    used_names, renumber = [n for n, u in zip(names, used) if u], np.cumsum(used) - 1
+    comm_idx, tier_idx = np.nonzero(filled)
+    comm_codes = np.where(used[-1] & (comm_idx == len(names) - 1), -1, renumber[comm_idx])  # 선관위 결측은 MultiIndex에서 -1
+    levels = used_names[:-1] if used[-1] else used_names
+    groups = pd.DataFrame(grid[filled], columns=SUM_COLUMNS, index=pd.MultiIndex(
+        levels=[pd.Index(levels, dtype=object), TIERS], codes=[comm_codes, tier_idx], names=['담당 선관위', '구분']))
+
+    per_commission = grid.sum(axis=1)[used]
+    voted_sum, total_sum = per_commission[:, 1], per_commission[:, 2]
+    turnout = np.where(total_sum > 0, np.round(voted_sum / np.maximum(total_sum, 1) * 100, 2), np.nan)
+    by_commission = pd.DataFrame(dict(zip(SUM_COLUMNS, per_commission.T), 투표율=turnout), columns=COMMISSION_COLUMNS,
+                                 index=pd.Index(used_names, name='담당 선관위', dtype=object))
+    tiers = grid.sum(axis=0)
+    by_tier = pd.DataFrame(tiers, columns=SUM_COLUMNS, index=pd.Index(TIERS, name='구분'))
+
+    inc, rem, target_rem = (tiers[:, SUM_COLUMNS.index(c)] for c in ('증가', '잔여 인원', '합산 대상 잔여'))
+    summary = dict(zip(SUMMARY_CELLS, map(int, (inc[0], inc[1], inc[2], rem[0] - target_rem.sum()))))
+    return Rollup(groups, by_commission, by_tier, summary)
+
+
+_memo = {}    # id(스냅샷) -> (weakref, Rollup)
+_memo_lock = threading.RLock()  # 약한 참조 콜백(_forget)이 잠금을 잡은 스레드에서 실행될 수 있음
+
+
+def _forget(key, ref):
+    with _memo_lock:
+        if key in _memo and _memo[key][0] is ref: del _memo[key]
+
+
+def rollup(df):
+    """스냅샷의 Rollup (같은 스냅샷 객체에는 처음 계산한 결과를 그대로 반환)"""
+    key = id(df)
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit is not None and hit[0]() is df: return hit[1]
+    result = _compute(df)
+    with _memo_lock:
+        ref = weakref.ref(df, lambda r, key=key: _forget(key, r))
+        _memo[key] = (ref, result)
+    return result
+
+
+def summary_values(df):
+    """요약표 칸 이름 -> 정수 값 (SUMMARY_CELLS 순서)"""
+    return rollup(df).summary
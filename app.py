@@ -1,25 +1,7 @@
 import streamlit as st
-import pandas as pd
 import time
-import re
-import os
-import traceback
-import pytz # [추가] 시간대 처리를 위한 라이브러리
+import atexit
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-
-# [중요] mapping_db.py가 같은 폴더에 있어야 합니다.
-try:
-    from mapping_db import get_commission, is_target_unit, TARGET_UNITS
-except ImportError:
-    st.error("❌ 'mapping_db.py' 파일을 찾을 수 없습니다. 같은 폴더에 있는지 확인해주세요.")
-    st.stop()
 
 st.set_page_config(page_title="연세대학교 선거 현황", layout="wide")
 
@@ -105,6 +87,11 @@ def apply_custom_css():
             font-size: 14px;
             transform: translateY(-1px);
         }
+        .update-time-box.stale {
+            background-color: #fffbeb;
+            border-color: #b45309;
+            color: #b45309;
+        }
         
         div.stButton > button {
             width: 100%;
@@ -135,261 +122,119 @@ def apply_custom_css():
 
 apply_custom_css()
 
+col_header, col_summary = st.columns([2, 1.2], vertical_alignment="center")
+with col_header: st.title("🦅 연세대학교 선거 실시간 현황")
+
 # ==============================================================================
-# 크롤링 함수 (디버깅 로직 추가)
+# [지연 import] 화면 골격(CSS/제목)을 먼저 그린 뒤 데이터 처리 모듈을 불러옴
 # ==============================================================================
-def get_data_from_server(debug_container=None):
-    url = "https://election.yonsei.ac.kr/votes"
-    
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless") 
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-
-    # [추가] 한국어 설정
-    options.add_argument("--lang=ko_KR")
-    prefs = {"intl.accept_languages": "ko,ko_KR"}
-    options.add_experimental_option("prefs", prefs)
-
-    # 디버깅 로그 함수
-    def log(msg):
-        if debug_container:
-            debug_container.write(f"🔹 {msg}")
-        print(msg)
-
-    driver = None
-    try:
-        # 드라이버 실행 시도
-        if os.path.exists("/usr/bin/chromium") and os.path.exists("/usr/bin/chromedriver"):
-            log("서버 환경(Linux) 감지됨. /usr/bin/chromedriver 사용")
-            options.binary_location = "/usr/bin/chromium"
-            service = Service("/usr/bin/chromedriver")
-            driver = webdriver.Chrome(service=service, options=options)
-        else:
-            log("로컬 환경(Windows/Mac) 감지됨. WebDriver Manager 사용")
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    except Exception as e:
-        st.error(f"❌ 브라우저 실행 실패! 드라이버 설정을 확인하세요.\n{e}")
-        st.code(traceback.format_exc())
-        return pd.DataFrame()
-    
-    try:
-        log(f"사이트 접속 시도: {url}")
-        driver.get(url)
-        
-        try:
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "card-custom")))
-            log("✅ 요소('card-custom') 로딩 감지 성공!")
-            time.sleep(1)
-        except:
-            log("⚠️ 타임아웃: 'card-custom' 요소를 찾지 못했습니다. (로딩이 느리거나 구조가 다름)")
-            pass
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        all_cards = soup.find_all('div', class_='card-custom')
-        log(f"🔍 발견된 카드(div.card-custom) 개수: {len(all_cards)}개")
-        
-        if not all_cards:
-            st.error("❌ 선거 정보 카드를 하나도 찾지 못했습니다! (빈 페이지거나 차단됨)")
-            st.warning(f"현재 페이지 제목: {driver.title}")
-            return pd.DataFrame()
-
-        data_list = []
-        log("데이터 파싱 시작...")
-
-        for i, card in enumerate(all_cards):
-            if not card.find('h4'): continue
-
-            prev_header = card.find_previous('h3')
-            if prev_header and "진행중" in prev_header.get_text(strip=True):
-                raw_name = card.find('h4').get_text(strip=True)
-                
-                clean_name = re.sub(r"연세대학교|제\d+대", "", raw_name).strip()
-                if "총학생회" in clean_name: clean_name = "총학생회"
-                elif "총동아리연합회" in clean_name: clean_name = "총동아리연합회"
-                elif "외국인" in clean_name: clean_name = "외국인 학생회"
-                elif "아동" in clean_name and "가족" in clean_name: clean_name = "아동가족학과"
-                elif "상경·경영대학" in clean_name:
-                    if "총투표" in clean_name: pass 
-                    else: clean_name = "상경·경영대학" 
-                else:
-                    remove_list = ["이과대학", "2026년도", "2026학년도", "선거운동본부", "학생회 선거", "학생회", "선거"]
-                    for word in remove_list: clean_name = clean_name.replace(word, "")
-                clean_name = " ".join(clean_name.split())
-                
-                commission_name = get_commission(clean_name)
-                if commission_name == "기타/공통": commission_name = get_commission(raw_name)
-
-                rate, voted, total, remaining = None, None, None, None
-                
-                # [하이브리드 파싱] 1단계: 태그 구조
-                labels = card.find_all('p') # 모든 p 태그 검색 (클래스 무관)
-                for label in labels:
-                    text = label.get_text(strip=True)
-                    val_tag = label.find_next_sibling('h5')
-                    if not val_tag: continue
-                    
-                    val = val_tag.get_text(strip=True)
-                    if "투표율" in text:
-                        if '(' in val:
-                            parts = val.split('(')
-                            try:
-                                rate = float(parts[0].replace('%', '').strip())
-                                voted = int(parts[1].replace('명', '').replace(')', '').replace(',', '').strip())
-                            except: pass
-                        else:
-                            try: rate = float(val.replace('%', '').strip())
-                            except: pass
-                    elif "총 유권자" in text:
-                        try: total = int(val.replace('명', '').replace(',', '').strip())
-                        except: pass
-                    elif "투표 성사" in text or "남은 투표" in text:
-                        try: remaining = int(val.replace('명', '').replace(',', '').strip())
-                        except: pass
-                
-                # [하이브리드 파싱] 2단계: Regex 비상망
-                if rate is None and total is None:
-                    card_text = card.get_text(" ", strip=True)
-                    rate_match = re.search(r'([\d\.]+)\s*%', card_text)
-                    if rate_match:
-                        try: rate = float(rate_match.group(1))
-                        except: pass
-                    total_match = re.search(r'총\s*유권자.*?([\d,]+)\s*명', card_text)
-                    if total_match:
-                        try: total = int(total_match.group(1).replace(',', ''))
-                        except: pass
-                    if voted is None and rate is not None and total is not None:
-                        voted = int(total * (rate / 100))
-
-                # 데이터 추가 (일부 정보라도 있으면 추가)
-                if rate is not None or total is not None:
-                    data_list.append({
-                        "담당 선관위": commission_name, "선거 단위": clean_name,
-                        "투표율": rate, "투표자 수": voted, "총 유권자": total, "투표 성사 잔여 인원": remaining
-                    })
-
-                if clean_name == "외국인 학생회": break
-        
-        log(f"✅ 파싱 완료: 총 {len(data_list)}건 추출됨")
-        
-        df = pd.DataFrame(data_list)
-        if not df.empty:
-            df['orig_index'] = df.index
-            ORDER_LIST = [
-                "중앙선거관리위원회", "총동아리연합회", "문과대학", "상경·경영대학", "이과대학",
-                "공과대학", "인공지능융합대학", "신과대학", "사회과학대학", "생명시스템대학", "음악대학",
-                "생활과학대학", "교육과학대학", "체육계열", "의과대학", "치과대학", 
-                "간호대학", "약학대학", "언더우드국제대학", "글로벌인재대학"
-            ]
-            df['commission_order'] = pd.Categorical(df['담당 선관위'], categories=ORDER_LIST, ordered=True)
-            df = df.sort_values(by=['commission_order', 'orig_index'])
-            df = df.drop(columns=['orig_index', 'commission_order'])
-            df.insert(0, '일련번호', range(1, len(df) + 1))
-            
-        return df
-
-    except Exception as e:
-        st.error(f"❌ 실행 중 치명적 오류 발생: {e}")
-        st.code(traceback.format_exc())
-        return pd.DataFrame()
-    finally:
-        if driver:
-            driver.quit()
-
-def process_new_data(new_df):
-    if 'data' in st.session_state and not st.session_state['data'].empty:
-        old_df = st.session_state['data']
-        if '선거 단위' in old_df.columns and '투표자 수' in old_df.columns:
-            old_map = dict(zip(old_df['선거 단위'], old_df['투표자 수']))
-            diffs = []
-            for _, row in new_df.iterrows():
-                unit = row['선거 단위']
-                curr = row['투표자 수']
-                if pd.notna(curr):
-                    prev = old_map.get(unit)
-                    diff = (curr - prev) if (prev is not None and pd.notna(prev)) else 0
-                else:
-                    diff = 0
-                diffs.append(diff)
-            new_df['증가'] = diffs
-        else: new_df['증가'] = 0
-    else: new_df['증가'] = 0
-    return new_df
-
-def create_html_table(df):
-    html = '<table class="custom-table"><thead><tr>'
-    for col in ['No.', '담당 선관위', '선거 단위', '투표율', '투표자 수', '증가', '총 유권자', '투표 성사 잔여 인원']:
-        html += f'<th>{col}</th>'
-    html += '</tr></thead><tbody>'
-    for _, row in df.iterrows():
-        remaining = row['투표 성사 잔여 인원']
-        voted = row['투표자 수']
-        diff = row.get('증가', 0)
-        row_class = "default-row"
-        if not pd.isna(remaining):
-            if remaining <= 0: row_class = "success-row"
-            elif not pd.isna(voted) and voted > 0 and remaining <= (voted * 0.2): row_class = "warning-row"
-        
-        diff_html = "-"
-        if diff > 0: diff_html = f'<span style="color: #e11d48; font-weight: bold;">▲ {int(diff):,}</span>'
-        
-        unit_display = row['선거 단위']
-        if is_target_unit(unit_display): unit_display = f'<span class="target-highlight">{unit_display}</span>'
-
-        html += f'<tr class="{row_class}">'
-        html += f"<td>{row['일련번호']}</td><td>{row['담당 선관위']}</td><td>{unit_display}</td>"
-        html += f"<td>{row['투표율']:.2f}%" if not pd.isna(row['투표율']) else "<td>-</td>"
-        html += f"<td>{int(row['투표자 수']):,}</td>" if not pd.isna(row['투표자 수']) else "<td>-</td>"
-        html += f"<td>{diff_html}</td>"
-        html += f"<td>{int(row['총 유권자']):,}</td>" if not pd.isna(row['총 유권자']) else "<td>-</td>"
-        html += f"<td>{int(remaining):,}</td>" if not pd.isna(remaining) else "<td>-</td>"
-        html += '</tr>'
-    html += '</tbody></table>'
-    return html
+# 크롤링 의존성(requests, lxml, bs4, selenium)은 여기서 불러오지 않습니다.
+# 워커가 실제로 수집을 시작할 때 워커 스레드에서 처음 import됩니다. (bench/bench_startup.py)
+# [중요] mapping_db.py와 election_config.toml이 같은 폴더에 있어야 합니다.
+try:
+    import pandas as pd
+    import metrics
+    import live
+    from aggregate import rollup
+    from export import EXPORT_CACHE, XLSX_MIME, view_key
+    from render import create_html_table
+    from schema import SORT_KEYS, map_units, to_snapshot, view_rows
+    from worker import FetchWorker, KST
+    from history import SnapshotStore
+except ImportError as e:
+    # 실제로 불러오지 못한 모듈 이름을 보여줌 (같은 폴더의 .py 파일 누락 또는 패키지 미설치)
+    st.error(f"❌ '{e.name or e}' 모듈을 불러오지 못했습니다. 같은 폴더에 '{e.name}.py'가 있는지, 또는 requirements.txt의 패키지가 설치되어 있는지 확인해주세요.")
+    st.stop()
+except ValueError as e:  # mapping_db.ConfigError: 설정 파일이 없거나 읽을 수 없거나 형식이 틀림
+    st.error(f"❌ 매핑 설정을 불러오지 못했습니다. election_config.toml이 같은 폴더에 있는지(또는 ELECTION_CONFIG_PATH), 형식이 올바른지 확인해주세요.\n\n{e}")
+    st.stop()
+
+AUTO_REFRESH_POLL = 10  # 자동 갱신 시 화면이 최신 스냅샷을 다시 읽는 주기 (초)
+MANUAL_REFRESH_WAIT = 15  # 수동 업데이트 버튼이 결과를 기다리는 최대 시간 (초, 넘으면 백그라운드에서 계속 확인)
+
+# '증가' 컬럼 집계 구간 (None: 직전 갱신 대비, 숫자: 최근 N분, 0: 기록 시작 이후)
+DELTA_WINDOWS = {"직전 갱신 대비": None, "최근 10분": 10, "최근 30분": 30, "최근 1시간": 60, "기록 시작 이후": 0}
 
 # ==============================================================================
-# 메인 화면 레이아웃
+# 공유 수집 워커 (프로세스당 하나, 모든 세션이 공유)
 # ==============================================================================
-col_header, col_summary = st.columns([2, 1.2], vertical_alignment="center")
-with col_header: st.title("🦅 연세대학교 선거 실시간 현황")
+@st.cache_resource
+def get_fetch_worker():
+    worker = FetchWorker(interval=60, store=SnapshotStore())
+    atexit.register(worker.stop)
+    metrics.serve()  # ELECTION_METRICS_PORT가 설정된 경우에만 /metrics 시작
+    return worker.start()
+
+@st.cache_resource
+def get_live_url():
+    """변경분만 받는 실시간 표(live.py) 주소 (ELECTION_LIVE_PORT가 없으면 None)"""
+    return live.start(get_fetch_worker())[1]
 
-if 'last_updated' not in st.session_state: st.session_state['last_updated'] = "-"
-if 'data' not in st.session_state: st.session_state['data'] = pd.DataFrame()
+# ==============================================================================
+# 메인 화면 레이아웃
+# ==============================================================================
+# [공유 워커] 세션은 워커가 발행한 최신 스냅샷을 참조만 함 (복사/크롤링 없음)
+worker = get_fetch_worker()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def window_snapshot(_data, version, minutes, minute_bucket):
+    """증가분을 이력 저장소의 구간별 증가분으로 바꾼 스냅샷 (스냅샷 버전/구간/분 단위로 세션 간 공유)
+    같은 구간을 보는 세션은 같은 읽기 전용 표를 받으므로 요약 집계(aggregate.rollup)도 한 번만 계산됨"""
+    deltas = worker.store.deltas_last(minutes) if minutes else worker.store.deltas(0)
+    return to_snapshot(_data.assign(증가=pd.to_numeric(map_units(_data['선거 단위'], deltas.get)).fillna(0)))
+
+def sync_from_worker():
+    worker.touch()  # 자동 갱신 조각 재실행도 접속으로 셈 (모듈 코드는 다시 실행되지 않음)
+    data, version, last_updated, last_error = worker.snapshot()
+    minutes = DELTA_WINDOWS.get(st.session_state.get('delta_window'))
+    if data is not None and minutes is not None and worker.store:
+        data = window_snapshot(data, version, minutes, int(time.time() // 60))
+    st.session_state['data'] = data if data is not None else pd.DataFrame()
+    st.session_state['data_version'] = version
+    st.session_state['last_updated'] = last_updated
+    st.session_state['fetch_error'] = last_error
+    st.session_state['data_age'], st.session_state['stale'], st.session_state['stale_sources'] = worker.freshness()
+
+def format_age(seconds):
+    if seconds < 60: return f"{int(seconds)}초"
+    if seconds < 3600: return f"{int(seconds // 60)}분"
+    return f"{int(seconds // 3600)}시간 {int(seconds % 3600 // 60)}분"
+
+sync_from_worker()
+
+STAGE_LABELS = {"fetch": "수집 전체", "driver_start": "브라우저 시작", "page_load": "페이지 로드", "card_wait": "카드 대기",
+                "http_fetch": "HTTP 요청", "parse": "파싱", "enrich": "파생 컬럼", "forecast": "예측", "aggregate": "집계",
+                "history": "이력 저장", "render": "표 렌더링", "export": "내보내기"}
+
+def latency_panel():
+    """metrics.py에 쌓인 단계별 소요 시간(ms)과 카운터"""
+    processed, skipped = worker.refresh_stats()
+    st.caption(f"갱신 처리 {processed}회 · 변경 없음 {skipped}회")
+    rows = [(STAGE_LABELS.get(stage, stage), count, *(None if v is None else round(v * 1000, 1) for v in (last, p50, p95)))
+            for stage, count, last, p50, p95, _ in metrics.METRICS.stage_rows()]
+    if rows:
+        st.dataframe(pd.DataFrame(rows, columns=['단계', '횟수', '최근(ms)', 'p50(ms)', 'p95(ms)']), hide_index=True)
+    counters = metrics.METRICS.counter_values()
+    col_fallback, col_failed, col_empty = st.columns(3)
+    col_fallback.metric("Regex 비상망", counters['regex_fallback'])
+    col_failed.metric("파싱 실패", counters['parse_failures'])
+    col_empty.metric("빈 페이지", counters['empty_fetches'])
+    if st.session_state['fetch_error']: st.caption(f"최근 오류: {st.session_state['fetch_error']}")
+
+def source_panel():
+    """수집 대상(sources.toml)별 상태 (대상이 둘 이상일 때만 표시)"""
+    rows = [(label, state, failures, None if age is None else int(age))
+            for label, state, failures, age, _ in worker.scheduler.status_rows()]
+    st.dataframe(pd.DataFrame(rows, columns=['수집 대상', '상태', '연속 실패', '마지막 성공(초 전)']), hide_index=True)
 
 with st.sidebar:
-    show_log = st.checkbox("🐞 실시간 로그 보기", value=False)
-    debug_container = st.container() if show_log else None
-
-# 요약표 표시
-if not st.session_state['data'].empty:
-    df_sum = st.session_state['data']
-    if '증가' in df_sum.columns:
-        inc_total = df_sum[df_sum['선거 단위'] == '총학생회']['증가'].sum()
-        mask_college = (df_sum['선거 단위'].str.endswith(('대학', '계열', '총동아리연합회')) & (df_sum['선거 단위'] != '총학생회') & (df_sum['선거 단위'] != '외국인 학생회'))
-        inc_college = df_sum[mask_college]['증가'].sum()
-        mask_dept = ((df_sum['선거 단위'] != '총학생회') & (~mask_college))
-        inc_dept = df_sum[mask_dept]['증가'].sum()
-        
-        row_total_sa = df_sum[df_sum['선거 단위'] == '총학생회']
-        rem_total = max(0, row_total_sa['투표 성사 잔여 인원'].values[0]) if not row_total_sa.empty and pd.notna(row_total_sa['투표 성사 잔여 인원'].values[0]) else 0
-        
-        mask_target = df_sum['선거 단위'].apply(is_target_unit)
-        rem_target_sum = df_sum[mask_target]['투표 성사 잔여 인원'].apply(lambda x: max(0, x) if pd.notna(x) else 0).sum()
-        value_val = rem_total - rem_target_sum
-
-        summary_html = f"""
-        <table class="summary-table">
-            <thead><tr><th>총학생회</th><th>단과대</th><th>학과</th><th style="background-color: #00254d;">value</th></tr></thead>
-            <tbody><tr><td>▲ {int(inc_total):,}</td><td>▲ {int(inc_college):,}</td><td>▲ {int(inc_dept):,}</td><td style="color: #b91c1c; font-weight: 900;">{int(value_val):,}</td></tr></tbody>
-        </table>"""
-        with col_summary: st.markdown(summary_html, unsafe_allow_html=True)
+    st.selectbox("📈 증가 집계 구간", list(DELTA_WINDOWS), key='delta_window')
+    if worker.scheduler and len(worker.scheduler.sources) > 1: source_panel()
+    live_url = get_live_url()
+    live_view = bool(live_url) and st.toggle("⚡ 실시간 표 (변경된 행만 전송)", value=False,
+                                             help="필터와 정렬은 적용되지 않고 기본순으로 표시됩니다.")
+    show_latency = st.checkbox("⏱️ 단계별 소요 시간 보기", value=False)
+    if show_latency: latency_panel()
 
 st.markdown("---")
 
@@ -400,113 +245,113 @@ with col_toggle:
 with col_btn:
     st.write("")
     manual_refresh = st.button("📥 수동 업데이트", type="primary", use_container_width=True)
-with col_time:
-    time_text = st.session_state['last_updated']
-    st.markdown(f'<div class="update-time-box">최근 업데이트: {time_text}</div>', unsafe_allow_html=True)
 
-# 갱신 로직
-should_fetch = manual_refresh or (auto_refresh and st.session_state['data'].empty)
-if should_fetch:
+# 수동 갱신 (직접 크롤링하지 않고 공유 워커에 요청 후 결과만 반영)
+if manual_refresh:
     with st.spinner('데이터를 수집 중입니다...'):
-        new_data = get_data_from_server(debug_container if 'debug_container' in locals() else None)
-        if not new_data.empty:
-            new_data = process_new_data(new_data)
-            st.session_state['data'] = new_data
-            
-            # [수정] KST 적용
-            KST = pytz.timezone('Asia/Seoul')
-            now_kst = datetime.now(KST)
-            st.session_state['last_updated'] = now_kst.strftime("%m월 %d일 %H시 %M분 %S초")
-            
-            st.rerun()
-
-# 데이터 표시
-if not st.session_state['data'].empty:
-    df = st.session_state['data']
-    col_filter, col_sort = st.columns([3, 1])
-    with col_filter:
-        commission_list = sorted(df['담당 선관위'].unique().tolist())
-        selected_commissions = st.multiselect("🔍 담당 선관위 필터 (비워두면 전체 보기)", options=commission_list, default=[])
-    with col_sort:
-        sort_option = st.selectbox("🔽 정렬 기준", ["기본순", "투표율 높은 순", "투표율 낮은 순", "투표자 많은 순", "잔여 인원 적은 순", "가나다 순"])
-
-    if selected_commissions: df_filtered = df[df['담당 선관위'].isin(selected_commissions)]
-    else: df_filtered = df
-
-    df_valid = df_filtered[(df_filtered['총 유권자'].notna()) & (df_filtered['총 유권자'] > 0) & (df_filtered['투표 성사 잔여 인원'].notna())].copy()
-    df_invalid = df_filtered[~((df_filtered['총 유권자'] > 0) & (df_filtered['투표 성사 잔여 인원'].notna()))].copy()
-
-    if sort_option == "기본순": df_valid = df_valid.sort_values(by="일련번호", ascending=True)
-    elif sort_option == "투표율 높은 순": df_valid = df_valid.sort_values(by="투표율", ascending=False)
-    elif sort_option == "투표율 낮은 순": df_valid = df_valid.sort_values(by="투표율", ascending=True)
-    elif sort_option == "투표자 많은 순": df_valid = df_valid.sort_values(by="투표자 수", ascending=False)
-    elif sort_option == "잔여 인원 적은 순": df_valid = df_valid.sort_values(by="투표 성사 잔여 인원", ascending=True)
-    elif sort_option == "가나다 순": df_valid = df_valid.sort_values(by="선거 단위", ascending=True)
-
-    if not df_valid.empty:
-        st.success(f"📊 현재 진행 중인 선거: {len(df_valid)}개")
-        
-        df_export = df_valid.copy()
-        def restore_name_for_excel(name):
-            skip = ["동아리연합회", "투표", "위원회", "연합회장"]
-            if name.endswith("학생회") or any(k in name for k in skip): return name
-            return f"{name} 학생회"
-        df_export['선거 단위'] = df_export['선거 단위'].apply(restore_name_for_excel)
-        df_export['투표율'] = df_export['투표율'].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "-")
-        df_export['비고'] = df_export['투표 성사 잔여 인원'].apply(lambda x: "(개표 가능)" if pd.notna(x) and x <= 0 else "")
-        df_export = df_export.drop(columns=['투표자 수', '증가', '총 유권자', '투표 성사 잔여 인원'], errors='ignore')
-
-        # [수정] 엑셀 파일명 KST 적용
-        KST = pytz.timezone('Asia/Seoul')
-        file_name = f"yonsei_vote_{datetime.now(KST).strftime('%Y%m%d_%H%M%S')}.csv"
+        version = st.session_state['data_version']
+        worker.request_refresh()
+        if worker.wait_for_update(version, timeout=MANUAL_REFRESH_WAIT):
+            sync_from_worker()
+            if st.session_state['data_version'] == version and not st.session_state['fetch_error']:
+                st.toast("변경 사항이 없습니다.")
+        else:
+            st.toast("⏳ 사이트 응답이 느려 백그라운드에서 계속 확인합니다. 준비되면 자동으로 반영됩니다.")
+
+# ==============================================================================
+# 자동 갱신: 타이머 기반 부분 재실행 (st.fragment)
+# ==============================================================================
+# 스크립트 스레드를 sleep으로 붙잡지 않고, 요약표/업데이트 시각/현황표만 주기적으로
+# 다시 그립니다. 수집은 워커가 하므로 각 재실행은 최신 스냅샷을 읽기만 합니다.
+run_every = AUTO_REFRESH_POLL if auto_refresh else None
+
+@st.fragment(run_every=run_every)
+def summary_fragment():
+    if run_every: sync_from_worker()
+    if not st.session_state['data'].empty:
+        df_sum = st.session_state['data']
+        if '증가' in df_sum.columns:
+            # 요약 칸은 스냅샷마다 한 번만 집계됨 (aggregate.py) - 재실행은 결과를 읽기만 함
+            s = rollup(df_sum).summary
+            summary_html = f"""
+            <table class="summary-table">
+                <thead><tr><th>총학생회</th><th>단과대</th><th>학과</th><th style="background-color: #00254d;">value</th></tr></thead>
+                <tbody><tr><td>▲ {s['inc_total']:,}</td><td>▲ {s['inc_college']:,}</td><td>▲ {s['inc_dept']:,}</td><td style="color: #b91c1c; font-weight: 900;">{s['value']:,}</td></tr></tbody>
+            </table>"""
+            st.markdown(summary_html, unsafe_allow_html=True)
+
+@st.fragment(run_every=run_every)
+def update_time_fragment():
+    if run_every: sync_from_worker()
+    time_text = st.session_state['last_updated']
+    if st.session_state['stale'] and st.session_state['data_age'] is not None:
+        # 마지막 성공 이후 오래 지났으면 데이터 나이를 함께 표시 (백그라운드에서 계속 다시 확인 중)
+        age = format_age(st.session_state['data_age'])
+        st.markdown(f'<div class="update-time-box stale">최근 업데이트: {time_text} · ⚠️ {age} 전 확인</div>', unsafe_allow_html=True)
+    else:
+        st.markdown(f'<div class="update-time-box">최근 업데이트: {time_text}</div>', unsafe_allow_html=True)
+
+@st.fragment(run_every=run_every)
+def dashboard_fragment():
+    if run_every: sync_from_worker()
+    error, age, stale_sources = st.session_state['fetch_error'], st.session_state['data_age'], st.session_state['stale_sources']
+    if error and not st.session_state['data'].empty and age is not None:
+        # stale-while-revalidate: 마지막으로 받은 스냅샷을 계속 보여주고 워커가 백그라운드에서 다시 시도
+        target = f" (이전 데이터를 표시 중인 대상: {', '.join(stale_sources)})" if stale_sources else ""
+        st.warning(f"⚠️ 최신 현황을 가져오지 못해 {format_age(age)} 전에 확인한 데이터를 표시합니다{target}. 백그라운드에서 계속 다시 확인합니다.\n\n{error}")
+    elif error:
+        st.error(error)
+
+    if not st.session_state['data'].empty:
+        df = st.session_state['data']
+        col_filter, col_sort = st.columns([3, 1])
+        with col_filter:
+            commission_list = sorted(df['담당 선관위'].dropna().unique().tolist())
+            selected_commissions = st.multiselect("🔍 담당 선관위 필터 (비워두면 전체 보기)", options=commission_list, default=[])
+        with col_sort:
+            sort_option = st.selectbox("🔽 정렬 기준", list(SORT_KEYS))
+
+        # 필터/정렬은 행 번호로만 계산하고 표시할 행만 한 번 take (공유 스냅샷은 복사하지 않음, schema.view_rows)
+        valid_rows, invalid_rows = view_rows(df, selected_commissions, sort_option)
+        df_valid, df_invalid = df.take(valid_rows), df.take(invalid_rows)
+
+        if not df_valid.empty:
+            st.success(f"📊 현재 진행 중인 선거: {len(df_valid)}개")
         
-        csv = df_export.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(label="💾 엑셀 저장", data=csv, file_name=file_name, mime='text/csv', key='download_excel_btn')
-        st.markdown(create_html_table(df_valid), unsafe_allow_html=True)
+            # 내보내기(CSV/XLSX/공지 텍스트)는 (스냅샷, 선관위 선택, 정렬)마다 한 번만 생성 (export.py)
+            bundle = EXPORT_CACHE.get(view_key(st.session_state['data_version'], selected_commissions, sort_option), df_valid)
+
+            # [수정] 엑셀 파일명 KST 적용
+            file_stem = f"yonsei_vote_{datetime.now(KST).strftime('%Y%m%d_%H%M%S')}"
+            col_csv, col_xlsx, _ = st.columns([1, 1, 4])
+            col_csv.download_button(label="💾 엑셀 저장", data=bundle.csv, file_name=f"{file_stem}.csv", mime='text/csv',
+                                    key='download_excel_btn', on_click='ignore')
+            col_xlsx.download_button(label="📗 .xlsx 저장", data=bundle.xlsx, file_name=f"{file_stem}.xlsx", mime=XLSX_MIME,
+                                     key='download_xlsx_btn', on_click='ignore')
+            if live_view: st.iframe(live_url, height=min(1200, 160 + 38 * len(df_valid)))
+            else: st.markdown(create_html_table(df_valid), unsafe_allow_html=True)
         
-        with st.expander("📋 공지용 텍스트 복사 (클릭해서 열기)", expanded=False):
-            clipboard_text = ""
-            ORDERED_COMMISSIONS = [
-                "중앙선거관리위원회", "총동아리연합회", "문과대학", "상경·경영대학", "이과대학",
-                "공과대학", "인공지능융합대학", "신과대학", "사회과학대학", "생명시스템대학", "음악대학",
-                "생활과학대학", "교육과학대학", "체육계열", "의과대학", "치과대학", 
-                "간호대학", "약학대학", "언더우드국제대학", "글로벌인재대학"
-            ]
-            found = df_valid['담당 선관위'].unique().tolist()
-            sorted_comm = [c for c in ORDERED_COMMISSIONS if c in found] + [c for c in found if c not in ORDERED_COMMISSIONS]
-            
-            for comm in sorted_comm:
-                group = df_valid[df_valid['담당 선관위'] == comm]
-                if group.empty: continue
-                for _, row in group.iterrows():
-                    unit_name = row['선거 단위']
-                    rate = row['투표율'] if pd.notna(row['투표율']) else 0.0
-                    skip = ["학생회", "위원회", "투표", "동아리연합회", "연합회장"]
-                    final = unit_name if any(k in unit_name for k in skip) else f"{unit_name} 학생회"
-                    clipboard_text += f"{final} {rate:.2f}%\n"
-                clipboard_text += "\n"
-            st.code(clipboard_text, language="text")
-
-    if not df_invalid.empty:
-        st.markdown("---")
-        st.subheader("📌 일부 정보 미표기 단위")
-        st.markdown(create_html_table(df_invalid), unsafe_allow_html=True)
-
-elif st.session_state['last_updated'] != "-":
-    st.warning("데이터를 찾지 못했습니다. 다시 시도해주세요.")
-
-if auto_refresh:
-    progress_text = "다음 업데이트 대기 중..."
-    my_bar = st.progress(0, text=progress_text)
-    for percent_complete in range(100):
-        time.sleep(0.6)
-        my_bar.progress(percent_complete + 1, text=f"{progress_text} ({60 - int(percent_complete * 0.6)}초)")
-    
-    with st.spinner('자동 업데이트 중...'):
-        new_data = get_data_from_server(debug_container if 'debug_container' in locals() else None)
-        if not new_data.empty:
-            new_data = process_new_data(new_data)
-            st.session_state['data'] = new_data
-            KST = pytz.timezone('Asia/Seoul')
-            st.session_state['last_updated'] = datetime.now(KST).strftime("%m월 %d일 %H시 %M분 %S초")
-            st.rerun()
+            with st.expander("📋 공지용 텍스트 복사 (클릭해서 열기)", expanded=False):
+                st.code(bundle.notice, language="text")
+
+            # 선관위별 합계는 스냅샷마다 한 번만 집계됨 (aggregate.py) - 여기서는 선택한 선관위 행만 고름
+            by_commission = rollup(df).by_commission
+            if selected_commissions: by_commission = by_commission[by_commission.index.isin(selected_commissions)]
+            with st.expander("🏛️ 선관위별 투표율 (클릭해서 열기)", expanded=False):
+                st.dataframe(by_commission, width='stretch', column_config={
+                    "투표율": st.column_config.NumberColumn(format="%.2f%%"),
+                    "성사 단위": st.column_config.NumberColumn(help="투표 성사 잔여 인원이 0 이하인 선거 단위 수")})
+
+        if not df_invalid.empty:
+            st.markdown("---")
+            st.subheader("📌 일부 정보 미표기 단위")
+            st.markdown(create_html_table(df_invalid), unsafe_allow_html=True)
+
+    elif st.session_state['last_updated'] != "-":
+        st.warning("데이터를 찾지 못했습니다. 다시 시도해주세요.")
+    elif auto_refresh:
+        st.info("첫 데이터를 수집 중입니다. 잠시 후 자동으로 표시됩니다.")
+
+with col_summary: summary_fragment()
+with col_time: update_time_fragment()
+dashboard_fragment()
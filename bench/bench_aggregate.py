@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_parser import parse_cards
+from scraper import build_dataframe
+from enrich import enrich_snapshot
+from schema import to_snapshot
+from aggregate import _compute, rollup
+from mapping_db import is_target_unit
+from make_fixtures import FIXTURE_DIR
+
+# ==============================================================================
+# [벤치마크] 요약표/선관위별 집계: 재실행마다 계산 vs 스냅샷당 한 번 (aggregate.py)
+# ==============================================================================
+# 사용법: python bench/bench_aggregate.py [--fixture votes_large.html] [--reruns 200]
+# - legacy      : 예전 요약 코드 (불리언 마스크 여러 번 + str.endswith + apply(is_target_unit)), 재실행마다
+# - rollup      : (선관위, 구분) groupby 한 번 + 선관위별/구분별 합계 (스냅샷이 바뀔 때 한 번)
+# - rollup hit  : 같은 스냅샷을 다시 읽는 재실행 (기억해 둔 결과 반환)
+
+
+def quiet(msg):
+    pass
+
+
+def legacy_summary(df_sum):
+    mask_total = df_sum['선거 단위'] == '총학생회'
+    units = df_sum['선거 단위'].astype(str)
+    mask_college = units.str.endswith(('대학', '계열', '총동아리연합회')) & (units != '총학생회') & (units != '외국인 학생회')
+    diff = pd.to_numeric(df_sum['증가'], errors='coerce').fillna(0)
+    inc_total = diff[mask_total].sum()
+    inc_college = diff[mask_college].sum()
+    inc_dept = diff[~mask_total & ~mask_college].sum()
+    remaining = pd.to_numeric(df_sum['투표 성사 잔여 인원'], errors='coerce').clip(lower=0).fillna(0)
+    rem_total = remaining[mask_total].iloc[0] if mask_total.any() else 0
+    rem_target = remaining[units.apply(is_target_unit)].sum()
+    return int(inc_total), int(inc_college), int(inc_dept), int(rem_total - rem_target)
+
+
+def per_call_ms(fn, n):
+    start = time.perf_counter()
+    for _ in range(n): fn()
+    return (time.perf_counter() - start) / n * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixture", default="votes_large.html")
+    ap.add_argument("--reruns", type=int, default=200)
+    args = ap.parse_args()
+
+    with open(os.path.join(FIXTURE_DIR, args.fixture), encoding="utf-8") as f:
+        df = to_snapshot(enrich_snapshot(build_dataframe(parse_cards(f.read(), quiet))))
+    assert legacy_summary(df) == tuple(rollup(df).summary.values()), "요약 값이 예전 계산과 다릅니다"
+
+    legacy = per_call_ms(lambda: legacy_summary(df), args.reruns)
+    compute = per_call_ms(lambda: _compute(df), args.reruns)
+    hit = per_call_ms(lambda: rollup(df), args.reruns)
+    n = len(rollup(df).by_commission)
+    print(f"{args.fixture}: {len(df):,}행, 선관위 {n}개 (요약 값 일치)")
+    print(f"{'legacy (요약표만, 재실행마다)':<32}{legacy:>9.3f}ms")
+    print(f"{'rollup (선관위/구분 전체, 스냅샷당)':<32}{compute:>9.3f}ms")
+    print(f"{'rollup hit (재실행)':<32}{hit:>9.4f}ms  {legacy / hit:>8,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
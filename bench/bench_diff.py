@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_parser import parse_cards
+from scraper import build_dataframe
+from aggregate import summary_values
+from enrich import enrich_snapshot
+from render import create_html_table
+from diff import SnapshotDiffer, table_view
+from make_fixtures import FIXTURE_DIR
+
+# ==============================================================================
+# [벤치마크] 갱신 1회당 전송량: 전체 표 HTML vs 변경분 패치 (diff.py)
+# ==============================================================================
+# 사용법: python bench/bench_diff.py [--fixture votes_large.html] [--ticks 20]
+# 픽스처 스냅샷에서 매 갱신마다 k개 단위의 투표자 수만 늘려 가며 평균 전송 바이트를 비교합니다.
+# (예측 컬럼은 시간이 지나면 모든 행에서 바뀔 수 있으므로 여기서는 표 값만 비교)
+
+
+def quiet(msg):
+    pass
+
+
+def simulate(base, k, ticks, seed=0):
+    rnd = random.Random(seed)
+    differ = SnapshotDiffer()
+    prev = enrich_snapshot(base)
+    differ.update(prev, 1)
+    units = table_view(prev).index.tolist()
+    full, patch = 0, 0
+    for tick in range(ticks):
+        cur = prev[['일련번호', '담당 선관위', '선거 단위', '투표율', '투표자 수', '총 유권자', '투표 성사 잔여 인원']].copy()
+        for i in rnd.sample(units, min(k, len(units))):
+            cur.loc[i, '투표자 수'] += rnd.randint(1, 5)
+            cur.loc[i, '투표 성사 잔여 인원'] -= 1
+        cur = enrich_snapshot(cur, prev)
+        s = summary_values(cur)
+        full += len((create_html_table(table_view(cur), cache=None) + json.dumps(s)).encode("utf-8"))
+        patch += len(json.dumps(differ.update(cur, tick + 2), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        prev = cur
+    return full / ticks, patch / ticks
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixture", default="votes_large.html")
+    ap.add_argument("--ticks", type=int, default=20)
+    args = ap.parse_args()
+
+    with open(os.path.join(FIXTURE_DIR, args.fixture), encoding="utf-8") as f:
+        base = build_dataframe(parse_cards(f.read(), quiet))
+    n = len(table_view(enrich_snapshot(base)))
+    print(f"{args.fixture}: 표 {n}행, 갱신 {args.ticks}회 평균")
+    print(f"{'changed':>8}{'full(bytes)':>14}{'patch(bytes)':>14}{'ratio':>9}")
+    for k in (0, 1, 3, 10, 50, n):
+        full, patch = simulate(base, k, args.ticks)
+        print(f"{k:>8}{full:>14,.0f}{patch:>14,.0f}{patch / full:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
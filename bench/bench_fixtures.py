@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_parser import parse_cards, HAS_LXML
+from mapping_db import ORDER_LIST
+from scraper import build_dataframe
+from make_fixtures import FIXTURE_DIR
+
+# ==============================================================================
+# [벤치마크] 픽스처별 파싱 시간 / 추출 행 수 / 이름 정리·선관위 매핑 정확도
+# ==============================================================================
+# 사용법: python bench/bench_fixtures.py [-n 반복횟수] [--strict]
+# 정답은 make_fixtures.py가 함께 저장한 <픽스처>.expected.json (진행중 카드 순서대로)
+#   rows  : 추출 행 수 / 기대 행 수
+#   unit  : 선거 단위 이름 정리(clean_unit_name) 정확도
+#   comm  : 담당 선관위 매핑(get_commission) 정확도
+#   order : build_dataframe 결과가 ORDER_LIST 순서를 지키는지
+# --strict를 주면 하나라도 어긋날 때 종료 코드 1 (회귀 확인용)
+
+BACKENDS = ["lxml", "bs4"] if HAS_LXML else ["bs4"]
+
+
+def quiet(msg):
+    pass
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f: html = f.read()
+    expected_path = path.replace(".html", ".expected.json")
+    if not os.path.exists(expected_path): return html, None
+    with open(expected_path, encoding="utf-8") as f: return html, json.load(f)["rows"]
+
+
+def accuracy(rows, expected):
+    """(선거 단위 일치 수, 담당 선관위 일치 수, 틀린 예시 목록) - 같은 위치의 카드끼리 비교"""
+    unit_ok, comm_ok, misses = 0, 0, []
+    for i, want in enumerate(expected):
+        got = rows[i] if i < len(rows) else {}
+        unit_ok += got.get("선거 단위") == want["선거 단위"]
+        comm_ok += got.get("담당 선관위") == want["담당 선관위"]
+        if (got.get("선거 단위"), got.get("담당 선관위")) != (want["선거 단위"], want["담당 선관위"]):
+            misses.append(f"{want['title']!r}: {got.get('선거 단위')!r}/{got.get('담당 선관위')!r} "
+                          f"(기대 {want['선거 단위']!r}/{want['담당 선관위']!r})")
+    return unit_ok, comm_ok, misses
+
+
+def order_ok(rows):
+    df = build_dataframe(rows)
+    rank = {c: i for i, c in enumerate(ORDER_LIST)}
+    ranks = [rank.get(c, len(ORDER_LIST)) for c in df['담당 선관위']]
+    return ranks == sorted(ranks) and df['일련번호'].tolist() == list(range(1, len(df) + 1))
+
+
+def bench(html, backend, repeat):
+    best, rows = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = parse_cards(html, quiet, backend=backend)
+        best = min(best, time.perf_counter() - t0)
+    return best, rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--repeat", type=int, default=5)
+    ap.add_argument("--strict", action="store_true")
+    args = ap.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not paths: sys.exit("픽스처가 없습니다. 먼저 python bench/make_fixtures.py 를 실행하세요.")
+
+    failed = False
+    print(f"{'fixture':<24}{'parser':<8}{'best(ms)':>10}{'rows':>11}{'unit':>9}{'comm':>9}{'order':>7}")
+    for path in paths:
+        html, expected = load_fixture(path)
+        name = os.path.basename(path)
+        for backend in BACKENDS:
+            t, rows = bench(html, backend, args.repeat)
+            if expected is None:
+                ok = rows is None
+                print(f"{name:<24}{backend:<8}{t * 1000:>10.2f}{'없음' if ok else len(rows):>11}{'-':>9}{'-':>9}{'-':>7}")
+                failed |= not ok
+                continue
+            rows = rows or []
+            unit_ok, comm_ok, misses = accuracy(rows, expected)
+            sorted_ok = order_ok(rows) if rows else True
+            n = len(expected)
+            print(f"{name:<24}{backend:<8}{t * 1000:>10.2f}{f'{len(rows)}/{n}':>11}"
+                  f"{unit_ok / n:>9.1%}{comm_ok / n:>9.1%}{'OK' if sorted_ok else 'FAIL':>7}")
+            for miss in misses[:5]: print(f"    ⚠️ {miss}")
+            failed |= bool(misses) or len(rows) != n or not sorted_ok
+
+    if failed:
+        print("❌ 정답과 다른 결과가 있습니다.")
+        if args.strict: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serve_fixtures import serve
+from make_fixtures import REPLAY_DIR
+
+# ==============================================================================
+# [부하 테스트] 동시 접속 세션 N개로 대시보드(app.py)를 돌려 보며 확장성 지표 측정
+# ==============================================================================
+# 사용법: python bench/bench_load.py [--sessions 20] [--duration 60] [--mix manual=2,auto=5,filter=3]
+#                                    [--mode http] [--latency-ms 0] [--json results.json]
+# - 로컬 대역 서버(serve_fixtures.py)를 띄우고 ELECTION_VOTES_URL을 그쪽으로 돌린 뒤,
+#   streamlit.testing.v1.AppTest 세션 N개를 한 프로세스의 스레드로 동시에 실행
+#   (실제 streamlit 서버도 한 프로세스에서 세션마다 스레드를 쓰고, 수집 워커/캐시를 공유함)
+# - 세션 유형 (--mix 비율대로 배정)
+#     manual : 가끔 '수동 업데이트' 버튼, 그 외에는 화면만 다시 읽음
+#     auto   : '자동 업데이트'를 켜 두고 AUTO_REFRESH_POLL초마다 재실행 (AppTest에는 타이머가 없어
+#              조각(fragment) 재실행 대신 전체 재실행으로 흉내 내므로 실제보다 무거운 쪽)
+#     filter : 선관위 필터/정렬 기준을 바꿔 가며 재실행
+# - 결과: 재실행 지연 p50/p95 (전체/유형별), 최대 RSS (이 프로세스 + 자식 프로세스),
+#         브라우저(chrome/chromedriver) 프로세스 수 최대값, 업스트림 요청 수(/분)
+# --json으로 결과를 파일에 남겨 릴리스마다 비교할 수 있습니다.
+
+BROWSER_NAMES = ("chrome", "chromium", "chromedriver", "geckodriver", "firefox")
+SAMPLE_INTERVAL = 0.25
+
+
+def parse_mix(text):
+    """'manual=2,auto=5,filter=3' -> {유형: 비율}"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("manual", "auto", "filter"): raise SystemExit(f"알 수 없는 세션 유형: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def assign_kinds(n, mix):
+    """비율대로 세션 유형을 나눔 (반올림 오차는 비율이 큰 유형부터 채움)"""
+    total = sum(mix.values())
+    counts = {kind: int(n * w / total) for kind, w in mix.items()}
+    for kind in sorted(mix, key=mix.get, reverse=True)[:n - sum(counts.values())]: counts[kind] += 1
+    return [kind for kind, c in counts.items() for _ in range(c)]
+
+
+def percentile(values, q):
+    if not values: return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+# ==============================================================================
+# [프로세스 관찰] /proc 기준 RSS 합계와 브라우저 프로세스 수 (Linux 외에는 이 프로세스 최대 RSS만)
+# ==============================================================================
+def _proc_table():
+    """pid -> (부모 pid, 이름, RSS 바이트)"""
+    page = os.sysconf("SC_PAGE_SIZE")
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit(): continue
+        try:
+            with open(f"/proc/{entry}/stat") as f: stat = f.read()
+            with open(f"/proc/{entry}/statm") as f: rss = int(f.read().split()[1]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+        name, rest = stat[stat.index("(") + 1:stat.rindex(")")], stat[stat.rindex(")") + 2:].split()
+        table[int(entry)] = (int(rest[1]), name, rss)
+    return table
+
+
+def process_tree(root=None):
+    """(root와 모든 자손의 RSS 합계, 자손 중 브라우저 프로세스 수)"""
+    root = root or os.getpid()
+    table = _proc_table()
+    children = {}
+    for pid, (ppid, _, _) in table.items(): children.setdefault(ppid, []).append(pid)
+    rss, browsers, stack = 0, 0, [root]
+    while stack:
+        pid = stack.pop()
+        if pid not in table: continue
+        rss += table[pid][2]
+        if pid != root and table[pid][1].lower().startswith(BROWSER_NAMES): browsers += 1
+        stack.extend(children.get(pid, []))
+    return rss, browsers
+
+
+class ResourceSampler:
+    """SAMPLE_INTERVAL초마다 RSS/브라우저 수를 재서 최댓값을 기억"""
+
+    def __init__(self):
+        self.peak_rss = 0
+        self.peak_browsers = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.has_proc = os.path.isdir("/proc")
+
+    def sample(self):
+        if self.has_proc:
+            rss, browsers = process_tree()
+        else:
+            import resource
+            rss, browsers = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, 0
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_browsers = max(self.peak_browsers, browsers)
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL): self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def prepare_apptest():
+    """AppTest를 한 프로세스의 여러 스레드에서 동시에 돌리기 위한 준비 (실제 streamlit 서버의 공유 구조에 맞춤)
+    - AppTest는 실행마다 새 ScriptCache로 app.py를 다시 컴파일함 -> 서버처럼 하나만 두고 공유
+      (컴파일 시간이 지연에 섞이지 않고, 여러 스레드가 동시에 컴파일하다 깨지는 CPython 3.11 ast 문제도 피함)
+    - AppTest는 실행마다 전역 Runtime._instance를 가짜 Runtime으로 바꿨다가 끝나면 None으로 되돌림
+      -> 다른 세션이 실행 중일 때는 마지막 가짜 Runtime을 계속 돌려줌"""
+    from streamlit.testing.v1 import local_script_runner
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    shared = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        if last: return last[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+
+
+# ==============================================================================
+# [세션] AppTest 하나 = 접속자 한 명
+# ==============================================================================
+class Session:
+    def __init__(self, index, kind, app_path, args, results):
+        self.index = index
+        self.kind = kind
+        self.app_path = app_path
+        self.args = args
+        self.rnd = random.Random(args.seed + index)
+        self.results = results     # [(유형, 동작, 초)] (스레드끼리 공유, append만 함)
+        self.errors = []
+
+    def _widget(self, elements, prefix):
+        for element in elements:
+            if element.label.startswith(prefix): return element
+        return None
+
+    def _run(self, at, action):
+        start = time.perf_counter()
+        at.run(timeout=self.args.timeout)
+        self.results.append((self.kind, action, time.perf_counter() - start))
+        if at.exception: self.errors.append(at.exception[0].message.splitlines()[0][:200])
+
+    def step(self, at):
+        """유형별 동작 한 번 -> 다음 동작까지 기다릴 초"""
+        if self.kind == "auto":
+            self._run(at, "auto")
+            return self.args.auto_poll
+        if self.kind == "manual" and self.rnd.random() < self.args.manual_prob:
+            button = self._widget(at.button, "📥")
+            if button is not None:
+                button.click()
+                self._run(at, "manual")
+                return self._think()
+        if self.kind == "filter":
+            select, sort = self._widget(at.multiselect, "🔍"), self._widget(at.selectbox, "🔽")
+            if select is not None and sort is not None:
+                k = self.rnd.randint(0, min(3, len(select.options)))
+                select.set_value(self.rnd.sample(select.options, k))
+                sort.set_value(self.rnd.choice(sort.options))
+                self._run(at, "filter")
+                return self._think()
+        self._run(at, "rerun")
+        return self._think()
+
+    def _think(self):
+        return self.rnd.uniform(0.5, 1.5) * self.args.think
+
+    def open(self):
+        """새 접속 (첫 실행, auto 세션은 자동 업데이트 켜기)"""
+        from streamlit.testing.v1 import AppTest
+        at = AppTest.from_file(self.app_path, default_timeout=self.args.timeout)
+        self._run(at, "first")
+        if self.kind == "auto":
+            toggle = self._widget(at.toggle, "🔄")
+            if toggle is not None:
+                toggle.set_value(True)
+                self._run(at, "auto")
+        return at
+
+    def __call__(self, deadline):
+        at = None
+        while time.monotonic() < deadline:
+            try:
+                if at is None: at = self.open()
+                wait = self.step(at)
+            except Exception as e:
+                # 시간 초과 등으로 세션 상태가 깨졌으면 새로 접속 (브라우저 새로고침과 같음)
+                self.errors.append(f"{type(e).__name__}: {e}"[:200])
+                at, wait = None, self._think()
+            time.sleep(min(max(0.0, deadline - time.monotonic()), wait))
+
+
+def summarize(results):
+    """{동작 또는 'all': (횟수, p50, p95, 최대)} (첫 실행 'first'는 전체 통계에서 제외)"""
+    groups = {"all": [s for _, action, s in results if action != "first"]}
+    for _, action, seconds in results: groups.setdefault(action, []).append(seconds)
+    return {name: (len(v), percentile(v, 50), percentile(v, 95), max(v) if v else float("nan")) for name, v in groups.items()}
+
+
+def _app_constant(app_path, name, default):
+    """app.py를 실행하지 않고 상수 값만 읽음 (예: AUTO_REFRESH_POLL = 10)"""
+    with open(app_path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(f"{name} ="):
+                try: return float(line.split("=", 1)[1].split("#")[0])
+                except ValueError: break
+    return default
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--duration", type=float, default=60, help="측정 시간 (초, 세션 시작 시간 제외)")
+    ap.add_argument("--ramp", type=float, default=5, help="세션을 나눠서 시작하는 시간 (초)")
+    ap.add_argument("--mix", default="manual=2,auto=5,filter=3")
+    ap.add_argument("--think", type=float, default=3, help="manual/filter 세션의 평균 동작 간격 (초)")
+    ap.add_argument("--manual-prob", type=float, default=0.2, help="manual 세션이 동작마다 버튼을 누를 확률")
+    ap.add_argument("--auto-poll", type=float, default=None, help="auto 세션 재실행 간격 (기본: app.AUTO_REFRESH_POLL)")
+    ap.add_argument("--timeout", type=float, default=60, help="재실행 한 번의 시간 제한 (초)")
+    ap.add_argument("--mode", default="http", help="ELECTION_FETCH_MODE (auto/selenium이면 브라우저를 띄울 수 있음)")
+    ap.add_argument("--dir", default=REPLAY_DIR, help="대역 서버가 내보낼 스냅샷 폴더")
+    ap.add_argument("--tick", type=float, default=0, help="대역 서버 스냅샷 전환 간격 (초, 0이면 요청마다)")
+    ap.add_argument("--latency-ms", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    server, feed = serve(args.dir, port=0, tick=args.tick, latency_ms=args.latency_ms, log=False)
+    os.environ["ELECTION_VOTES_URL"] = f"http://127.0.0.1:{server.server_address[1]}/votes"
+    os.environ["ELECTION_FETCH_MODE"] = args.mode
+    os.environ.setdefault("ELECTION_HISTORY_PATH", os.path.join(tempfile.mkdtemp(prefix="election-load-"), "history.sqlite3"))
+    app_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+    if args.auto_poll is None: args.auto_poll = _app_constant(app_path, "AUTO_REFRESH_POLL", 10)
+
+    prepare_apptest()
+    kinds = assign_kinds(args.sessions, parse_mix(args.mix))
+    results = []
+    sessions = [Session(i, kind, app_path, args, results) for i, kind in enumerate(kinds)]
+    counts = {kind: kinds.count(kind) for kind in dict.fromkeys(kinds)}
+    print(f"🧪 세션 {args.sessions}개 ({', '.join(f'{k} {c}' for k, c in counts.items())}), "
+          f"측정 {args.duration:.0f}초, 수집 모드 {args.mode}, 대역 서버 {os.environ['ELECTION_VOTES_URL']}")
+
+    sampler = ResourceSampler().start()
+    started = time.monotonic()
+    deadline = started + args.ramp + args.duration
+    threads = []
+    for i, session in enumerate(sessions):
+        threads.append(threading.Thread(target=session, args=(deadline,), name=f"load-session-{i}", daemon=True))
+        threads[-1].start()
+        time.sleep(args.ramp / max(1, len(sessions)))
+    for t in threads: t.join(max(0.0, deadline - time.monotonic()) + args.timeout)
+    elapsed = time.monotonic() - started
+    sampler.stop()
+    server.shutdown()
+
+    stats = summarize(results)
+    errors = [e for s in sessions for e in s.errors]
+    report = {
+        "sessions": args.sessions, "mix": counts, "mode": args.mode, "elapsed_s": round(elapsed, 1),
+        "reruns": stats["all"][0], "reruns_per_s": round(stats["all"][0] / elapsed, 2),
+        "latency_ms": {name: {"n": n, "p50": round(p50 * 1000, 1), "p95": round(p95 * 1000, 1), "max": round(mx * 1000, 1)}
+                       for name, (n, p50, p95, mx) in stats.items()},
+        "peak_rss_mb": round(sampler.peak_rss / 2 ** 20, 1), "peak_browser_processes": sampler.peak_browsers,
+        "upstream_requests": feed.served, "upstream_requests_per_min": round(feed.served / elapsed * 60, 2),
+        "errors": len(errors),
+    }
+
+    print(f"\n{'동작':<10}{'횟수':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}")
+    for name, row in report["latency_ms"].items():
+        print(f"{name:<10}{row['n']:>7}{row['p50']:>10,.1f}{row['p95']:>10,.1f}{row['max']:>10,.1f}")
+    print(f"\n재실행 {report['reruns']}회 ({report['reruns_per_s']}/초), 최대 RSS {report['peak_rss_mb']}MB"
+          + ("" if sampler.has_proc else " (이 프로세스만)") + f", 브라우저 프로세스 최대 {report['peak_browser_processes']}개")
+    print(f"업스트림 요청 {feed.served}회 ({report['upstream_requests_per_min']}/분), 오류 {len(errors)}건")
+    for message in dict.fromkeys(errors[:5]): print(f"  ⚠️ {message}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
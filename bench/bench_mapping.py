@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mapping_db
+from mapping_db import ELECTION_DB, TARGET_UNITS, get_commission, is_target_unit
+
+# ==============================================================================
+# [벤치마크] 선관위 매핑(get_commission) / 합산 대상 판별(is_target_unit)
+# ==============================================================================
+# 사용법: python bench/bench_mapping.py [-n 이름 개수]
+# legacy = 기존 구현 (호출마다 키 정렬 + 선형 탐색), 결과가 완전히 같은지도 함께 검사
+
+
+def get_commission_legacy(name):
+    sorted_keys = sorted(ELECTION_DB.keys(), key=len, reverse=True)
+    for key in sorted_keys:
+        if key in name:
+            return ELECTION_DB[key]
+    return "기타/공통"
+
+
+def is_target_unit_legacy(name):
+    for t in TARGET_UNITS:
+        if t in name:
+            if "총투표" in name and "총투표" not in t: continue
+            if t == "의과대학" and ("동아리" in name or "의예과" in name): continue
+            return True
+    return False
+
+
+def synthetic_names(n, seed=0):
+    """실제 단위명 + 접두/접미어 조합 + 무관한 이름을 섞은 합성 이름 목록"""
+    rnd = random.Random(seed)
+    vocab = list(ELECTION_DB) + TARGET_UNITS
+    prefixes = ["", "", "연세대학교 ", "2026학년도 ", "제39대 "]
+    suffixes = ["", "", " 학생회", " 학생총투표", " 동아리연합회", " 선거"]
+    names = []
+    for i in range(n):
+        r = rnd.random()
+        if r < 0.6: name = rnd.choice(prefixes) + rnd.choice(vocab) + rnd.choice(suffixes)
+        elif r < 0.8: name = rnd.choice(vocab) + " " + rnd.choice(vocab)
+        else: name = f"합성{i}학과" + rnd.choice(suffixes)
+        names.append(name.strip())
+    return names
+
+
+def timed(fn, names):
+    t0 = time.perf_counter()
+    for name in names: fn(name)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--names", type=int, default=5000)
+    args = ap.parse_args()
+    names = synthetic_names(args.names)
+
+    for name in names:
+        assert get_commission(name) == get_commission_legacy(name), name
+        assert is_target_unit(name) == is_target_unit_legacy(name), name
+    print(f"✅ {len(names):,}개 합성 이름에서 기존 구현과 결과 일치")
+
+    # cold: 중복 없는 이름 첫 호출 / hot: 화면 갱신처럼 같은 단위 이름(최대 2,000개)을 반복 조회
+    unique = list(dict.fromkeys(names))
+    hot = unique[:2000] * 5
+    table = mapping_db.DEFAULT
+    for label, fn_new, fn_raw, fn_old in [("get_commission", get_commission, table._get_commission, get_commission_legacy),
+                                          ("is_target_unit", is_target_unit, table._is_target_unit, is_target_unit_legacy)]:
+        table.clear_caches()
+        t_old, t_cold = timed(fn_old, unique), timed(lambda name: fn_raw(name, table._compiled), unique)
+        t_old_hot, t_hot = timed(fn_old, hot), timed(fn_new, hot)
+        print(f"{label:<16} cold {len(unique):>6,}: legacy {t_old * 1000:7.2f}ms / compiled {t_cold * 1000:6.2f}ms ({t_old / t_cold:4.1f}x)"
+              f" | hot {len(hot):>6,}: legacy {t_old_hot * 1000:7.2f}ms / memoized {t_hot * 1000:6.2f}ms ({t_old_hot / t_hot:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_parser import parse_cards
+from scraper import build_dataframe
+from enrich import enrich_snapshot
+from forecast import TurnoutForecaster
+from schema import SORT_KEYS, to_snapshot, view_rows
+from make_fixtures import FIXTURE_DIR
+
+# ==============================================================================
+# [벤치마크] 스냅샷 메모리: 기존(object/int64/float64 표 + 세션마다 복사) vs 고정 스키마 읽기 전용 표 (schema.py)
+# ==============================================================================
+# 사용법: python bench/bench_memory.py [--fixture votes_large.html] [--copies 4]
+# - 스냅샷 크기: memory_usage(deep=True), 같은 스냅샷을 --copies배로 늘린 큰 표도 함께 측정
+#   typed own: 범주형 카테고리(모든 스냅샷이 공유)를 뺀, 스냅샷 하나가 새로 차지하는 크기
+# - 재실행 1회의 필터/정렬: 기존 코드(불리언 색인 + .copy() + sort_values) vs view_rows + take
+#   tracemalloc으로 잰 최대 임시 할당량(peak)과 평균 시간
+
+
+def quiet(msg):
+    pass
+
+
+def legacy_snapshot(rows):
+    """기존 방식: 파싱 결과 dict 목록 -> DataFrame (dtype 추론) + 파생 컬럼"""
+    df = pd.DataFrame(rows)
+    df.insert(0, '일련번호', range(1, len(df) + 1))
+    return TurnoutForecaster().update(enrich_snapshot(df))
+
+
+def typed_snapshot(rows):
+    return to_snapshot(TurnoutForecaster().update(enrich_snapshot(build_dataframe(rows))))
+
+
+def owned_bytes(df):
+    """범주형은 코드 배열만 센 크기 (카테고리 문자열은 schema.Interner가 스냅샷끼리 공유)"""
+    return sum(df[c].cat.codes.nbytes if isinstance(df[c].dtype, pd.CategoricalDtype) else df[c].memory_usage(deep=True, index=False)
+               for c in df.columns)
+
+
+def legacy_view(df, commissions, sort_option):
+    """기존 app.py의 필터/정렬 (세션마다 유효/미표기 표를 복사)"""
+    df_filtered = df[df['담당 선관위'].isin(commissions)] if commissions else df
+    df_valid = df_filtered[(df_filtered['총 유권자'].notna()) & (df_filtered['총 유권자'] > 0) & (df_filtered['투표 성사 잔여 인원'].notna())].copy()
+    df_invalid = df_filtered[~((df_filtered['총 유권자'] > 0) & (df_filtered['투표 성사 잔여 인원'].notna()))].copy()
+    column, ascending = SORT_KEYS[sort_option]
+    return df_valid.sort_values(by=column, ascending=ascending, na_position='last'), df_invalid
+
+
+def typed_view(df, commissions, sort_option):
+    valid, invalid = view_rows(df, commissions, sort_option)
+    return df.take(valid), df.take(invalid)
+
+
+def measure(fn, repeat):
+    """(최대 임시 할당 바이트, 평균 ms)"""
+    fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat): fn()
+    return peak, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixture", default="votes_large.html")
+    ap.add_argument("--copies", type=int, default=4, help="큰 표 측정용: 파싱 결과를 몇 배로 늘릴지")
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    with open(os.path.join(FIXTURE_DIR, args.fixture), encoding="utf-8") as f:
+        rows = [r for r in parse_cards(f.read(), quiet) if r]
+    many = [dict(r, **{'선거 단위': f"{r['선거 단위']} #{i}"}) for i in range(args.copies) for r in rows]
+
+    print(f"{'rows':>8}{'legacy(KB)':>13}{'typed(KB)':>12}{'typed own(KB)':>15}{'ratio':>8}")
+    snapshots = {}
+    for data in (rows, many):
+        legacy, typed = legacy_snapshot(data), typed_snapshot(data)
+        snapshots[len(data)] = (legacy, typed)
+        a, b, own = legacy.memory_usage(deep=True).sum(), typed.memory_usage(deep=True).sum(), owned_bytes(typed)
+        print(f"{len(data):>8,}{a / 1024:>13,.1f}{b / 1024:>12,.1f}{own / 1024:>15,.1f}{own / a:>8.1%}")
+
+    legacy, typed = snapshots[len(rows)]
+    commissions = sorted(typed['담당 선관위'].dropna().unique().tolist())[:3]
+    print(f"\n재실행 1회 필터/정렬 ({len(rows):,}행, 선관위 필터: 없음 / {len(commissions)}개)")
+    print(f"{'sort':<14}{'filter':>7}{'legacy peak(KB)':>17}{'typed peak(KB)':>16}{'legacy ms':>11}{'typed ms':>10}")
+    for sort_option in SORT_KEYS:
+        for selected in ([], commissions):
+            (pa, ta), (pb, tb) = (measure(lambda: view(df, selected, sort_option), args.repeat)
+                                  for view, df in ((legacy_view, legacy), (typed_view, typed)))
+            print(f"{sort_option:<14}{len(selected):>7}{pa / 1024:>17,.1f}{pb / 1024:>16,.1f}{ta:>11.2f}{tb:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
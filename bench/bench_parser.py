@@ -0,0 +1,120 @@
+import os
+import re
+import sys
+import time
+import glob
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from card_parser import parse_cards, clean_unit_name, HAS_LXML
+from mapping_db import get_commission
+from make_fixtures import FIXTURE_DIR
+
+# ==============================================================================
+# [마이크로 벤치마크] 카드 파서 백엔드 비교 (저장된 HTML 픽스처 기준)
+# ==============================================================================
+# 사용법: python bench/bench_parser.py [-n 반복횟수]
+# legacy = 기존 구현 (html.parser + 카드마다 find_previous('h3'))
+
+
+def parse_cards_legacy(html):
+    """기존 get_data_from_server의 파싱 루프 (비교 기준)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    data_list = []
+    for card in soup.find_all('div', class_='card-custom'):
+        if not card.find('h4'): continue
+        prev_header = card.find_previous('h3')
+        if prev_header and "진행중" in prev_header.get_text(strip=True):
+            raw_name = card.find('h4').get_text(strip=True)
+            clean_name = clean_unit_name(raw_name)
+            commission_name = get_commission(clean_name)
+            if commission_name == "기타/공통": commission_name = get_commission(raw_name)
+            rate, voted, total, remaining = None, None, None, None
+            for label in card.find_all('p'):
+                text = label.get_text(strip=True)
+                val_tag = label.find_next_sibling('h5')
+                if not val_tag: continue
+                val = val_tag.get_text(strip=True)
+                if "투표율" in text:
+                    if '(' in val:
+                        parts = val.split('(')
+                        try:
+                            rate = float(parts[0].replace('%', '').strip())
+                            voted = int(parts[1].replace('명', '').replace(')', '').replace(',', '').strip())
+                        except: pass
+                    else:
+                        try: rate = float(val.replace('%', '').strip())
+                        except: pass
+                elif "총 유권자" in text:
+                    try: total = int(val.replace('명', '').replace(',', '').strip())
+                    except: pass
+                elif "투표 성사" in text or "남은 투표" in text:
+                    try: remaining = int(val.replace('명', '').replace(',', '').strip())
+                    except: pass
+            if rate is None and total is None:
+                card_text = card.get_text(" ", strip=True)
+                rate_match = re.search(r'([\d\.]+)\s*%', card_text)
+                if rate_match:
+                    try: rate = float(rate_match.group(1))
+                    except: pass
+                total_match = re.search(r'총\s*유권자.*?([\d,]+)\s*명', card_text)
+                if total_match:
+                    try: total = int(total_match.group(1).replace(',', ''))
+                    except: pass
+                if voted is None and rate is not None and total is not None:
+                    voted = int(total * (rate / 100))
+            if rate is not None or total is not None:
+                data_list.append({
+                    "담당 선관위": commission_name, "선거 단위": clean_name,
+                    "투표율": rate, "투표자 수": voted, "총 유권자": total, "투표 성사 잔여 인원": remaining
+                })
+            if clean_name == "외국인 학생회": break
+    return data_list
+
+
+def quiet(msg):
+    pass
+
+
+PARSERS = {
+    "legacy": parse_cards_legacy,
+    "bs4": lambda html: parse_cards(html, quiet, backend="bs4"),
+}
+if HAS_LXML: PARSERS["lxml"] = lambda html: parse_cards(html, quiet, backend="lxml")
+
+
+def bench(fn, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not paths: sys.exit("픽스처가 없습니다. 먼저 python bench/make_fixtures.py 를 실행하세요.")
+
+    print(f"{'fixture':<24}{'parser':<8}{'rows':>6}{'best(ms)':>11}{'speedup':>9}")
+    for path in paths:
+        with open(path, encoding="utf-8") as f: html = f.read()
+        expected = parse_cards_legacy(html)
+        base = None
+        for name, fn in PARSERS.items():
+            rows = fn(html) or []  # 카드가 없으면 새 파서는 None, legacy는 []
+            if rows != expected: print(f"⚠️ {os.path.basename(path)}: {name} 결과가 legacy와 다릅니다.")
+            t = bench(fn, html, args.repeat)
+            base = base or t
+            print(f"{os.path.basename(path):<24}{name:<8}{len(rows):>6}{t * 1000:>11.2f}{base / t:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
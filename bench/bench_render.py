@@ -0,0 +1,104 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from enrich import enrich_snapshot
+from render import create_html_table, RowFragmentCache
+
+# ==============================================================================
+# [벤치마크] 메인 표 렌더링 (합성 10,000행)
+# ==============================================================================
+# 사용법: python bench/bench_render.py [-n 행 수]
+# legacy = 기존 구현 (iterrows + 문자열 += + 행마다 is_target_unit)
+
+
+def create_html_table_legacy(df):
+    from mapping_db import is_target_unit
+    html = '<table class="custom-table"><thead><tr>'
+    for col in ['No.', '담당 선관위', '선거 단위', '투표율', '투표자 수', '증가', '총 유권자', '투표 성사 잔여 인원']:
+        html += f'<th>{col}</th>'
+    html += '</tr></thead><tbody>'
+    for _, row in df.iterrows():
+        remaining = row['투표 성사 잔여 인원']
+        voted = row['투표자 수']
+        diff = row.get('증가', 0)
+        row_class = "default-row"
+        if not pd.isna(remaining):
+            if remaining <= 0: row_class = "success-row"
+            elif not pd.isna(voted) and voted > 0 and remaining <= (voted * 0.2): row_class = "warning-row"
+        diff_html = "-"
+        if diff > 0: diff_html = f'<span style="color: #e11d48; font-weight: bold;">▲ {int(diff):,}</span>'
+        unit_display = row['선거 단위']
+        if is_target_unit(unit_display): unit_display = f'<span class="target-highlight">{unit_display}</span>'
+        html += f'<tr class="{row_class}">'
+        html += f"<td>{row['일련번호']}</td><td>{row['담당 선관위']}</td><td>{unit_display}</td>"
+        html += f"<td>{row['투표율']:.2f}%" if not pd.isna(row['투표율']) else "<td>-</td>"
+        html += f"<td>{int(row['투표자 수']):,}</td>" if not pd.isna(row['투표자 수']) else "<td>-</td>"
+        html += f"<td>{diff_html}</td>"
+        html += f"<td>{int(row['총 유권자']):,}</td>" if not pd.isna(row['총 유권자']) else "<td>-</td>"
+        html += f"<td>{int(remaining):,}</td>" if not pd.isna(remaining) else "<td>-</td>"
+        html += '</tr>'
+    html += '</tbody></table>'
+    return html
+
+
+def synthetic_frames(n, seed=0):
+    """(직전 스냅샷, 현재 스냅샷) - 현재 스냅샷은 약 5%의 단위만 투표자 수가 변함"""
+    rnd = random.Random(seed)
+    units = ["공학 1반", "심리학과", "의과대학", "사회학과 학생총투표"] + [f"합성{i:05d}학과" for i in range(n - 4)]
+    rows = []
+    for i, unit in enumerate(units):
+        total = rnd.randint(50, 3000)
+        voted = rnd.randint(0, total)
+        rows.append({
+            "일련번호": i + 1, "담당 선관위": rnd.choice(["문과대학", "공과대학", "기타/공통"]), "선거 단위": unit,
+            "투표율": voted / total * 100 if i % 17 else None, "투표자 수": voted, "총 유권자": total,
+            "투표 성사 잔여 인원": total // 2 - voted if i % 11 else None,
+        })
+    old = pd.DataFrame(rows)
+    new = old.copy()
+    changed = new.sample(frac=0.05, random_state=seed).index
+    new.loc[changed, "투표자 수"] += 3
+    new.loc[changed, "투표 성사 잔여 인원"] -= 3
+    return enrich_snapshot(old), enrich_snapshot(new, old)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--rows", type=int, default=10000)
+    args = ap.parse_args()
+    old, new = synthetic_frames(args.rows)
+
+    t_legacy, html_legacy = timed(create_html_table_legacy, new)
+    t_cold, html_cold = timed(create_html_table, new, None)
+    cache = RowFragmentCache()
+    create_html_table(old, cache)                       # 직전 갱신 렌더링으로 캐시 채움
+    t_incr, html_incr = timed(create_html_table, new, cache)
+    t_warm, _ = timed(create_html_table, new, cache)    # 필터/정렬만 바뀐 재실행
+
+    # 기존 구현은 투표율 셀의 </td>가 빠져 있으므로 비교 전에 보정
+    expected = re.sub(r'(\d%)<td>', r'\1</td><td>', html_legacy)
+    assert html_cold == expected and html_incr == expected, "렌더링 결과가 기존 구현과 다릅니다."
+
+    print(f"rows={len(new):,}  changed={int((new['증가'] > 0).sum()):,}")
+    print(f"legacy (iterrows)          {t_legacy * 1000:9.1f}ms")
+    print(f"vectorized (no cache)      {t_cold * 1000:9.1f}ms  {t_legacy / t_cold:6.1f}x")
+    print(f"cached, 5% rows changed    {t_incr * 1000:9.1f}ms  {t_legacy / t_incr:6.1f}x")
+    print(f"cached, nothing changed    {t_warm * 1000:9.1f}ms  {t_legacy / t_warm:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import statistics
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==============================================================================
+# [벤치마크] 콜드 스타트 import 시간 (python -X importtime)
+# ==============================================================================
+# 사용법: python bench/bench_startup.py [-r 반복 횟수] [--budget-ms 허용 상한]
+# shell  = CSS/제목을 그리기 전까지 필요한 모듈 (streamlit만)
+# ui     = 첫 표를 그리기 전에 app.py가 불러오는 모듈
+# legacy = 기존 app.py 최상단 import (selenium, webdriver_manager, bs4 포함)
+# 매 측정마다 새 프로세스를 띄우므로 .pyc 캐시를 제외하면 항상 콜드 상태입니다.
+# --budget-ms를 주면 ui 중앙값이 상한을 넘을 때 종료 코드 1 (CI에서 회귀 감지용)
+
+SHELL_MODULES = ["streamlit"]
+UI_MODULES = ["streamlit", "pandas", "mapping_db", "enrich", "forecast", "render", "worker", "history"]
+LEGACY_MODULES = ["streamlit", "pandas", "pytz", "selenium.webdriver", "selenium.webdriver.chrome.service",
+                  "selenium.webdriver.common.by", "selenium.webdriver.support.ui",
+                  "selenium.webdriver.support.expected_conditions", "webdriver_manager.chrome", "bs4", "mapping_db"]
+
+# 첫 화면 경로에서 로드되면 안 되는 크롤링 의존성
+SCRAPING_MODULES = ["requests", "lxml", "bs4", "selenium", "webdriver_manager", "scraper", "card_parser", "driver_pool"]
+
+
+def import_profile(modules):
+    """새 인터프리터에서 modules를 import하고 (모듈 -> 누적 μs, 로드된 크롤링 의존성) 반환"""
+    code = "import sys\n" + "".join(f"import {m}\n" for m in modules) + \
+        f"print(','.join(m for m in {SCRAPING_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cum, name = line[len("import time:"):].split("|")
+        if not name.startswith(" " * 2):  # 최상위 import만 (들여쓰기 = 중첩 import)
+            cumulative[name.strip()] = int(cum)
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative, loaded
+
+
+def measure(modules, repeat, startup=()):
+    """인터프리터 자체 시작 시 로드되는 모듈(startup)을 뺀 import 시간 중앙값"""
+    runs = [import_profile(modules) for _ in range(repeat)]
+    runs = [({k: v for k, v in cum.items() if k not in startup}, loaded) for cum, loaded in runs]
+    totals = [sum(cum.values()) / 1000 for cum, _ in runs]
+    per_module = {name: statistics.median(cum.get(name, 0) for cum, _ in runs) / 1000 for name in runs[0][0]}
+    return statistics.median(totals), per_module, runs[-1][1]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-r", "--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=8, help="느린 최상위 모듈 몇 개를 보여줄지")
+    ap.add_argument("--budget-ms", type=float, default=None)
+    args = ap.parse_args()
+
+    startup = set(import_profile([])[0])
+    results = {}
+    for label, modules in [("legacy", LEGACY_MODULES), ("shell", SHELL_MODULES), ("ui", UI_MODULES)]:
+        total, per_module, loaded = measure(modules, args.repeat, startup)
+        results[label] = total
+        print(f"{label:<7} 중앙값 {total:8.1f}ms ({args.repeat}회) | 로드된 크롤링 의존성: {', '.join(loaded) or '없음'}")
+        for name, ms in sorted(per_module.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {name:<40} {ms:8.1f}ms")
+
+    print(f"⏱️ 화면 골격까지 {results['shell']:.1f}ms, 첫 표까지 {results['ui']:.1f}ms "
+          f"(기존 {results['legacy']:.1f}ms, {results['legacy'] / results['ui']:.1f}x)")
+
+    _, ui_loaded = import_profile(UI_MODULES)
+    if ui_loaded:
+        print(f"❌ 첫 화면 경로에서 크롤링 의존성이 로드됨: {', '.join(ui_loaded)}")
+        sys.exit(1)
+    if args.budget_ms is not None and results['ui'] > args.budget_ms:
+        print(f"❌ 허용 상한 초과: {results['ui']:.1f}ms > {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import json
+import random
+
+# ==============================================================================
+# [벤치마크 픽스처] 선거 현황 페이지(votes) 구조를 흉내 낸 HTML 생성기
+# ==============================================================================
+# 실제 페이지와 같은 구조: <h3>섹션 제목</h3> 아래에 div.card-custom 카드 나열
+# 카드 안에는 <p>라벨</p><h5>값</h5> 쌍 (일부는 Regex 비상망 경로를 타도록 자유 텍스트)
+# 페이지마다 정답 파일(<이름>.expected.json: 진행중 카드의 기대 선거 단위/담당 선관위)을 함께 저장
+# replay/ 에는 시간 순서대로 투표자 수가 늘어나는 스냅샷을 저장 (ELECTION_FETCH_MODE=replay 용)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REPLAY_DIR = os.path.join(FIXTURE_DIR, "replay")
+REPLAY_TICKS = 6
+
+# (카드 제목, 기대 선거 단위, 기대 담당 선관위) - mapping_db.ELECTION_DB 단위를 실제 게시 형식으로 표기
+CARD_TITLES = [
+    ("연세대학교 제39대 총학생회 선거", "총학생회", "중앙선거관리위원회"),
+    ("제38대 총동아리연합회 선거", "총동아리연합회", "총동아리연합회"),
+    ("창작예술분과위원회 선거", "창작예술분과위원회", "총동아리연합회"),
+    ("2026학년도 중어중문학과 학생회 선거", "중어중문학과", "문과대학"),
+    ("2026학년도 영어영문학과 학생회 선거", "영어영문학과", "문과대학"),
+    ("2026학년도 사학과 학생회 선거", "사학과", "문과대학"),
+    ("2026학년도 심리학과 학생회 선거", "심리학과", "문과대학"),
+    ("제12대 상경·경영대학 학생회 선거", "상경·경영대학", "상경·경영대학"),
+    ("상경·경영대학 학생총투표", "상경·경영대학 학생총투표", "상경·경영대학"),
+    ("경영 1반 학생회 선거", "경영 1반", "상경·경영대학"),
+    ("상경 10반 학생회 선거", "상경 10반", "상경·경영대학"),
+    ("2026년도 이과대학 수학과 학생회 선거", "수학과", "이과대학"),
+    ("2026년도 이과대학 천문우주학과 학생회 선거", "천문우주학과", "이과대학"),
+    ("공학 1반 학생회 선거", "공학 1반", "공과대학"),
+    ("공학 10반 학생회 선거", "공학 10반", "공과대학"),
+    ("연세건축 아시비 선거운동본부", "연세건축 아시비", "공과대학"),
+    ("시스템반도체공학과 학생회 선거", "시스템반도체공학과", "공과대학"),
+    ("컴퓨터과학과 학생회 선거", "컴퓨터과학과", "인공지능융합대학"),
+    ("인공지능융합대학 학생회 선거", "인공지능융합대학", "인공지능융합대학"),
+    ("신과대학 학생회 선거", "신과대학", "신과대학"),
+    ("사회학과 학생총투표", "사회학과 학생총투표", "사회과학대학"),
+    ("사회과학대학 동아리연합회 선거", "사회과학대학 동아리연합회", "사회과학대학"),
+    ("언론홍보영상학부 학생회 선거", "언론홍보영상학부", "사회과학대학"),
+    ("생화학과 학생회 선거", "생화학과", "생명시스템대학"),
+    ("관현악과(현) 학생회 선거", "관현악과(현)", "음악대학"),
+    ("피아노과 학생회 선거", "피아노과", "음악대학"),
+    ("아동·가족학과 학생회 선거", "아동가족학과", "생활과학대학"),
+    ("통합디자인학과 학생회 선거", "통합디자인학과", "생활과학대학"),
+    ("체육계열 학생회 선거", "체육계열", "체육계열"),
+    ("의과대학 학생회 선거", "의과대학", "의과대학"),
+    ("의과대학 동아리연합회장 선거", "의과대학 동아리연합회장", "의과대학"),
+    ("치과대학 학생회 선거", "치과대학", "치과대학"),
+    ("간호대학 학생회 선거", "간호대학", "간호대학"),
+    ("약학대학 학생회 선거", "약학대학", "약학대학"),
+    ("언더우드국제대학 학생회 선거", "언더우드국제대학", "언더우드국제대학"),
+    ("국제통상전공 학생회 선거", "국제통상전공", "글로벌인재대학"),
+    ("외국인 학생회 선거", "외국인 학생회", "글로벌인재대학"),
+]
+
+# 이름 정리(remove_list, 접두어, 특수 단위) 경계 사례
+EDGE_TITLES = [
+    ("연세대학교 제39대 총학생회 재선거", "총학생회", "중앙선거관리위원회"),
+    ("제5대 상경·경영대학 학생회 선거운동본부", "상경·경영대학", "상경·경영대학"),
+    ("상경·경영대학 학생총투표", "상경·경영대학 학생총투표", "상경·경영대학"),
+    ("2026학년도 이과대학 물리학과 학생회 선거", "물리학과", "이과대학"),
+    ("2026년도 공학 2반 학생회 선거", "공학 2반", "공과대학"),
+    ("아동 및 가족학과 학생회 선거", "아동가족학과", "생활과학대학"),
+    ("사회학과 학생회 선거", "사회학과", "사회과학대학"),
+    ("의예과 동아리연합회 선거", "의예과 동아리연합회", "의과대학"),
+    ("Yonsei 외국인 학생회 (International Student Association)", "외국인 학생회", "글로벌인재대학"),
+]
+
+# 카드가 서버 렌더링되지 않은 응답 (SPA 껍데기) - 파서는 None을 반환해야 함
+SHELL_PAGE = ('<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>연세대학교 선거관리위원회</title></head>'
+              '<body><div id="root"></div><script src="/static/js/main.js"></script></body></html>')
+
+
+def card_html(title, total, voted, remaining=None, style="tags"):
+    rate = voted / total * 100 if total else 0.0
+    if style == "text":
+        # 태그 구조가 다른 카드 -> Regex 비상망으로만 파싱됨
+        body = f'<div class="card-text">현재 투표율 {rate:.2f}% · 총 유권자 {total:,}명</div>'
+    else:
+        body = (
+            f'<div class="col"><p class="label">투표율</p><h5 class="value">{rate:.2f}% ({voted:,}명)</h5></div>'
+            f'<div class="col"><p class="label">총 유권자</p><h5 class="value">{total:,}명</h5></div>'
+        )
+        if remaining is not None:
+            body += f'<div class="col"><p class="label">투표 성사까지 남은 인원</p><h5 class="value">{remaining:,}명</h5></div>'
+    return (
+        '<div class="col-md-4"><div class="card card-custom"><div class="card-body">'
+        f'<h4 class="card-title">{title}</h4><div class="row">{body}</div>'
+        '</div></div></div>'
+    )
+
+
+def page_labels(labels=CARD_TITLES, n_cards=None):
+    """페이지에 실릴 (카드 제목, 기대 선거 단위, 기대 담당 선관위) 목록"""
+    labels = list(labels)
+    if n_cards:
+        # 대량 페이지: 외국인 학생회(마지막 카드) 앞에 합성 학과를 채워 넣음
+        last = labels.pop()
+        labels += [(f"합성{i:05d}학과 학생회 선거", f"합성{i:05d}학과", "기타/공통") for i in range(n_cards - len(labels) - 1)]
+        labels.append(last)
+    return labels
+
+
+def build_page(titles=None, n_cards=None, seed=0, tick=0):
+    """진행중/예정/종료 섹션을 가진 페이지 HTML (tick이 커질수록 투표자 수 증가)"""
+    rnd = random.Random(seed)
+    titles = list(titles) if titles else [t for t, _, _ in page_labels(n_cards=n_cards)]
+
+    parts = ['<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>연세대학교 선거관리위원회</title></head><body>',
+             '<nav class="navbar"><a href="/">홈</a><a href="/votes">투표 현황</a></nav><main class="container">',
+             '<h3 class="section-title">진행중인 선거</h3><div class="row">']
+    for i, title in enumerate(titles):
+        total = rnd.randint(80, 4000) if "총학생회" not in title else 28000
+        voted = min(total, int(total * rnd.uniform(0.05, 0.6)) + tick * rnd.randint(0, 5))
+        remaining = total // 2 - voted if i % 9 != 4 else None
+        style = "text" if i % 13 == 7 else "tags"
+        parts.append(card_html(title, total, voted, remaining, style))
+    parts.append('</div><h3 class="section-title">투표 예정 선거</h3><div class="row">')
+    parts.append(card_html("2026학년도 철학과 학생회 선거", 300, 0, 150))
+    parts.append('</div><h3 class="section-title">종료된 선거</h3><div class="row">')
+    parts.append(card_html("2026학년도 물리학과 학생회 선거", 400, 260, 0))
+    parts.append('</div></main></body></html>')
+    return "\n".join(parts)
+
+
+def expected_of(labels):
+    if labels is None: return {"rows": None}
+    return {"rows": [{"title": t, "선거 단위": unit, "담당 선관위": comm} for t, unit, comm in labels]}
+
+
+def _write(directory, name, html, expected=None):
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f: f.write(html)
+    if expected is not None:
+        with open(os.path.join(directory, name.replace(".html", ".expected.json")), "w", encoding="utf-8") as f:
+            json.dump(expected, f, ensure_ascii=False, indent=1)
+    print(f"{os.path.relpath(os.path.join(directory, name), FIXTURE_DIR)}: {len(html):,} bytes")
+
+
+def write_fixtures():
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    pages = {
+        "votes_typical.html": (build_page(), page_labels()),
+        "votes_tick1.html": (build_page(tick=1), page_labels()),
+        "votes_large.html": (build_page(n_cards=600), page_labels(n_cards=600)),
+        "votes_edge_names.html": (build_page([t for t, _, _ in EDGE_TITLES], seed=1), EDGE_TITLES),
+        "votes_shell.html": (SHELL_PAGE, None),
+    }
+    for name, (html, labels) in pages.items():
+        _write(FIXTURE_DIR, name, html, expected_of(labels))
+    for tick in range(REPLAY_TICKS):
+        _write(REPLAY_DIR, f"votes_{tick:03d}.html", build_page(tick=tick * 3))
+
+
+if __name__ == "__main__":
+    write_fixtures()
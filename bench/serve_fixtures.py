@@ -0,0 +1,103 @@
+import os
+import sys
+import glob
+import time
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from make_fixtures import REPLAY_DIR
+
+# ==============================================================================
+# [로컬 대역 서버] 저장된 스냅샷으로 선거 현황 페이지(/votes)를 흉내 냄
+# ==============================================================================
+# 사용법: python bench/serve_fixtures.py [--dir 스냅샷 폴더] [--port 8765] [--tick 초]
+#   ELECTION_VOTES_URL=http://127.0.0.1:8765/votes ELECTION_FETCH_MODE=http streamlit run app.py
+# - --tick 초마다 다음 스냅샷으로 넘어감 (0이면 /votes 요청마다), 마지막 스냅샷에서 멈춤
+# - ETag / Last-Modified를 붙이고 조건부 요청에는 304로 응답 (scraper.ChangeDetector 확인용)
+# - --latency-ms로 업스트림 응답 지연을 흉내 냄
+
+
+class SnapshotFeed:
+    def __init__(self, paths, tick):
+        self.pages = []
+        for path in paths:
+            with open(path, "rb") as f: body = f.read()
+            self.pages.append((os.path.basename(path), body, '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'))
+        self.tick = tick
+        self.started = time.monotonic()
+        self.served = 0
+        self._first_served = {}  # 스냅샷 인덱스 -> 처음 내보낸 시각 (Last-Modified)
+        self._lock = threading.Lock()
+
+    def current(self):
+        """(파일 이름, 본문, ETag, Last-Modified 시각)"""
+        with self._lock:
+            if self.tick: i = int((time.monotonic() - self.started) // self.tick)
+            else: i = self.served
+            self.served += 1
+            i = min(i, len(self.pages) - 1)
+            return (*self.pages[i], self._first_served.setdefault(i, time.time()))
+
+
+def make_handler(feed, latency, log):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if not self.path.split("?")[0].rstrip("/").endswith("votes"):
+                self.send_error(404)
+                return
+            if latency: time.sleep(latency)
+            name, body, etag, modified = feed.current()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            if log: super().log_message(fmt, *args)
+
+    return Handler
+
+
+def serve(directory=REPLAY_DIR, host="127.0.0.1", port=8765, tick=0.0, latency_ms=0, log=True):
+    """대역 서버를 백그라운드 스레드로 띄우고 (server, feed) 반환 (server.shutdown()으로 종료)"""
+    paths = [directory] if os.path.isfile(directory) else sorted(glob.glob(os.path.join(directory, "*.html")))
+    if not paths: raise SystemExit(f"스냅샷이 없습니다: {directory} (먼저 python bench/make_fixtures.py 실행)")
+    feed = SnapshotFeed(paths, tick)
+    server = ThreadingHTTPServer((host, port), make_handler(feed, latency_ms / 1000, log))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, feed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", default=REPLAY_DIR)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--tick", type=float, default=60.0, help="다음 스냅샷으로 넘어가는 간격 (초, 0이면 요청마다)")
+    ap.add_argument("--latency-ms", type=int, default=0)
+    args = ap.parse_args()
+
+    server, feed = serve(args.dir, args.host, args.port, args.tick, args.latency_ms)
+    host, port = server.server_address[:2]
+    print(f"🛰️ {len(feed.pages)}개 스냅샷 제공 중: http://{host}:{port}/votes")
+    print(f"   ELECTION_VOTES_URL=http://{host}:{port}/votes ELECTION_FETCH_MODE=http streamlit run app.py")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
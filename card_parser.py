@@ -0,0 +1,178 @@
+import re
+import os
+from typing import NamedTuple
+
+import metrics
+import mapping_db
+
+# ==============================================================================
+# [카드 파서] 선거 현황 페이지 HTML -> 행(dict) 목록
+# ==============================================================================
+# - 문서를 앞에서부터 한 번만 훑으면서 직전 <h3> 섹션 제목("진행중" 등)을 기억
+#   (카드마다 find_previous('h3')로 문서를 거슬러 올라가던 O(n^2) 구조 제거)
+# - 백엔드: "lxml"(빠름, 설치되어 있으면 기본값) / "bs4"(BeautifulSoup html.parser)
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+PARSER_BACKEND = os.environ.get("ELECTION_PARSER_BACKEND") or ("lxml" if HAS_LXML else "bs4")
+
+RATE_RE = re.compile(r'([\d\.]+)\s*%')
+TOTAL_RE = re.compile(r'총\s*유권자.*?([\d,]+)\s*명')
+
+
+class ParserProfile(NamedTuple):
+    """선거 사이트별 페이지 구조 (sources.toml의 parser 값으로 선택)"""
+    card_class: str = "card-custom"      # 선거 카드 div의 class
+    active_header: str = "진행중"         # 이 단어가 들어간 <h3> 섹션의 카드만 수집
+    stop_after: str = None               # 이 단위까지 읽고 중단 (그 뒤는 다른 목록)
+
+
+PROFILES = {
+    "yonsei": ParserProfile(stop_after="외국인 학생회"),
+    "generic": ParserProfile(),
+}
+DEFAULT_PROFILE = PROFILES["yonsei"]
+
+
+def clean_unit_name(raw_name, table=None):
+    """카드 제목(h4)을 선거 단위 이름으로 정리 (규칙은 election_config.toml [names])"""
+    return (table or mapping_db.DEFAULT).normalize_name(raw_name)
+
+
+def _to_int(val):
+    return int(val.replace('명', '').replace(')', '').replace(',', '').strip())
+
+
+def build_row(raw_name, clean_name, label_pairs, card_text, table=None):
+    """카드 하나의 (라벨, 값) 쌍과 전체 텍스트(지연 계산 함수)로 행 생성 (정보가 없으면 None)"""
+    table = table or mapping_db.DEFAULT
+    commission_name = table.lookup(clean_name).commission
+    if commission_name == table.fallback: commission_name = table.get_commission(raw_name)
+
+    rate, voted, total, remaining = None, None, None, None
+
+    # [하이브리드 파싱] 1단계: 태그 구조 (<p>라벨</p> 다음의 <h5>값</h5>)
+    for text, val in label_pairs:
+        if "투표율" in text:
+            if '(' in val:
+                parts = val.split('(')
+                try:
+                    rate = float(parts[0].replace('%', '').strip())
+                    voted = _to_int(parts[1])
+                except: pass
+            else:
+                try: rate = float(val.replace('%', '').strip())
+                except: pass
+        elif "총 유권자" in text:
+            try: total = _to_int(val)
+            except: pass
+        elif "투표 성사" in text or "남은 투표" in text:
+            try: remaining = _to_int(val)
+            except: pass
+
+    # [하이브리드 파싱] 2단계: Regex 비상망
+    if rate is None and total is None:
+        metrics.inc("regex_fallback")
+        text = card_text()
+        rate_match = RATE_RE.search(text)
+        if rate_match:
+            try: rate = float(rate_match.group(1))
+            except: pass
+        total_match = TOTAL_RE.search(text)
+        if total_match:
+            try: total = int(total_match.group(1).replace(',', ''))
+            except: pass
+        if voted is None and rate is not None and total is not None:
+            voted = int(total * (rate / 100))
+
+    # 데이터 추가 (일부 정보라도 있으면 추가)
+    if rate is None and total is None: return None
+    return {
+        "담당 선관위": commission_name, "선거 단위": clean_name,
+        "투표율": rate, "투표자 수": voted, "총 유권자": total, "투표 성사 잔여 인원": remaining
+    }
+
+
+# ------------------------------------------------------------------------------
+# 백엔드별 문서 순회: (섹션 제목, 카드 제목, 라벨 쌍 iterable, 카드 텍스트 함수) 생성
+# ------------------------------------------------------------------------------
+def _iter_cards_lxml(html, card_class):
+    if not html.strip(): return
+    doc = lxml.html.fromstring(html)
+
+    def text_of(el):
+        return "".join(s.strip() for s in el.itertext())
+
+    def pairs_of(card):
+        for p in card.iter('p'):
+            sib = p.getnext()
+            while sib is not None and sib.tag != 'h5': sib = sib.getnext()
+            if sib is not None: yield text_of(p), text_of(sib)
+
+    header = None
+    for el in doc.iter('h3', 'div'):
+        if el.tag == 'h3':
+            header = text_of(el)
+        elif card_class in (el.get('class') or '').split():
+            title = next(el.iter('h4'), None)
+            yield header, (text_of(title) if title is not None else None), pairs_of(el), \
+                (lambda card=el: " ".join(s.strip() for s in card.itertext() if s.strip()))
+
+
+def _iter_cards_bs4(html, card_class):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def is_target(tag):
+        return tag.name == 'h3' or (tag.name == 'div' and card_class in (tag.get('class') or []))
+
+    def pairs_of(card):
+        for label in card.find_all('p'): # 모든 p 태그 검색 (클래스 무관)
+            val_tag = label.find_next_sibling('h5')
+            if val_tag: yield label.get_text(strip=True), val_tag.get_text(strip=True)
+
+    header = None
+    for el in soup.find_all(is_target):
+        if el.name == 'h3':
+            header = el.get_text(strip=True)
+        else:
+            title = el.find('h4')
+            yield header, (title.get_text(strip=True) if title else None), pairs_of(el), \
+                (lambda card=el: card.get_text(" ", strip=True))
+
+
+BACKENDS = {"lxml": _iter_cards_lxml, "bs4": _iter_cards_bs4}
+
+
+def parse_cards(html, log=print, backend=None, profile=None, table=None):
+    """페이지 HTML에서 '진행중' 선거 카드를 파싱 (카드가 하나도 없으면 None)
+    profile: ParserProfile (기본: 연세대 신촌), table: mapping_db.MappingTable (기본: DEFAULT)"""
+    backend = backend or PARSER_BACKEND
+    if backend == "lxml" and not HAS_LXML: backend = "bs4"
+    profile = profile or DEFAULT_PROFILE
+
+    cards = list(BACKENDS[backend](html, profile.card_class))
+    log(f"🔍 발견된 카드(div.{profile.card_class}) 개수: {len(cards)}개 (파서: {backend})")
+    if not cards:
+        metrics.inc("empty_fetches")
+        return None
+
+    data_list = []
+    log("데이터 파싱 시작...")
+
+    for header, raw_name, label_pairs, card_text in cards:
+        if raw_name is None: continue
+        if not header or profile.active_header not in header: continue
+
+        clean_name = clean_unit_name(raw_name, table)
+        row = build_row(raw_name, clean_name, label_pairs, card_text, table)
+        if row: data_list.append(row)
+        else: metrics.inc("parse_failures")
+
+        if clean_name == profile.stop_after: break
+
+    log(f"✅ 파싱 완료: 총 {len(data_list)}건 추출됨")
+    return data_list
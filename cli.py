@@ -0,0 +1,157 @@
+"""
+선거 현황 수집기 (Streamlit 없이 실행하는 헤드리스/데몬 모드)
+
+사용 예:
+    python cli.py --once --format jsonl            # 한 번 수집 후 종료 (cron)
+    python cli.py --interval 60 --format parquet   # 60초마다 수집 (systemd 서비스)
+    python cli.py --mode replay --interval 1       # 저장된 스냅샷(bench/fixtures/replay) 재생
+    python cli.py --sources campuses.toml          # 여러 선거 사이트를 동시에 수집 (기본: sources.toml)
+
+종료 코드:
+    0  정상 종료 (--once 수집 성공 또는 변경 없음, Ctrl+C / SIGTERM)
+    1  --once 수집 실패 (수집 기한 안에 끝난 대상이 없는 경우 포함)
+    2  연속 실패 횟수가 --max-failures 를 넘음
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+from datetime import datetime
+
+EXIT_OK, EXIT_FETCH_FAILED, EXIT_TOO_MANY_FAILURES = 0, 1, 2
+
+SNAPSHOT_COLUMNS = ['수집 시각', 'source', '일련번호', '담당 선관위', '선거 단위', '투표율', '투표자 수', '총 유권자',
+                    '투표 성사 잔여 인원', '증가', 'eta_minutes', 'projected_rate']
+
+
+def write_snapshot(df, out_dir, fmt, now):
+    """스냅샷 한 개를 형식별 파일에 기록하고 경로를 반환"""
+    from schema import plain_frame
+    df = plain_frame(df).assign(**{'수집 시각': now.isoformat(timespec='seconds')})  # 범주형 -> 문자열, float32 -> 소수 둘째 자리
+    df = df[[c for c in SNAPSHOT_COLUMNS if c in df.columns]]
+    day = now.strftime('%Y%m%d')
+    os.makedirs(out_dir, exist_ok=True)
+
+    if fmt == "csv":
+        path = os.path.join(out_dir, f"snapshots_{day}.csv")
+        new_file = not os.path.exists(path)
+        df.to_csv(path, mode='a', header=new_file, index=False, encoding='utf-8-sig' if new_file else 'utf-8')
+    elif fmt == "jsonl":
+        path = os.path.join(out_dir, f"snapshots_{day}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(df.to_json(orient='records', lines=True, force_ascii=False))
+    elif fmt == "parquet":
+        part_dir = os.path.join(out_dir, f"date={day}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"{now.strftime('%H%M%S')}.parquet")
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    return path
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="연세대학교 선거 현황 수집기 (헤드리스 모드)")
+    ap.add_argument("--once", action="store_true", help="한 번만 수집하고 종료")
+    ap.add_argument("--interval", type=int, default=60, help="수집 주기 (초, 기본 60)")
+    ap.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="jsonl", help="스냅샷 저장 형식")
+    ap.add_argument("--out", default="snapshots", help="스냅샷 저장 폴더")
+    ap.add_argument("--mode", choices=["auto", "http", "browser", "replay"], default=None, help="수집 경로 (기본: ELECTION_FETCH_MODE 또는 auto)")
+    ap.add_argument("--replay-dir", default=None, help="replay 모드에서 재생할 스냅샷 폴더 (기본: ELECTION_REPLAY_DIR)")
+    ap.add_argument("--sources", default=None,
+                    help="수집 대상 목록 파일 (기본: ELECTION_SOURCES_PATH 또는 sources.toml, --mode/--replay-dir를 주면 기본 대상 하나만 수집)")
+    ap.add_argument("--max-failures", type=int, default=5, help="연속 실패 허용 횟수 (0이면 무제한)")
+    ap.add_argument("--history", action="store_true", help="SQLite 이력 저장소(history.py)에도 기록")
+    ap.add_argument("--quiet", action="store_true", help="수집 과정 로그 생략")
+    ap.add_argument("--metrics-file", default=None, help="수집마다 Prometheus 텍스트 형식 메트릭을 쓸 파일 (기본: ELECTION_METRICS_PATH)")
+    ap.add_argument("--metrics-port", type=int, default=None, help="/metrics HTTP 엔드포인트 포트 (기본: ELECTION_METRICS_PORT)")
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    import pytz
+    import metrics
+    from worker import FetchWorker
+    if args.metrics_file: metrics.METRICS_PATH = args.metrics_file
+    metrics.serve(args.metrics_port)
+    KST = pytz.timezone('Asia/Seoul')
+
+    def fetch(log, detector=None):
+        from scraper import get_data_from_server
+        return get_data_from_server(log, mode=args.mode, detector=detector, replay_dir=args.replay_dir)
+
+    # --mode/--replay-dir는 기본 대상 하나에만 적용, 아니면 수집 대상 목록(sources.toml)을 동시에 수집
+    sources, single = None, args.mode or args.replay_dir
+    if not single:
+        from sources import load_sources
+        sources = load_sources(args.sources)
+
+    store = None
+    if args.history:
+        from history import SnapshotStore
+        store = SnapshotStore()
+    worker = FetchWorker(interval=args.interval, fetch_fn=fetch if single else None, store=store, sources=sources)
+    if args.quiet: worker.log = lambda msg: None
+
+    state = {"failures": 0, "exit": None}
+
+    def job():
+        start = time.monotonic()
+        published = worker.run_once()
+        timed_out = []
+        if args.once and worker.scheduler:
+            # 한 번 실행: 라운드가 먼저 끝나도 수집 중인 대상을 수집 기한(FETCH_DEADLINE)까지 기다렸다가 합침
+            from scraper import FETCH_DEADLINE
+            timed_out = worker.scheduler.wait_pending(FETCH_DEADLINE - (time.monotonic() - start))
+            published = worker.run_once() or published
+        now = datetime.now(KST)
+        error = worker.last_error
+        if timed_out and not published and not error: error = f"수집 시간 초과: {', '.join(timed_out)}"
+        if error and published:  # 일부 대상만 실패: 받은 표는 저장하고 경고만
+            print(f"[{now:%H:%M:%S}] ⚠️ 일부 대상 수집 실패 (이전 표로 합침): {error}", file=sys.stderr)
+        elif error:
+            state["failures"] += 1
+            print(f"[{now:%H:%M:%S}] ❌ 수집 실패 ({state['failures']}회 연속): {error}", file=sys.stderr)
+            if args.once: state["exit"] = EXIT_FETCH_FAILED
+            elif args.max_failures and state["failures"] >= args.max_failures: state["exit"] = EXIT_TOO_MANY_FAILURES
+            return
+        state["failures"] = 0
+        if timed_out: print(f"[{now:%H:%M:%S}] ⚠️ 수집 시간 초과로 제외된 대상: {', '.join(timed_out)}", file=sys.stderr)
+        if published:
+            path = write_snapshot(worker.data, args.out, args.format, now)
+            print(f"[{now:%H:%M:%S}] ✅ {len(worker.data)}건 저장: {path}")
+        else:
+            print(f"[{now:%H:%M:%S}] 📭 변경 없음")
+        if args.once: state["exit"] = EXIT_OK
+
+    def on_signal(signum, frame):
+        state["exit"] = EXIT_OK
+    signal.signal(signal.SIGTERM, on_signal)
+
+    try:
+        if args.once:
+            job()
+        else:
+            import schedule
+            schedule.every(args.interval).seconds.do(job)
+            job()
+            while state["exit"] is None:
+                schedule.run_pending()
+                time.sleep(min(1, args.interval))
+    except KeyboardInterrupt:
+        state["exit"] = EXIT_OK
+    finally:
+        if store: store.close()
+        from driver_pool import shutdown_driver_pool
+        shutdown_driver_pool()
+
+    if state["exit"] == EXIT_TOO_MANY_FAILURES:
+        print(f"연속 {state['failures']}회 실패하여 종료합니다.", file=sys.stderr)
+    return state["exit"] if state["exit"] is not None else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
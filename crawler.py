@@ -0,0 +1,86 @@
+import os
+import re
+import time
+import threading
+import concurrent.futures
+from html import unescape
+from urllib.parse import urljoin, urlparse, parse_qs
+
+# ==============================================================================
+# [크롤러] 목록 페이지 + 추가 페이지(페이지네이션 등)를 제한된 동시성으로 수집
+# ==============================================================================
+# - 목록 페이지에서 같은 경로의 ?page=N 링크를 찾아 나머지 페이지를 동시에 요청
+# - ELECTION_EXTRA_URLS(쉼표 구분)로 선거별 상세 페이지 등을 직접 추가 가능
+# - 동시 요청 수(max_workers)와 호스트별 초당 요청 수(rate, 프로세스 전체 공유 RATE_LIMITER)를 함께 제한
+# 전체 지연 시간은 '목록 페이지 + 가장 느린 추가 페이지' 수준으로 유지됩니다.
+
+CRAWL_CONCURRENCY = int(os.environ.get("ELECTION_CRAWL_CONCURRENCY", "4"))
+CRAWL_RATE = float(os.environ.get("ELECTION_CRAWL_RATE", "5"))          # 호스트별 초당 최대 요청 수
+CRAWL_MAX_PAGES = int(os.environ.get("ELECTION_CRAWL_MAX_PAGES", "20"))
+EXTRA_URLS = [u.strip() for u in os.environ.get("ELECTION_EXTRA_URLS", "").split(",") if u.strip()]
+
+HREF_RE = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def discover_pages(html, base_url, max_pages=CRAWL_MAX_PAGES):
+    """목록 페이지에서 추가로 받아야 할 페이지 URL 목록 (중복/자기 자신 제외, 문서 순서 유지)"""
+    base = urlparse(base_url)
+    found = []
+    for href in HREF_RE.findall(html):
+        url = urljoin(base_url, unescape(href))
+        parsed = urlparse(url)
+        if parsed.netloc != base.netloc or parsed.path.rstrip("/") != base.path.rstrip("/"): continue
+        page = parse_qs(parsed.query).get("page")
+        if not page or page[0] in ("", "1", "0"): continue
+        if url not in found and url != base_url: found.append(url)
+    for url in EXTRA_URLS:
+        if url not in found: found.append(url)
+    return found[:max_pages]
+
+
+class HostRateLimiter:
+    """호스트별 최소 요청 간격을 지키도록 대기 (스레드 안전)"""
+
+    def __init__(self, rate=CRAWL_RATE):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = {}
+
+    def wait(self, url):
+        if not self.interval: return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now: time.sleep(slot - now)
+
+
+# 프로세스 전체에서 공유: 수집 라운드, 같은 호스트를 쓰는 수집 대상, 목록 페이지 요청(scraper.py)이 모두 같은 제한을 받음
+RATE_LIMITER = HostRateLimiter()
+
+
+def fetch_pages(urls, fetch, max_workers=CRAWL_CONCURRENCY, limiter=None, log=print):
+    """urls를 동시에 가져와 [(url, html 또는 None)]을 입력 순서대로 반환 (실패한 페이지는 None)"""
+    if not urls: return []
+    limiter = limiter or RATE_LIMITER
+
+    def task(url):
+        limiter.wait(url)
+        t0 = time.perf_counter()
+        html = fetch(url)
+        return html, time.perf_counter() - t0
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as pool:
+        futures = {pool.submit(task, url): url for url in urls}
+        for future in concurrent.futures.as_completed(futures):
+            url = futures[future]
+            try:
+                html, elapsed = future.result()
+                results[url] = html
+                log(f"📄 추가 페이지 수집: {url} ({elapsed:.2f}초)")
+            except Exception as e:
+                results[url] = None
+                log(f"⚠️ 추가 페이지 수집 실패: {url} ({e})")
+    return [(url, results[url]) for url in urls]
@@ -0,0 +1,65 @@
+import threading
+
+from aggregate import summary_values
+from render import render_rows, row_keys
+
+# ==============================================================================
+# [변경분 계산] 연속된 두 스냅샷을 선거 단위별로 비교해 바뀐 행/요약 칸만 추림
+# ==============================================================================
+# 행 비교 기준은 render.ROW_KEY_COLUMNS (표에 보이는 값 전체)입니다. 값이 같은 행은
+# 다시 렌더링하지도, 보내지도 않으므로 패치 크기는 '바뀐 단위 수'에 비례합니다.
+# 행 순서/구성은 단위가 추가·삭제·재정렬될 때만 order로 함께 보냅니다.
+#
+# 패치 형식 (JSON 직렬화 가능한 dict)
+#   v        : 새 스냅샷 버전       base    : 이 패치를 적용할 수 있는 이전 버전
+#   rows     : {선거 단위: '<tr>..</tr>'} (추가되거나 값이 바뀐 행만)
+#   removed  : [선거 단위]           order   : [선거 단위] 또는 None (순서 변화 없음)
+#   summary  : {요약 칸: 값} (바뀐 칸만)  updated : 최근 업데이트 시각 문자열
+
+
+def table_view(df):
+    """실시간 표에 표시할 행 (메인 표의 유효 행, 기본순, 선거 단위당 한 행)"""
+    return df[df['is_valid']].sort_values(by='일련번호').drop_duplicates('선거 단위')
+
+
+class SnapshotDiffer:
+    """직전 스냅샷의 행 키/요약 값을 기억하며 패치를 만든다 (워커 스레드에서 스냅샷당 한 번 호출)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.order = []
+        self.keys = {}       # 선거 단위 -> 행 키 (값 튜플)
+        self.html = {}       # 선거 단위 -> <tr> 조각 (새 접속자에게 전체 상태를 줄 때 사용)
+        self.summary = {}
+        self.updated = "-"
+
+    def update(self, df, version, updated="-"):
+        view = table_view(df)
+        units = view['선거 단위'].tolist()
+        keys = dict(zip(units, row_keys(view)))
+        summary = summary_values(df)
+
+        with self._lock:
+            changed = [i for i, unit in enumerate(units) if self.keys.get(unit) != keys[unit]]
+            rows = dict(zip((units[i] for i in changed), render_rows(view.iloc[changed]).tolist())) if changed else {}
+            # 값은 바뀌었어도 표시 형식(반올림 등)상 같은 행은 보내지 않음
+            rows = {unit: html for unit, html in rows.items() if self.html.get(unit) != html}
+            removed = [unit for unit in self.order if unit not in keys]
+            patch = {
+                "v": version, "base": self.version,
+                "rows": rows, "removed": removed,
+                "order": units if units != self.order else None,
+                "summary": {k: v for k, v in summary.items() if self.summary.get(k) != v},
+                "updated": updated,
+            }
+            for unit in removed: self.html.pop(unit, None)
+            self.html.update(rows)
+            self.version, self.order, self.keys, self.summary, self.updated = version, units, keys, summary, updated
+        return patch
+
+    def full_state(self):
+        """새 접속자용 전체 상태 (패치와 같은 형식, base=0)"""
+        with self._lock:
+            return {"v": self.version, "base": 0, "rows": {u: self.html[u] for u in self.order}, "removed": [],
+                    "order": list(self.order), "summary": dict(self.summary), "updated": self.updated}
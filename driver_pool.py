@@ -0,0 +1,186 @@
+import os
+import time
+import queue
+import atexit
+import threading
+import traceback
+import contextlib
+import functools
+
+import metrics
+
+# ==============================================================================
+# [WebDriver 풀] 오래 살아있는 헤드리스 브라우저를 재사용
+# ==============================================================================
+# 매 갱신마다 Chromium을 띄우고 끄는 대신, 열려 있는 탭에서 페이지만 새로고침합니다.
+# - max_uses 회 사용했거나 상태 점검(health check)에 실패하면 드라이버를 교체
+# - 사용 중 예외가 발생한 드라이버는 폐기 후 다음 요청 때 새로 생성
+# - 프로세스 종료 시(atexit) 모든 드라이버를 정리
+# selenium은 실제로 브라우저를 띄울 때만 import 합니다 (HTTP 경로만 쓰는 경우 import 비용 없음).
+
+class DriverLaunchError(Exception):
+    """브라우저(드라이버) 실행 실패"""
+
+
+PAGE_LOAD_TIMEOUT = float(os.environ.get("ELECTION_PAGE_LOAD_TIMEOUT", "20"))  # 페이지 이동/새로고침 시간 제한 (초)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def build_chrome_options():
+    from selenium import webdriver
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    # [추가] 한국어 설정
+    options.add_argument("--lang=ko_KR")
+    prefs = {"intl.accept_languages": "ko,ko_KR"}
+    options.add_experimental_option("prefs", prefs)
+    return options
+
+
+@functools.lru_cache(maxsize=1)
+def local_driver_path():
+    """WebDriver Manager 설치는 프로세스당 한 번만 수행"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def launch_driver(log=print):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    options = build_chrome_options()
+    if os.path.exists("/usr/bin/chromium") and os.path.exists("/usr/bin/chromedriver"):
+        log("서버 환경(Linux) 감지됨. /usr/bin/chromedriver 사용")
+        options.binary_location = "/usr/bin/chromium"
+        service = Service("/usr/bin/chromedriver")
+    else:
+        log("로컬 환경(Windows/Mac) 감지됨. WebDriver Manager 사용")
+        service = Service(local_driver_path())
+    with metrics.span("driver_start"):
+        driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def load(self, url):
+        """같은 URL이 이미 열려 있으면 새로고침, 아니면 이동"""
+        self.uses += 1
+        with metrics.span("page_load"):
+            if self.driver.current_url.rstrip("/") == url.rstrip("/"): self.driver.refresh()
+            else: self.driver.get(url)
+
+    def quit(self):
+        try: self.driver.quit()
+        except Exception: pass
+
+
+class DriverPool:
+    def __init__(self, size=1, max_uses=50, launcher=launch_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self._launcher = launcher
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+        self.launch_count = 0
+        self.recycle_count = 0
+
+    def _discard(self, pooled, reason, log=print):
+        log(f"♻️ 드라이버 교체 ({reason}, 사용 {pooled.uses}회)")
+        with self._lock:
+            self._all.discard(pooled)
+            self.recycle_count += 1
+        pooled.quit()
+
+    def _get(self, log):
+        while True:
+            try: pooled = self._idle.get_nowait()
+            except queue.Empty: break
+            if pooled.uses >= self.max_uses: self._discard(pooled, "사용 횟수 초과", log)
+            elif not pooled.is_healthy(): self._discard(pooled, "상태 점검 실패", log)
+            else: return pooled
+
+        t0 = time.perf_counter()
+        try:
+            pooled = PooledDriver(self._launcher(log))
+        except Exception as e:
+            log(traceback.format_exc())
+            raise DriverLaunchError(str(e)) from e
+        with self._lock:
+            self._all.add(pooled)
+            self.launch_count += 1
+        log(f"🚀 새 브라우저 실행 ({time.perf_counter() - t0:.2f}초)")
+        return pooled
+
+    @contextlib.contextmanager
+    def acquire(self, log=print, timeout=60):
+        if self._closed: raise RuntimeError("DriverPool이 이미 종료되었습니다.")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("사용 가능한 브라우저가 없습니다.")
+        pooled = None
+        try:
+            pooled = self._get(log)
+            yield pooled
+        except Exception:
+            # 크래시/오류가 난 드라이버는 재사용하지 않음
+            if pooled is not None:
+                log(traceback.format_exc())
+                self._discard(pooled, "오류 발생", log)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                if self._closed: pooled.quit()
+                else: self._idle.put(pooled)
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for pooled in drivers: pooled.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """프로세스 전체에서 공유하는 드라이버 풀"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool(
+                size=int(os.environ.get("ELECTION_DRIVER_POOL_SIZE", "1")),
+                max_uses=int(os.environ.get("ELECTION_DRIVER_MAX_USES", "50")),
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def shutdown_driver_pool():
+    """풀이 만들어진 적이 있으면 모든 드라이버 종료"""
+    with _pool_lock:
+        if _pool is not None: _pool.close()
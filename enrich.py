@@ -0,0 +1,43 @@
+import numpy as np
+
+from mapping_db import lookup
+from schema import map_units, numeric_values
+
+# ==============================================================================
+# [후처리] 수집 1회당 한 번만 실행하는 벡터화 파생 컬럼 계산
+# ==============================================================================
+# 화면(표/요약)은 여기서 미리 계산한 컬럼만 읽습니다.
+#   증가               : 직전 스냅샷 대비 투표자 수 증가분 (선거 단위 기준 조인)
+#   is_target          : 합산 대상(Value 계산용) 여부
+#   is_college         : 요약표의 '단과대' 집계 대상 여부
+#   remaining_clipped  : 0 미만/결측을 0으로 맞춘 투표 성사 잔여 인원
+#   is_valid           : 메인 표에 표시할 행 (총 유권자 > 0, 잔여 인원 있음) - 나머지는 '정보 부족' 표
+# 선거 단위별 판별은 범주형 카테고리마다 한 번만 계산합니다. (schema.map_units)
+# 요약표와 선관위별 집계(aggregate.py)도 이 파생 컬럼만으로 계산합니다.
+
+COLLEGE_SUFFIXES = ('대학', '계열', '총동아리연합회')
+
+
+def enrich_snapshot(new_df, old_df=None):
+    """새 스냅샷에 파생 컬럼을 추가해 반환 (new_df는 그대로 두고 컬럼만 붙인 새 표)"""
+    df = new_df.copy(deep=False)  # Copy-on-Write: 기존 컬럼 배열은 공유
+    units = df['선거 단위']
+    curr = numeric_values(df['투표자 수'])
+
+    if old_df is not None and not old_df.empty and {'선거 단위', '투표자 수'} <= set(old_df.columns):
+        # 같은 이름이 여러 번 나오면 마지막 값 기준 (기존 dict(zip(...)) 동작과 동일)
+        prev_map = dict(zip(old_df['선거 단위'].astype(object), numeric_values(old_df['투표자 수'])))
+        prev = numeric_values(map_units(units, prev_map.get))
+        df['증가'] = np.where(np.isnan(curr) | np.isnan(prev), 0, curr - prev)
+    else:
+        df['증가'] = 0
+
+    # 이름별 판별은 설정 색인 조회 한 번 (mapping_db.lookup)
+    # 여러 대상을 합친 표는 대상별 매핑으로 이미 계산되어 있음 (sources.SourceScheduler.merge)
+    if 'is_target' not in df.columns: df['is_target'] = map_units(units, lambda name: lookup(name).is_target).fillna(False).astype(bool)
+    df['is_college'] = map_units(units, lambda name: isinstance(name, str) and name.endswith(COLLEGE_SUFFIXES)
+                                 and name not in ('총학생회', '외국인 학생회')).fillna(False).astype(bool)
+    remaining = numeric_values(df['투표 성사 잔여 인원'])
+    df['remaining_clipped'] = np.nan_to_num(np.clip(remaining, 0, None), nan=0)
+    df['is_valid'] = (numeric_values(df['총 유권자']) > 0) & ~np.isnan(remaining)
+    return df
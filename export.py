@@ -0,0 +1,134 @@
+import io
+import threading
+import collections
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from mapping_db import lookup, commission_rank
+
+# ==============================================================================
+# [내보내기] 엑셀 저장(CSV/XLSX) + 공지용 텍스트를 (스냅샷, 보기)마다 한 번만 생성
+# ==============================================================================
+# - 키: (스냅샷 버전, 선택한 선관위, 정렬 기준) -> 같은 화면을 보는 세션/재실행은 캐시를 그대로 사용
+# - CSV 바이트와 공지용 텍스트는 처음 요청할 때 만들고, XLSX는 다운로드 버튼을 눌렀을 때만 생성
+# - 캐시는 최근 EXPORT_CACHE_SIZE개 보기만 유지 (LRU, 세션 간 공유)
+# 내보내는 값은 표에 보이는 행(df_valid)과 같은 순서입니다.
+
+EXPORT_CACHE_SIZE = 32
+
+EXPORT_COLUMNS = ['일련번호', '담당 선관위', '선거 단위', '투표율', '비고']
+XLSX_WIDTHS = {'일련번호': 10, '담당 선관위': 20, '선거 단위': 32, '투표율': 10, '비고': 14}
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def export_frame(df_valid):
+    """표 행 -> 내보내기용 DataFrame (표시 이름, 숫자 투표율, 비고)"""
+    remaining = pd.to_numeric(df_valid['투표 성사 잔여 인원'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return pd.DataFrame({
+        '일련번호': df_valid['일련번호'].to_numpy(),
+        '담당 선관위': df_valid['담당 선관위'].to_numpy(),
+        # 표시 이름(' 학생회' 복원)은 election_config.toml [display] 규칙으로 미리 계산됨
+        '선거 단위': [lookup(name).display_name for name in df_valid['선거 단위'].tolist()],
+        # 스냅샷 투표율은 float32 -> 소수 둘째 자리로 맞춰야 .xlsx 셀에 40.130001 같은 값이 남지 않음
+        '투표율': pd.to_numeric(df_valid['투표율'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan).round(2),
+        '비고': np.where(remaining <= 0, "(개표 가능)", ""),
+    }, columns=EXPORT_COLUMNS)
+
+
+def csv_bytes(frame):
+    """엑셀에서 바로 열리는 CSV (UTF-8 BOM, 투표율은 '12.34%' 문자열)"""
+    rate = ["-" if pd.isna(x) else f"{x:.2f}%" for x in frame['투표율'].tolist()]
+    return frame.assign(투표율=rate).to_csv(index=False).encode('utf-8-sig')
+
+
+def notice_text(frame):
+    """담당 선관위 순서대로 '표시 이름 투표율%' 줄을 묶은 공지용 텍스트"""
+    commissions = frame['담당 선관위'].tolist()
+    # 목록에 없는 선관위는 등장 순서대로 맨 뒤
+    groups = {comm: [] for comm in sorted(dict.fromkeys(commissions), key=commission_rank)}
+    for comm, name, rate in zip(commissions, frame['선거 단위'].tolist(), frame['투표율'].fillna(0.0).tolist()):
+        groups[comm].append(f"{name} {rate:.2f}%\n")
+    return "".join("".join(lines) + "\n" for lines in groups.values())
+
+
+def xlsx_bytes(frame, sheet_name="선거 현황"):
+    """openpyxl로 만든 .xlsx (투표율은 숫자 셀 + 0.00% 표시 형식)"""
+    from openpyxl import Workbook  # 다운로드할 때만 불러옴
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    ws.append(EXPORT_COLUMNS)
+    for row in frame.itertuples(index=False):
+        ws.append([None if isinstance(v, float) and np.isnan(v) else v for v in row])
+    rate_col = EXPORT_COLUMNS.index('투표율') + 1
+    for (cell,) in ws.iter_rows(min_row=2, min_col=rate_col, max_col=rate_col):
+        cell.number_format = '0.00"%"'
+    for i, col in enumerate(EXPORT_COLUMNS, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = XLSX_WIDTHS.get(col, 12)
+    ws.freeze_panes = "A2"
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+class ExportBundle:
+    """한 (스냅샷, 보기)의 내보내기 결과 (CSV/공지 텍스트는 생성 시, XLSX는 처음 요청 시 생성)"""
+
+    def __init__(self, df_valid):
+        with metrics.span("export"):
+            self.frame = export_frame(df_valid)
+            self.csv = csv_bytes(self.frame)
+            self.notice = notice_text(self.frame)
+        self._xlsx = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def xlsx(self):
+        with self._lock:
+            if self._xlsx is None:
+                with metrics.span("export"): self._xlsx = xlsx_bytes(self.frame)
+            return self._xlsx
+
+
+class ExportCache:
+    """보기 키 -> ExportBundle (LRU, 세션 간 공유)"""
+
+    def __init__(self, maxsize=EXPORT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, df_valid):
+        """캐시에 있으면 그대로, 없으면 df_valid로 만들어 저장"""
+        with self._lock:
+            bundle = self._data.get(key)
+            if bundle is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return bundle
+            self.misses += 1
+        bundle = ExportBundle(df_valid)  # 락 밖에서 생성 (같은 키가 동시에 만들어져도 결과는 같음)
+        with self._lock:
+            self._data[key] = bundle
+            while len(self._data) > self.maxsize: self._data.popitem(last=False)
+        return bundle
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+
+EXPORT_CACHE = ExportCache()
+
+
+def view_key(version, commissions, sort_option):
+    """내보내기 캐시 키 (선관위 선택 순서는 결과에 영향이 없으므로 정렬해서 사용)"""
+    return (version, tuple(sorted(commissions)), sort_option)
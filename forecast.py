@@ -0,0 +1,81 @@
+import os
+import time
+import math
+import threading
+from datetime import datetime
+
+import pytz
+import pandas as pd
+
+# ==============================================================================
+# [예측] 선거 단위별 투표 속도(EWMA)와 투표 성사 예상 시각
+# ==============================================================================
+# 스냅샷이 들어올 때마다 단위별 상태(직전 시각, 직전 투표자 수, 분당 투표 속도 EWMA)만
+# 갱신합니다. 전체 이력을 다시 적합하지 않으므로 갱신 비용은 단위당 O(1)입니다.
+# 수집 간격이 일정하지 않아도 되도록 반감기(halflife) 기반 가중치를 사용합니다.
+#   eta_minutes    : '투표 성사 잔여 인원'이 0이 될 때까지 예상 시간(분 단위 올림, 남은 인원이 있으면 최소 1), 이미 성사면 0
+#   projected_rate : 현재 속도가 마감 시각까지 유지될 때의 예상 최종 투표율(%)
+
+KST = pytz.timezone('Asia/Seoul')
+CLOSE_HOUR = int(os.environ.get("ELECTION_CLOSE_HOUR", "18"))  # 당일 투표 마감 시각 (KST)
+
+FORECAST_COLUMNS = ['eta_minutes', 'projected_rate']
+
+
+def minutes_until_close(now_ts, close_hour=CLOSE_HOUR):
+    now = datetime.fromtimestamp(now_ts, KST)
+    close = now.replace(hour=close_hour, minute=0, second=0, microsecond=0)
+    return max(0.0, (close - now).total_seconds() / 60)
+
+
+class UnitRate:
+    __slots__ = ("ts", "voted", "rate")
+
+    def __init__(self, ts, voted):
+        self.ts = ts
+        self.voted = voted
+        self.rate = None  # 분당 투표자 수 (EWMA)
+
+
+class TurnoutForecaster:
+    def __init__(self, halflife_minutes=10, close_hour=CLOSE_HOUR):
+        self.halflife = halflife_minutes
+        self.close_hour = close_hour
+        self._units = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, unit, voted, ts):
+        state = self._units.get(unit)
+        if state is None:
+            self._units[unit] = UnitRate(ts, voted)
+            return None
+        dt = (ts - state.ts) / 60
+        if dt <= 0: return state.rate
+        inst = max(0.0, (voted - state.voted) / dt)
+        if state.rate is None: state.rate = inst
+        else:
+            alpha = 1 - math.pow(0.5, dt / self.halflife)
+            state.rate += alpha * (inst - state.rate)
+        state.ts, state.voted = ts, voted
+        return state.rate
+
+    def update(self, df, ts=None):
+        """스냅샷으로 상태를 갱신하고 예측 컬럼을 붙인 DataFrame 반환"""
+        ts = ts if ts is not None else time.time()
+        left = minutes_until_close(ts, self.close_hour)
+        etas, projected = [], []
+        with self._lock:
+            for unit, voted, total, remaining in zip(
+                    df['선거 단위'], df['투표자 수'], df['총 유권자'], df['투표 성사 잔여 인원']):
+                if pd.isna(voted):
+                    etas.append(math.nan); projected.append(math.nan)
+                    continue
+                rate = self._observe(unit, float(voted), ts)
+
+                if pd.isna(remaining) or (remaining > 0 and not rate): etas.append(math.nan)
+                elif remaining <= 0: etas.append(0.0)
+                else: etas.append(max(1, math.ceil(remaining / rate)))
+
+                if pd.isna(total) or not total or rate is None: projected.append(math.nan)
+                else: projected.append(round(min(100.0, (voted + rate * left) / total * 100), 2))
+        return df.assign(eta_minutes=etas, projected_rate=projected)
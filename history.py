@@ -0,0 +1,147 @@
+import os
+import time
+import sqlite3
+import threading
+
+import pandas as pd
+
+from schema import round_rate
+
+# ==============================================================================
+# [이력 저장소] 수집 스냅샷을 SQLite(WAL)에 append-only로 누적
+# ==============================================================================
+# - 선거 단위 이름은 units 테이블에 한 번만 저장하고 snapshots는 정수 id로 참조 (작은 행 크기)
+# - 쓰기는 버퍼에 모았다가 batch_rows / flush_interval 기준으로 한 트랜잭션에 기록
+# - (unit_id, ts) 인덱스로 임의 구간(최근 10분, 개표 시작 이후 등)의 증가분을 재수집 없이 계산
+# 메모리에는 최신 스냅샷만 두므로 여러 날에 걸친 선거에서도 메모리 사용량이 일정합니다.
+
+HISTORY_PATH = os.environ.get("ELECTION_HISTORY_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "history.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts        INTEGER NOT NULL,   -- 수집 시각 (unix epoch, 초)
+    unit_id   INTEGER NOT NULL REFERENCES units(id),
+    rate      REAL,               -- 투표율
+    voted     INTEGER,            -- 투표자 수
+    total     INTEGER,            -- 총 유권자
+    remaining INTEGER             -- 투표 성사 잔여 인원
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_unit_ts ON snapshots(unit_id, ts);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots(ts);
+"""
+
+# 구간별 증가분: 구간 시작 시점 직전(없으면 구간 내 첫) 스냅샷 대비 최신 스냅샷의 투표자 수 차이
+DELTA_SQL = """
+WITH last AS (
+    SELECT unit_id, MAX(ts) AS ts FROM snapshots GROUP BY unit_id
+), base AS (
+    SELECT l.unit_id,
+           COALESCE((SELECT MAX(ts) FROM snapshots s WHERE s.unit_id = l.unit_id AND s.ts <= :since),
+                    (SELECT MIN(ts) FROM snapshots s WHERE s.unit_id = l.unit_id AND s.ts > :since)) AS ts
+    FROM last l
+)
+SELECT u.name, cur.voted - prev.voted AS delta
+FROM last l
+JOIN base b ON b.unit_id = l.unit_id
+JOIN snapshots cur  ON cur.unit_id = l.unit_id AND cur.ts = l.ts
+JOIN snapshots prev ON prev.unit_id = b.unit_id AND prev.ts = b.ts
+JOIN units u ON u.id = l.unit_id
+"""
+
+
+def _nullable(x, cast):
+    return None if pd.isna(x) else cast(x)
+
+
+class SnapshotStore:
+    def __init__(self, path=HISTORY_PATH, batch_rows=500, flush_interval=120):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._unit_ids = {}
+
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._unit_ids = dict(self._conn.execute("SELECT name, id FROM units"))
+
+    # --------------------------------------------------------------------------
+    # 쓰기
+    # --------------------------------------------------------------------------
+    def _unit_id(self, name):
+        uid = self._unit_ids.get(name)
+        if uid is None:
+            self._conn.execute("INSERT OR IGNORE INTO units(name) VALUES (?)", (name,))
+            uid = self._conn.execute("SELECT id FROM units WHERE name = ?", (name,)).fetchone()[0]
+            self._unit_ids[name] = uid
+        return uid
+
+    def append(self, df, ts=None):
+        """스냅샷 DataFrame을 버퍼에 추가 (조건을 만족하면 바로 기록)"""
+        ts = int(ts if ts is not None else time.time())
+        rows = [
+            (ts, unit, round_rate(rate), _nullable(voted, int), _nullable(total, int), _nullable(remaining, int))
+            for unit, rate, voted, total, remaining in zip(
+                df['선거 단위'], df['투표율'], df['투표자 수'], df['총 유권자'], df['투표 성사 잔여 인원'])
+        ]
+        with self._lock:
+            self._buffer.extend(rows)
+            due = len(self._buffer) >= self.batch_rows or time.monotonic() - self._last_flush >= self.flush_interval
+        if due: self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not rows: return 0
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO snapshots(ts, unit_id, rate, voted, total, remaining) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(ts, self._unit_id(unit), *values) for ts, unit, *values in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._buffer = rows + self._buffer
+                raise
+            return len(rows)
+
+    def close(self):
+        self.flush()
+        with self._lock: self._conn.close()
+
+    # --------------------------------------------------------------------------
+    # 읽기
+    # --------------------------------------------------------------------------
+    def _query(self, sql, params=()):
+        self.flush()
+        with self._lock: return self._conn.execute(sql, params).fetchall()
+
+    def first_ts(self):
+        """기록이 시작된 시각 (개표/투표 시작 이후 구간 계산용)"""
+        row = self._query("SELECT MIN(ts) FROM snapshots")
+        return row[0][0] if row else None
+
+    def deltas(self, since_ts):
+        """since_ts 이후 선거 단위별 투표자 수 증가분 (Series: 선거 단위 -> 증가)"""
+        rows = self._query(DELTA_SQL, {"since": int(since_ts)})
+        return pd.Series({name: (delta or 0) for name, delta in rows}, dtype="float64")
+
+    def deltas_last(self, minutes):
+        return self.deltas(time.time() - minutes * 60)
+
+    def unit_history(self, unit, since_ts=0):
+        """한 선거 단위의 시계열 (ts, 투표율, 투표자 수, 총 유권자, 투표 성사 잔여 인원)"""
+        rows = self._query(
+            "SELECT s.ts, s.rate, s.voted, s.total, s.remaining FROM snapshots s JOIN units u ON u.id = s.unit_id "
+            "WHERE u.name = ? AND s.ts >= ? ORDER BY s.ts", (unit, int(since_ts)))
+        return pd.DataFrame(rows, columns=['ts', '투표율', '투표자 수', '총 유권자', '투표 성사 잔여 인원'])
@@ -0,0 +1,188 @@
+import os
+import json
+import threading
+import collections
+from urllib.parse import urlparse, parse_qs
+
+from diff import SnapshotDiffer
+
+# ==============================================================================
+# [실시간 표] 바뀐 행만 SSE(Server-Sent Events)로 밀어 넣어 표를 제자리에서 갱신
+# ==============================================================================
+# - 워커가 새 스냅샷을 발행하면 diff.SnapshotDiffer로 패치를 한 번만 만들고 모든 접속자에게 전달
+# - 접속자는 처음에 /state로 전체 표를 한 번 받고, 이후 /events로 패치만 받음
+# - 재접속(Last-Event-ID)이 최근 패치 범위 안이면 놓친 패치만, 아니면 전체 상태(reset)를 다시 보냄
+# - ELECTION_LIVE_PORT를 설정하면 app.py가 이 페이지를 iframe으로 보여줌
+#   (브라우저에서 접근 가능한 주소가 다르면 ELECTION_LIVE_PUBLIC_URL로 지정)
+
+LIVE_PORT = int(os.environ.get("ELECTION_LIVE_PORT", "0"))
+LIVE_PUBLIC_URL = os.environ.get("ELECTION_LIVE_PUBLIC_URL", "")
+KEEPALIVE_SECONDS = 15
+
+
+class LiveFeed:
+    def __init__(self, backlog=32, touch=None):
+        self.differ = SnapshotDiffer()
+        self.touch = touch or (lambda: None)  # /events 접속자가 있는 동안 주기적으로 호출 (워커 유휴 중단 방지)
+        self._patches = collections.deque(maxlen=backlog)  # (버전, 기준 버전, 직렬화된 패치)
+        self._cond = threading.Condition()
+        self.bytes_sent = 0
+
+    def publish(self, df, version, updated="-"):
+        """워커 구독 함수: 스냅샷 -> 패치 (스냅샷당 한 번)"""
+        with self._cond:
+            patch = self.differ.update(df, version, updated)
+            data = json.dumps(patch, ensure_ascii=False, separators=(",", ":"))
+            self._patches.append((version, patch["base"], data))
+            self._cond.notify_all()
+        return patch
+
+    @property
+    def version(self):
+        return self.differ.version
+
+    def patches_since(self, version):
+        """version 이후 패치 목록 (이어 붙일 수 없으면 None -> 전체 상태를 다시 보내야 함)"""
+        with self._cond:
+            if version == self.differ.version: return []
+            pending = [(v, base, data) for v, base, data in self._patches if v > version]
+            if not pending or pending[0][1] != version: return None
+            return [(v, data) for v, _, data in pending]
+
+    def wait(self, version, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: self.differ.version != version, timeout)
+
+    def full_state(self):
+        return json.dumps(self.differ.full_state(), ensure_ascii=False, separators=(",", ":"))
+
+
+PAGE_HTML = """<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">
+<style>
+  body { margin: 0; font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; }
+  .meta { font-size: 12px; color: #003876; font-weight: bold; text-align: center; margin: 6px 0; }
+  table.summary-table { width: 100%; border-collapse: collapse; font-size: 13px; border: 2px solid #003876; margin-bottom: 10px; }
+  table.summary-table th { background-color: #003876; color: white; padding: 6px 4px; text-align: center; }
+  table.summary-table td { padding: 6px 4px; text-align: center; font-weight: bold; color: #e11d48; }
+  table.custom-table { margin: 0 auto 20px; border-collapse: collapse; font-size: 13px; border: 1px solid #dee2e6; }
+  table.custom-table th { background-color: #003876; color: #fff; padding: 10px 15px; white-space: nowrap; }
+  table.custom-table td { padding: 8px 15px; text-align: center; border-bottom: 1px solid #dee2e6; white-space: nowrap; color: #333; transition: background-color 1.5s; }
+  tr.success-row { background-color: #e3f9e5; } tr.warning-row { background-color: #fffbeb; } tr.default-row { background-color: #fff; }
+  tr.flash td { background-color: #dbeafe; }
+  .target-highlight { color: #003876; font-weight: 900; text-decoration: underline; text-decoration-color: #a5d8ff; text-decoration-thickness: 3px; }
+</style></head><body>
+<div class="meta">최근 업데이트: <span id="updated">-</span> · <span id="status">연결 중</span></div>
+<table class="summary-table"><thead><tr><th>총학생회</th><th>단과대</th><th>학과</th><th>value</th></tr></thead>
+<tbody><tr><td id="inc_total">-</td><td id="inc_college">-</td><td id="inc_dept">-</td><td id="value" style="color: #b91c1c; font-weight: 900;">-</td></tr></tbody></table>
+<table class="custom-table"><thead><tr>__HEAD__</tr></thead><tbody id="rows"></tbody></table>
+<script>
+const body = document.getElementById("rows"), byUnit = new Map();
+let version = 0;
+function fmt(k, v) { return (k === "value" ? "" : "▲ ") + v.toLocaleString(); }
+function row(html) { const t = document.createElement("template"); t.innerHTML = html.trim(); return t.content.firstChild; }
+function apply(p, reset) {
+  if (reset) { body.textContent = ""; byUnit.clear(); }
+  for (const unit of p.removed) { const tr = byUnit.get(unit); if (tr) tr.remove(); byUnit.delete(unit); }
+  for (const [unit, html] of Object.entries(p.rows)) {
+    const tr = row(html), old = byUnit.get(unit);
+    if (old) { old.replaceWith(tr); if (!reset) { tr.classList.add("flash"); setTimeout(() => tr.classList.remove("flash"), 1000); } }
+    else body.appendChild(tr);
+    byUnit.set(unit, tr);
+  }
+  if (p.order) for (const unit of p.order) { const tr = byUnit.get(unit); if (tr) body.appendChild(tr); }
+  for (const [k, v] of Object.entries(p.summary)) document.getElementById(k).textContent = fmt(k, v);
+  document.getElementById("updated").textContent = p.updated;
+  version = p.v;
+}
+fetch("state").then(r => r.json()).then(s => {
+  apply(s, true);
+  const es = new EventSource("events?v=" + version);
+  es.onopen = () => document.getElementById("status").textContent = "실시간";
+  es.onerror = () => document.getElementById("status").textContent = "재연결 중";
+  es.onmessage = e => { const p = JSON.parse(e.data); if (p.base === version) apply(p, false); };
+  es.addEventListener("reset", e => apply(JSON.parse(e.data), true));
+});
+</script></body></html>"""
+
+
+def make_handler(feed, page):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, body, content_type):
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _event(self, data, event=None, event_id=None):
+            msg = (f"event: {event}\n" if event else "") + (f"id: {event_id}\n" if event_id is not None else "") + f"data: {data}\n\n"
+            msg = msg.encode("utf-8")
+            self.wfile.write(msg)
+            self.wfile.flush()
+            feed.bytes_sent += len(msg)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path in ("/", "/index.html"): return self._send(page, "text/html; charset=utf-8")
+            if url.path == "/state": return self._send(feed.full_state(), "application/json; charset=utf-8")
+            if url.path != "/events": return self.send_error(404)
+
+            since = self.headers.get("Last-Event-ID") or parse_qs(url.query).get("v", ["0"])[0]
+            version = int(since) if since.isdigit() else 0
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                self.wfile.write(b"retry: 3000\n\n")
+                while True:
+                    feed.touch()
+                    pending = feed.patches_since(version)
+                    if pending is None:
+                        self._event(feed.full_state(), "reset", feed.version)
+                        version = feed.version
+                    for v, data in pending or []:
+                        self._event(data, event_id=v)
+                        version = v
+                    if not feed.wait(version, KEEPALIVE_SECONDS):
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(feed, port=None, host="0.0.0.0"):
+    """실시간 표 서버를 백그라운드 스레드로 시작 (port가 0이면 시작하지 않음)"""
+    from http.server import ThreadingHTTPServer
+    from render import TABLE_COLUMNS, FORECAST_TABLE_COLUMNS
+    port = LIVE_PORT if port is None else port
+    if not port: return None
+    head = "".join(f"<th>{col}</th>" for col in TABLE_COLUMNS + FORECAST_TABLE_COLUMNS)
+    server = ThreadingHTTPServer((host, port), make_handler(feed, PAGE_HTML.replace("__HEAD__", head)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="election-live", daemon=True).start()
+    return server
+
+
+def start(worker, port=None):
+    """워커에 LiveFeed를 구독시키고 서버 시작 -> (feed, 브라우저용 주소) 또는 (None, None)"""
+    port = LIVE_PORT if port is None else port
+    if not port: return None, None
+    feed = LiveFeed(touch=worker.touch)
+    if worker.data is not None: feed.publish(worker.data, worker.version, worker.last_updated)
+    worker.subscribe(feed.publish)
+    server = serve(feed, port)
+    return feed, LIVE_PUBLIC_URL or f"http://localhost:{server.server_address[1]}/"
@@ -1,110 +1,298 @@
+import os
 import re
+import threading
+import functools
+from typing import NamedTuple
 
-# ==============================================================================
-# [1] 선거 단위 - 담당 선관위 매핑 데이터베이스
-# ==============================================================================
-ELECTION_DB = {
-    "총학생회": "중앙선거관리위원회",
-    "총동아리연합회": "총동아리연합회",
-    "창작예술분과위원회": "총동아리연합회",
-    "체육분과위원회": "총동아리연합회",
-    "공연예술분과위원회": "총동아리연합회",
-    "학술교양분과위원회": "총동아리연합회",
-    "중어중문학과": "문과대학", "영어영문학과": "문과대학", "독어독문학과": "문과대학",
-    "노어노문학과": "문과대학", "사학과": "문과대학", "철학과": "문과대학",
-    "문헌정보학과": "문과대학", "심리학과": "문과대학",
-    "상경·경영대학": "상경·경영대학",
-    "경영 1반": "상경·경영대학", "경영 2반": "상경·경영대학", "경영 3반": "상경·경영대학",
-    "경영 4반": "상경·경영대학", "경영 5반": "상경·경영대학",
-    "상경 6반": "상경·경영대학", "상경 7반": "상경·경영대학", "상경 8반": "상경·경영대학",
-    "상경 9반": "상경·경영대학", "상경 10반": "상경·경영대학", "상경 11반": "상경·경영대학",
-    "수학과": "이과대학", "물리학과": "이과대학", "화학과": "이과대학",
-    "지구시스템과학과": "이과대학", "천문우주학과": "이과대학", "대기과학과": "이과대학",
-    "인공지능융합대학": "인공지능융합대학",
-    "컴퓨터과학과": "인공지능융합대학",
-    "첨단융합공학부": "인공지능융합대학",
-    "인공지능학과": "인공지능융합대학",
-    "공학 1반": "공과대학", "공학 2반": "공과대학", "공학 4반": "공과대학",
-    "공학 6반": "공과대학", "공학 7반": "공과대학", "공학 8반": "공과대학",
-    "공학 9반": "공과대학", "공학 10반": "공과대학", "공학 11반": "공과대학",
-    "연세건축 아시비": "공과대학", "도시공학과": "공과대학",
-    "시스템반도체공학과": "공과대학", "디스플레이융합공학과": "공과대학",
-    "신과대학": "신과대학",
-    "문화인류학과": "사회과학대학", "사회복지학과": "사회과학대학", "사회학과": "사회과학대학",
-    "언론홍보영상학부": "사회과학대학", "정치외교학과": "사회과학대학", "행정학과": "사회과학대학",
-    "사회과학대학 동아리연합회": "사회과학대학",
-    "시스템생물학과": "생명시스템대학", "생화학과": "생명시스템대학", "생명공학과": "생명시스템대학",
-    "음악대학": "음악대학", "관현악과": "음악대학",
-    "피아노과": "음악대학", "작곡과": "음악대학",
-    "의류환경학과": "생활과학대학", "식품영양학과": "생활과학대학", "실내건축학과": "생활과학대학",
-    "아동·가족학과": "생활과학대학", "아동가족학과": "생활과학대학",
-    "아동•가족학과": "생활과학대학",
-    "통합디자인학과": "생활과학대학",
-    "체육계열": "체육계열",
-    "의과대학": "의과대학", "의예과": "의과대학",
-    "의과대학 동아리연합회장": "의과대학",
-    "치과대학": "치과대학",
-    "간호대학": "간호대학",
-    "언더우드국제대학": "언더우드국제대학",
-    "비교문학과문화전공": "언더우드국제대학", "경제학전공": "언더우드국제대학",
-    "국제학전공": "언더우드국제대학", "정치외교학전공": "언더우드국제대학",
-    "아시아학전공": "언더우드국제대학", "문화디자인경영전공": "언더우드국제대학",
-    "창의기술경영전공": "언더우드국제대학", "정보인터랙션디자인전공": "언더우드국제대학",
-    "사회정의리더십전공": "언더우드국제대학", "계량위험관리전공": "언더우드국제대학",
-    "에너지환경융합전공": "언더우드국제대학", "나노과학공학전공": "언더우드국제대학",
-    "약학대학": "약학대학",
-    "글로벌인재대학": "글로벌인재대학",
-    "국제통상전공": "글로벌인재대학", "문화미디어전공": "글로벌인재대학",
-    "응용정보공학전공": "글로벌인재대학", "외국인 학생회": "글로벌인재대학"
-}
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 
 # ==============================================================================
-# [2] 합산 대상 단위 목록 (TARGET_UNITS)
+# [설정] 매핑 데이터는 election_config.toml에서 읽음 (선거마다 파일만 수정)
 # ==============================================================================
-TARGET_UNITS = [
-    "중어중문학과", "영어영문학과", "독어독문학과", "노어노문학과", "사학과", "철학과", "문헌정보학과", "심리학과",
-    "상경·경영대학",  # 학생회 선거
-    "수학과", "물리학과", "화학과", "지구시스템과학과", "천문우주학과", "대기과학과",
-    # "인공지능융합대학", (제외)
-    "공학 1반", "공학 2반", "공학 4반", "컴퓨터과학과",
-    "공학 6반", "공학 7반", "공학 8반", "공학 9반", "공학 10반", "공학 11반",
-    "연세건축 아시비", "도시공학과", "첨단융합공학부", "시스템반도체공학과", "인공지능학과", "디스플레이융합공학과",
-    "신과대학",
-    "문화인류학과", "사회복지학과", "사회학과 학생총투표", "언론홍보영상학부", "정치외교학과", "행정학과",
-    "시스템생물학과", "생화학과", "생명공학과",
-    "관현악과(현)", "관현악과(관)", "피아노과", "작곡과",
-    "의류환경학과", "식품영양학과", "실내건축학과", "아동가족학과", "통합디자인학과",
-    "체육계열",
-    "의과대학", "치과대학", "간호대학", "약학대학",
-    "언더우드국제대학",
-    "외국인 학생회"
-]
+# 불러온 설정은 '정리된 선거 단위 이름 -> UnitInfo(담당 선관위, 합산 대상 여부, 표시 이름, 정렬 순위)'
+# 색인(_INDEX) 하나로 컴파일되며, 화면 쪽 조회(lookup)는 모두 dict 한 번으로 끝납니다.
+# 파일이 바뀌면 maybe_reload()가 다시 컴파일합니다. (워커가 수집할 때마다 호출)
+# 설정 파일 하나 = MappingTable 하나이며, 수집 대상(sources.py)마다 다른 파일을 쓸 수 있습니다.
+# 모듈 수준 함수(lookup, get_commission 등)는 기본 설정(DEFAULT)을 사용합니다.
+# ELECTION_DB / TARGET_UNITS / ORDER_LIST는 DEFAULT의 컨테이너이며, 다시 읽어도 같은 객체를
+# 제자리에서 갱신하므로 다른 모듈에서 from mapping_db import ... 로 가져간 참조도 최신 값을 봅니다.
+
+SCHEMA_VERSION = 1
+CONFIG_PATH = os.environ.get("ELECTION_CONFIG_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "election_config.toml")
+INDEX_MAX = 8192  # 설정에 없는 이름을 색인에 추가로 기억하는 최대 개수
+
+
+class ConfigError(ValueError):
+    """설정 파일이 없거나 읽을 수 없거나 형식이 틀려 적용할 설정이 없음"""
+
+
+class UnitInfo(NamedTuple):
+    commission: str
+    is_target: bool
+    display_name: str
+    sort_rank: int
+
+
+def load_config(path=None):
+    """설정 파일을 읽고 검증한 dict 반환 (형식이 틀리면 ValueError)"""
+    with open(path or CONFIG_PATH, "rb") as f: cfg = tomllib.load(f)
+    if cfg.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"지원하지 않는 schema_version: {cfg.get('schema_version')!r} (필요: {SCHEMA_VERSION})")
+    for section in ("names", "display", "commissions", "units", "targets"):
+        if section not in cfg: raise ValueError(f"설정에 [{section}] 항목이 없습니다.")
+    for rule in cfg["names"].get("rules", []):
+        if not rule.get("contains") or ("name" not in rule and not rule.get("keep")):
+            raise ValueError(f"잘못된 이름 정리 규칙: {rule!r}")
+    re.compile(cfg["names"]["prefix_pattern"])
+    return cfg
+
+
+def _alternation(words, overlapping=False):
+    if not words: return None
+    body = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(f"(?=({body}))" if overlapping else body)
+
+
+class CompiledConfig:
+    """검증된 설정 하나를 컴파일한 결과 (만든 뒤에는 바꾸지 않음, 조회 색인 index만 새 이름으로 채워짐)
+    - get_commission: 이름에 포함된 키 중 가장 긴 키 우선 (길이가 같으면 election_db 순서)
+      각 위치에서 시작하는 가장 긴 키를 lookahead 정규식 한 번으로 모두 찾은 뒤 최댓값 선택
+    - is_target_unit: 예외 규칙별로 대상 목록을 나눠 정규식 search 한 번으로 판별"""
+
+    def __init__(self, cfg):
+        names = cfg["names"]
+        year = str(cfg.get("year", ""))
+        self.prefix_re = re.compile(names["prefix_pattern"])
+        self.remove = [w.replace("{year}", year) for w in names.get("remove", [])]
+        self.rules = [(tuple(r["contains"]), None if r.get("keep") else r["name"]) for r in names.get("rules", [])]
+        self.display_suffix = cfg["display"].get("suffix", "")
+        self.display_keep = tuple(cfg["display"].get("keep_if_contains", []))
+        self.marker = cfg["targets"].get("exclusive_marker")
+        self.excludes = dict(cfg["targets"].get("exclude", {}))
+        self.fallback = cfg["commissions"].get("fallback", "기타/공통")
+        self.version = cfg.get("version")
+
+        self.election_db = dict((unit, commission) for commission, units in cfg["units"].items() for unit in units)  # 파일 순서 유지
+        self.target_units = list(cfg["targets"]["units"])
+        self.order = list(cfg["commissions"]["order"])
+        self.commission_rank = {c: i for i, c in enumerate(self.order)}
+
+        targets, marker = self.target_units, self.marker
+        self.key_rank = {key: rank for rank, key in enumerate(self.election_db)}
+        self.key_re = _alternation(self.election_db, overlapping=True)
+        self.target_set = frozenset(targets)
+        # [예외 1] 이름에 표시 단어('총투표')가 있으면 그 단어가 들어간 타겟만 인정
+        self.target_marked_re = _alternation([t for t in targets if marker and marker in t])
+        # [예외 2] 제외 단어가 있는 타겟('의과대학')은 하위 단위(동아리, 의예과) 제외 규칙 때문에 따로 검사
+        self.target_excludes = [(t, tuple(words)) for t, words in self.excludes.items() if t in self.target_set]
+        self.target_plain_re = _alternation([t for t in targets if not (marker and marker in t) and t not in self.excludes])
+        self.index = {}
+
+
+class MappingTable:
+    """설정 파일 하나를 컴파일한 매핑 (선관위 매칭, 합산 대상 판별, 이름 정리, 조회 색인)
+    다시 읽을 때는 새 CompiledConfig를 따로 만든 뒤 _compiled 참조 하나만 바꿈:
+    조회 함수는 호출마다 _compiled를 한 번만 읽으므로 읽다 만 설정(빈 표, 색인과 안 맞는 정규식)을 보지 않음"""
+
+    def __init__(self, path, election_db=None, target_units=None, order=None):
+        self.path = path
+        # 외부 참조용 컨테이너 (다시 읽으면 제자리에서 갱신, 조회 함수는 쓰지 않음)
+        self.election_db = {} if election_db is None else election_db      # 선거 단위 -> 담당 선관위
+        self.target_units = [] if target_units is None else target_units    # 합산 대상 단위
+        self.order = [] if order is None else order                         # 담당 선관위 표시 순서
+        self.version = None
+        self.generation = 0          # 설정을 새로 적용할 때마다 1 증가 (파생 캐시 무효화용)
+        self.last_error = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._compiled = None
+        # 단위 이름별 결과 메모이즈: 키에 CompiledConfig가 들어가므로 다시 읽은 뒤에는 예전 결과를 돌려주지 않음
+        self._commission_of = functools.lru_cache(maxsize=4096)(self._get_commission)
+        self._target_of = functools.lru_cache(maxsize=4096)(self._is_target_unit)
+        self._normalized = functools.lru_cache(maxsize=4096)(self._normalize_name)
+
+    @property
+    def fallback(self):
+        return self._compiled.fallback if self._compiled else "기타/공통"
+
+    def clear_caches(self):
+        self._commission_of.cache_clear()
+        self._target_of.cache_clear()
+        self._normalized.cache_clear()
+
+    def apply_config(self, cfg):
+        """검증된 설정을 새로 컴파일해 한 번에 교체 (reload가 _lock을 잡은 상태에서 호출)"""
+        compiled = CompiledConfig(cfg)
+        compiled.index.update((name, self._resolve(name, compiled)) for name in list(compiled.election_db) + compiled.target_units)
+        self._compiled = compiled
+        self.clear_caches()  # 예전 설정으로 만든 결과는 키가 달라 다시 쓰이지 않음 (메모리만 비움)
+
+        # 외부 참조용 컨테이너: 리스트는 슬라이스 대입 한 번, dict는 비우지 않고 빠진 키 삭제 + 갱신
+        # (dict 순서는 기존 키 위치를 유지하므로 파일 순서가 필요하면 조회 함수/ORDER_LIST 기준으로)
+        for unit in [u for u in self.election_db if u not in compiled.election_db]: del self.election_db[unit]
+        self.election_db.update(compiled.election_db)
+        self.target_units[:] = compiled.target_units
+        self.order[:] = compiled.order
+        self.version = compiled.version
+        self.generation += 1
+
+    # ==========================================================================
+    # [함수] 매핑 및 판별 로직 (c: 호출 시점의 CompiledConfig)
+    # ==========================================================================
+    def get_commission(self, name):
+        """이름으로 선관위 찾기 (긴 단어 우선 매칭)"""
+        return self._commission_of(name, self._compiled)
+
+    def is_target_unit(self, name):
+        """합산 대상(Value 계산용)인지 확인"""
+        return self._target_of(name, self._compiled)
+
+    def normalize_name(self, raw_name):
+        """카드 제목(h4)을 선거 단위 이름으로 정리 ([names] 규칙)"""
+        return self._normalized(raw_name, self._compiled)
+
+    @staticmethod
+    def _get_commission(name, c):
+        if name in c.election_db: return c.election_db[name]
+        if c.key_re is None: return c.fallback
+        matches = [m.group(1) for m in c.key_re.finditer(name)]
+        if not matches: return c.fallback
+        best = min(matches, key=lambda k: (-len(k), c.key_rank[k]))
+        return c.election_db[best]
+
+    @staticmethod
+    def _is_target_unit(name, c):
+        if name in c.target_set: return True
+
+        # [예외 1] 타겟명에는 '총투표'가 없는데, 실제 이름에 '총투표'가 있으면 제외
+        if c.marker and c.marker in name:
+            return bool(c.target_marked_re and c.target_marked_re.search(name))
+
+        if c.target_plain_re and c.target_plain_re.search(name): return True
+
+        # [예외 2] 의과대학 하위 단위(동아리, 의예과) 제외
+        return any(t in name and not any(w in name for w in words) for t, words in c.target_excludes)
+
+    @staticmethod
+    def _normalize_name(raw_name, c):
+        clean_name = c.prefix_re.sub("", raw_name).strip()
+        for contains, name in c.rules:
+            if all(word in clean_name for word in contains):
+                if name is not None: clean_name = name
+                break
+        else:
+            for word in c.remove: clean_name = clean_name.replace(word, "")
+        return " ".join(clean_name.split())
+
+    def display_name(self, name, c=None):
+        """엑셀 저장/공지용 이름 (필요하면 ' 학생회'를 붙임)"""
+        c = c or self._compiled
+        return name if any(k in name for k in c.display_keep) else f"{name}{c.display_suffix}"
+
+    def commission_rank(self, commission, c=None):
+        """order 기준 정렬 순위 (목록에 없으면 맨 뒤)"""
+        c = c or self._compiled
+        return c.commission_rank.get(commission, len(c.order))
+
+    def _resolve(self, name, c):
+        commission = self._commission_of(name, c)
+        return UnitInfo(commission, self._target_of(name, c), self.display_name(name, c), self.commission_rank(commission, c))
+
+    def lookup(self, name):
+        """정리된 선거 단위 이름 -> UnitInfo (색인에 있으면 dict 한 번, 없으면 계산 후 기억)"""
+        c = self._compiled
+        info = c.index.get(name)
+        if info is None:
+            info = self._resolve(name, c)
+            if len(c.index) < INDEX_MAX: c.index[name] = info
+        return info
+
+    # ==========================================================================
+    # [다시 읽기] 설정 파일이 바뀌었으면 다시 컴파일
+    # ==========================================================================
+    def reload(self, force=False):
+        """설정 파일이 바뀌었으면(force면 항상) 다시 읽기 -> 새로 적용했으면 True
+        형식 오류가 있으면 직전 설정을 유지하고 last_error에 기록"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:  # 파일이 없거나 읽을 수 없음
+                return self._failed(e)
+            if not force and mtime == self._mtime: return False
+            try:
+                cfg = load_config(self.path)
+            except (OSError, ValueError, re.error) as e:  # tomllib.TOMLDecodeError는 ValueError
+                self._mtime = mtime
+                return self._failed(e)
+            self.apply_config(cfg)
+            self._mtime = mtime
+            self.last_error = None
+            return True
+
+    def _failed(self, e):
+        """읽기 실패 기록 -> 아직 적용된 설정이 없으면 ConfigError, 있으면 직전 설정 유지(False)"""
+        self.last_error = f"{self.path}: {e}"
+        if self._compiled is None: raise ConfigError(self.last_error) from e
+        return False
 
 
 # ==============================================================================
-# [함수] 매핑 및 판별 로직
+# [기본 설정] 모듈 수준 이름은 DEFAULT(election_config.toml)를 가리킴
 # ==============================================================================
+ELECTION_DB = {}
+TARGET_UNITS = []
+ORDER_LIST = []
+DEFAULT = MappingTable(CONFIG_PATH, ELECTION_DB, TARGET_UNITS, ORDER_LIST)
+FALLBACK_COMMISSION = DEFAULT.fallback
+CONFIG_VERSION = None
+LAST_RELOAD_ERROR = None
 
-def get_commission(name):
-    """이름으로 선관위 찾기 (긴 단어 우선 매칭)"""
-    sorted_keys = sorted(ELECTION_DB.keys(), key=len, reverse=True)
-    for key in sorted_keys:
-        if key in name:
-            return ELECTION_DB[key]
-    return "기타/공통"
+get_commission = DEFAULT.get_commission
+is_target_unit = DEFAULT.is_target_unit
+normalize_name = DEFAULT.normalize_name
+display_name = DEFAULT.display_name
+commission_rank = DEFAULT.commission_rank
+lookup = DEFAULT.lookup
 
+_tables = {os.path.abspath(CONFIG_PATH): DEFAULT}
+_tables_lock = threading.Lock()
 
-def is_target_unit(name):
-    """합산 대상(Value 계산용)인지 확인"""
-    for t in TARGET_UNITS:
-        if t in name:
-            # [예외 1] 타겟명에는 '총투표'가 없는데, 실제 이름에 '총투표'가 있으면 제외
-            if "총투표" in name and "총투표" not in t:
-                continue
 
-            # [예외 2] 의과대학 하위 단위(동아리, 의예과) 제외
-            if t == "의과대학" and ("동아리" in name or "의예과" in name):
-                continue
+def get_table(path=None):
+    """설정 파일 경로별 MappingTable (처음 요청할 때 읽고 이후 공유, None이면 DEFAULT)"""
+    if not path: return DEFAULT
+    key = os.path.abspath(path)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = MappingTable(key)
+            table.reload(force=True)
+            _tables[key] = table
+        return table
 
-            return True
-    return False
\ No newline at end of file
+
+def _sync_globals():
+    global FALLBACK_COMMISSION, CONFIG_VERSION, LAST_RELOAD_ERROR
+    FALLBACK_COMMISSION, CONFIG_VERSION, LAST_RELOAD_ERROR = DEFAULT.fallback, DEFAULT.version, DEFAULT.last_error
+
+
+def reload(path=None, force=False):
+    """설정 파일(기본: DEFAULT)이 바뀌었으면 다시 읽기 -> 새로 적용했으면 True"""
+    try: return get_table(path).reload(force)
+    finally: _sync_globals()
+
+
+def maybe_reload():
+    """읽어 둔 모든 설정 파일을 확인해 바뀐 것만 다시 컴파일 -> 하나라도 새로 적용했으면 True"""
+    changed = False
+    for table in list(_tables.values()):
+        try: changed = table.reload() or changed
+        except ConfigError: pass
+    _sync_globals()
+    return changed
+
+
+reload(force=True)
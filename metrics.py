@@ -0,0 +1,165 @@
+import os
+import time
+import bisect
+import threading
+import contextlib
+import collections
+
+# ==============================================================================
+# [계측] 단계별 소요 시간(span)과 카운터 -> Prometheus 텍스트 형식으로 내보내기
+# ==============================================================================
+# - span("parse") 처럼 단계 이름으로 감싸면 히스토그램(election_stage_seconds)에 기록
+# - inc("regex_fallback") 처럼 이름으로 카운터 증가 (election_<이름>_total)
+# - 내보내기: ELECTION_METRICS_PORT (HTTP /metrics) 또는 ELECTION_METRICS_PATH (텍스트 파일,
+#   node_exporter textfile collector 형식). 둘 다 비어 있으면 메모리에만 유지
+# 프로세스 전체에서 하나의 레지스트리(METRICS)를 공유하며 외부 의존성이 없습니다.
+
+METRICS_PORT = int(os.environ.get("ELECTION_METRICS_PORT", "0"))
+METRICS_PATH = os.environ.get("ELECTION_METRICS_PATH", "")
+
+# 화면/내보내기에 표시할 단계 순서 (수집 -> 후처리 -> 렌더링)
+STAGES = ["fetch", "driver_start", "page_load", "card_wait", "http_fetch", "parse", "enrich", "forecast", "aggregate", "history", "render", "export"]
+
+COUNTERS = {
+    "regex_fallback": "카드 태그 구조 파싱 실패로 Regex 비상망을 사용한 카드 수",
+    "parse_failures": "정보를 하나도 추출하지 못해 버린 카드 수",
+    "empty_fetches": "카드가 하나도 없는 페이지를 받은 횟수",
+    "unchanged_fetches": "변경 없음(304/해시 일치)으로 파싱을 건너뛴 횟수",
+    "fetch_errors": "수집 실패 횟수",
+    "card_wait_timeouts": "Selenium에서 card-custom 대기 시간 초과 횟수",
+    "snapshots_published": "새 스냅샷 발행 횟수",
+    "fetch_retries": "일시적 오류(연결 실패/시간 초과/5xx)로 다시 시도한 횟수",
+    "breaker_opens": "연속 실패로 서킷 브레이커가 열린 횟수",
+}
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class StageTimer:
+    """한 단계의 누적 히스토그램 + 최근 관측값 (p50/p95 계산용)"""
+    __slots__ = ("buckets", "sum", "count", "last", "recent")
+
+    def __init__(self, recent=256):
+        self.buckets = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+        self.last = None
+        self.recent = collections.deque(maxlen=recent)
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS): self.buckets[i] += 1
+        self.sum += seconds
+        self.count += 1
+        self.last = seconds
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        if not self.recent: return None
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            timer = self.stages.get(stage)
+            if timer is None: timer = self.stages[stage] = StageTimer()
+            timer.observe(seconds)
+
+    @contextlib.contextmanager
+    def span(self, stage):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.observe(stage, time.perf_counter() - t0)
+
+    def inc(self, name, n=1):
+        with self._lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def stage_rows(self):
+        """[(단계, 횟수, 마지막, p50, p95, 평균)] (초 단위, 관측이 있는 단계만 STAGES 순서로)"""
+        with self._lock:
+            names = [s for s in STAGES if s in self.stages] + sorted(s for s in self.stages if s not in STAGES)
+            return [(s, t.count, t.last, t.quantile(0.5), t.quantile(0.95), t.sum / t.count)
+                    for s, t in ((s, self.stages[s]) for s in names)]
+
+    def counter_values(self):
+        with self._lock: return dict(self.counters)
+
+    def render_prometheus(self):
+        lines = ["# HELP election_stage_seconds Time spent in each pipeline stage.",
+                 "# TYPE election_stage_seconds histogram"]
+        with self._lock:
+            for stage, t in self.stages.items():
+                cumulative = 0
+                for bound, n in zip(BUCKETS, t.buckets):
+                    cumulative += n
+                    lines.append(f'election_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'election_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {t.count}')
+                lines.append(f'election_stage_seconds_sum{{stage="{stage}"}} {t.sum:.6f}')
+                lines.append(f'election_stage_seconds_count{{stage="{stage}"}} {t.count}')
+            for name, value in self.counters.items():
+                lines.append(f"# HELP election_{name}_total {COUNTERS.get(name, name)}")
+                lines.append(f"# TYPE election_{name}_total counter")
+                lines.append(f"election_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """원자적으로 교체 (수집기가 쓰는 도중의 파일을 읽지 않도록)"""
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f: f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+
+METRICS = Registry()
+span = METRICS.span
+inc = METRICS.inc
+
+
+def export(path=None):
+    """설정된 경우 메트릭 파일 갱신 (워커가 수집할 때마다 호출)"""
+    path = path or METRICS_PATH
+    if path: METRICS.write_file(path)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+def serve(port=None, host="0.0.0.0"):
+    """/metrics 엔드포인트를 백그라운드 스레드로 시작 (프로세스당 한 번, port가 0이면 시작하지 않음)"""
+    global _server
+    port = METRICS_PORT if port is None else port
+    if not port: return None
+    with _server_lock:
+        if _server is not None: return _server
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = METRICS.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="election-metrics", daemon=True).start()
+        return _server
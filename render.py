@@ -0,0 +1,146 @@
+import threading
+import collections
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# ==============================================================================
+# [렌더러] 메인 표 HTML 생성 (벡터화 + 행 단위 조각 캐시)
+# ==============================================================================
+# - 컬럼 단위로 한 번에 포맷한 뒤 마지막에 한 번만 join
+# - (행 값 전체) -> '<tr>...</tr>' 조각을 캐시해서, 직전 갱신 이후 바뀌지 않은 행은 다시 만들지 않음
+
+TABLE_COLUMNS = ['No.', '담당 선관위', '선거 단위', '투표율', '투표자 수', '증가', '총 유권자', '투표 성사 잔여 인원']
+FORECAST_TABLE_COLUMNS = ['성사 예상', '예상 최종 투표율']  # forecast.py 컬럼이 있을 때만 표시
+ROW_KEY_COLUMNS = ['일련번호', '담당 선관위', '선거 단위', '투표율', '투표자 수', '증가', '총 유권자', '투표 성사 잔여 인원', 'is_target',
+                   'eta_minutes', 'projected_rate']
+
+
+def _table_head(columns):
+    return '<table class="custom-table"><thead><tr>' + "".join(f'<th>{col}</th>' for col in columns) + '</tr></thead><tbody>'
+
+
+TABLE_HEAD = _table_head(TABLE_COLUMNS)
+FORECAST_TABLE_HEAD = _table_head(TABLE_COLUMNS + FORECAST_TABLE_COLUMNS)
+TABLE_TAIL = '</tbody></table>'
+
+
+class RowFragmentCache:
+    """행 값 튜플 -> <tr> 조각 (LRU, 세션 간 공유)"""
+
+    def __init__(self, maxsize=20000):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        with self._lock:
+            out = []
+            for key in keys:
+                frag = self._data.get(key)
+                if frag is not None: self._data.move_to_end(key)
+                out.append(frag)
+            return out
+
+    def put_many(self, keys, frags):
+        with self._lock:
+            for key, frag in zip(keys, frags):
+                self._data[key] = frag
+            while len(self._data) > self.maxsize: self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+
+ROW_CACHE = RowFragmentCache()
+
+
+def _num(s):
+    # nullable Int32/float32 스냅샷 컬럼 -> float64 (결측은 NaN, 비교 결과가 NA 없는 bool이 되도록)
+    # float32 값은 소수 둘째 자리로 되돌림 (34.85 -> 34.849998 이 '34.8%'로 보이지 않도록)
+    values = pd.to_numeric(s, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return pd.Series(values.round(2) if s.dtype == np.float32 else values, index=s.index)
+
+
+def _fmt_int(s):
+    num = pd.to_numeric(s, errors='coerce')
+    return pd.Series(['-' if pd.isna(x) else f"{int(x):,}" for x in num.tolist()], index=s.index, dtype=object)
+
+
+def _fmt_eta(minutes):
+    if pd.isna(minutes): return '-'
+    if minutes <= 0: return '성사'
+    hours, mins = divmod(int(round(minutes)), 60)
+    return f"약 {hours}시간 {mins}분" if hours else f"약 {mins}분"
+
+
+def render_rows(df):
+    """DataFrame 행들을 <tr> 조각 Series로 변환 (컬럼 단위 벡터화)"""
+    remaining = _num(df['투표 성사 잔여 인원'])
+    voted = _num(df['투표자 수'])
+    rate = _num(df['투표율'])
+    diff = _num(df['증가']).fillna(0) if '증가' in df.columns else pd.Series(0, index=df.index)
+    is_target = df['is_target'] if 'is_target' in df.columns else pd.Series(False, index=df.index)
+
+    row_class = np.select(
+        [remaining.notna() & (remaining <= 0),
+         remaining.notna() & voted.notna() & (voted > 0) & (remaining <= voted * 0.2)],
+        ["success-row", "warning-row"], default="default-row")
+
+    diff_html = pd.Series('-', index=df.index, dtype=object)
+    up = diff > 0
+    diff_html[up] = '<span style="color: #e11d48; font-weight: bold;">▲ ' + _fmt_int(diff[up]) + '</span>'
+
+    units = df['선거 단위'].astype(str)
+    unit_html = units.where(~is_target.astype(bool), '<span class="target-highlight">' + units + '</span>')
+    rate_html = pd.Series(['-' if pd.isna(x) else f"{x:.2f}%" for x in rate.tolist()], index=df.index, dtype=object)
+
+    cells = ('<tr class="' + pd.Series(row_class, index=df.index) + '">'
+             + '<td>' + df['일련번호'].astype(str) + '</td>'
+             + '<td>' + df['담당 선관위'].astype(str) + '</td>'
+             + '<td>' + unit_html + '</td>'
+             + '<td>' + rate_html + '</td>'
+             + '<td>' + _fmt_int(voted) + '</td>'
+             + '<td>' + diff_html + '</td>'
+             + '<td>' + _fmt_int(df['총 유권자']) + '</td>'
+             + '<td>' + _fmt_int(remaining) + '</td>')
+
+    if 'eta_minutes' in df.columns:
+        eta_html = pd.Series([_fmt_eta(x) for x in df['eta_minutes'].tolist()], index=df.index, dtype=object)
+        projected_html = pd.Series(['-' if pd.isna(x) else f"{x:.1f}%" for x in _num(df['projected_rate']).tolist()], index=df.index, dtype=object)
+        cells = cells + '<td>' + eta_html + '</td>' + '<td>' + projected_html + '</td>'
+    return cells + '</tr>'
+
+
+
+def row_keys(df):
+    cols = [c for c in ROW_KEY_COLUMNS if c in df.columns]
+    values = df[cols].astype(object)
+    values = values.where(values.notna(), None)  # NaN은 서로 같지 않으므로 None으로 통일
+    return list(zip(*(values[c].tolist() for c in cols)))
+
+
+def create_html_table(df, cache=ROW_CACHE):
+    with metrics.span("render"): return _create_html_table(df, cache)
+
+
+def _create_html_table(df, cache):
+    head = FORECAST_TABLE_HEAD if 'eta_minutes' in df.columns else TABLE_HEAD
+    if df.empty: return head + TABLE_TAIL
+    keys = row_keys(df)
+    frags = cache.get_many(keys) if cache else [None] * len(keys)
+
+    miss = [i for i, frag in enumerate(frags) if frag is None]
+    if miss:
+        rendered = render_rows(df.iloc[miss]).tolist()
+        for i, frag in zip(miss, rendered): frags[i] = frag
+        if cache:
+            cache.put_many([keys[i] for i in miss], rendered)
+            cache.misses += len(miss)
+    if cache: cache.hits += len(keys) - len(miss)
+
+    return head + "".join(frags) + TABLE_TAIL
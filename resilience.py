@@ -0,0 +1,112 @@
+import os
+import time
+import random
+import threading
+
+import metrics
+
+# ==============================================================================
+# [복원력] 재시도(지터가 있는 지수 백오프)와 서킷 브레이커
+# ==============================================================================
+# - backoff_delay: n번째 재시도 대기 시간 = 상한 안에서 base * 2^n 의 절반 + 나머지 절반은 무작위
+#   (여러 프로세스/대상이 같은 순간에 몰려서 다시 요청하지 않도록)
+# - retry_call: 일시적 오류(연결 실패, 시간 초과, 5xx)만 재시도, 전체 마감 시간(deadline)을 넘기지 않음
+# - CircuitBreaker: 연속 BREAKER_THRESHOLD회 실패하면 열림(open) -> 대기 시간 동안 요청 자체를 보내지 않음
+#   -> 대기 후 한 번만 시험 요청(half-open) -> 성공하면 닫힘, 실패하면 대기 시간을 두 배로 늘려 다시 열림
+# 브레이커는 주소별로 프로세스 전체에서 공유합니다. (get_breaker)
+
+RETRY_ATTEMPTS = int(os.environ.get("ELECTION_RETRY_ATTEMPTS", "3"))
+RETRY_BASE = 0.5
+RETRY_CAP = 4.0
+BREAKER_THRESHOLD = int(os.environ.get("ELECTION_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("ELECTION_BREAKER_COOLDOWN", "60"))
+BREAKER_COOLDOWN_MAX = 600
+
+
+def backoff_delay(attempt, base, cap, rnd=random):
+    """attempt(0부터)번째 재시도 전 대기 시간 (equal jitter: 절반은 고정, 절반은 무작위)"""
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + rnd.uniform(0, delay / 2)
+
+
+def retry_call(fn, retry_on, attempts=None, base=RETRY_BASE, cap=RETRY_CAP, deadline=None, log=print, sleep=time.sleep):
+    """fn()을 retry_on 예외에 한해 최대 attempts번 시도 (deadline: time.monotonic 기준 마감 시각)"""
+    attempts = attempts or RETRY_ATTEMPTS
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except retry_on as e:
+            delay = backoff_delay(attempt, base, cap)
+            last = attempt + 1 >= attempts or (deadline is not None and time.monotonic() + delay >= deadline)
+            if last: raise
+            metrics.inc("fetch_retries")
+            log(f"🔁 일시적 오류로 {delay:.1f}초 뒤 다시 시도 ({attempt + 1}/{attempts}): {e}")
+            sleep(delay)
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, retry_in):
+        super().__init__(f"연속 실패로 요청을 잠시 멈춥니다 ({retry_in:.0f}초 뒤 다시 시도)")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name, threshold=None, cooldown=None, cooldown_max=BREAKER_COOLDOWN_MAX, clock=time.monotonic):
+        self.name = name
+        self.threshold = threshold or BREAKER_THRESHOLD
+        self.base_cooldown = cooldown or BREAKER_COOLDOWN
+        self.cooldown_max = cooldown_max
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0          # 연속 실패 횟수
+        self.trips = 0             # 닫힌 뒤 연속으로 열린 횟수 (대기 시간 배수)
+        self.opened_at = None
+        self.cooldown = self.base_cooldown
+
+    def before_call(self):
+        """요청 직전 호출: 열려 있으면 CircuitOpenError, 대기 시간이 지났으면 시험 요청 한 번만 허용"""
+        with self._lock:
+            if self.state == self.CLOSED: return
+            remaining = self.opened_at + self.cooldown - self._clock()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(max(remaining, 0.0))
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self.trips, self.cooldown = self.CLOSED, 0, 0, self.base_cooldown
+
+    def record_failure(self):
+        """실패 기록 -> 이번 실패로 브레이커가 열렸으면 True"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.cooldown = self.base_cooldown if not self.trips else backoff_delay(self.trips, self.base_cooldown, self.cooldown_max)
+                self.state, self.opened_at = self.OPEN, self._clock()
+                self.trips += 1
+                metrics.inc("breaker_opens")
+                return True
+            return False
+
+    def retry_in(self):
+        """열려 있으면 다시 시도할 수 있을 때까지 남은 초, 아니면 0"""
+        with self._lock:
+            if self.state != self.OPEN: return 0.0
+            return max(0.0, self.opened_at + self.cooldown - self._clock())
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """이름(수집 주소)별 CircuitBreaker (프로세스 전체에서 공유)"""
+    with _breakers_lock:
+        if name not in _breakers: _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
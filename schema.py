@@ -0,0 +1,185 @@
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+
+import mapping_db
+
+# ==============================================================================
+# [스냅샷 스키마] 고정 컬럼/dtype + 읽기 전용(불변) 컬럼형 표
+# ==============================================================================
+# - 담당 선관위 / 선거 단위 / source : 범주형 (카테고리는 mapping_db에서 한 번 만들어 모든 스냅샷이 공유)
+# - 인원 수 : nullable Int32,  비율/예측 : float32,  판별 컬럼 : bool
+# - to_snapshot()이 만든 표의 배열은 모두 읽기 전용이라 세션끼리 복사 없이 같은 객체를 공유
+#   (제자리 수정은 ValueError, assign 등으로 만든 파생 표는 pandas Copy-on-Write로 자기 사본만 가짐)
+# - 화면의 필터/정렬은 행 번호 배열(view_rows)로 계산하고, 표를 그릴 때 한 번만 take
+# 소수점 값은 float32라서 파일/DB로 내보낼 때는 plain_frame()/round_rate()로 소수 둘째 자리에 맞춥니다.
+
+INT_COLUMNS = ['일련번호', '투표자 수', '총 유권자', '투표 성사 잔여 인원', '증가', 'remaining_clipped']
+FLOAT_COLUMNS = ['투표율', 'eta_minutes', 'projected_rate']
+BOOL_COLUMNS = ['is_target', 'is_college', 'is_valid']
+
+# 표 컬럼 순서 (없는 컬럼은 건너뛰고, 목록에 없는 컬럼은 뒤에 그대로 붙임)
+SNAPSHOT_COLUMNS = ['일련번호', '담당 선관위', '선거 단위', '투표율', '투표자 수', '총 유권자', '투표 성사 잔여 인원', 'source',
+                    '증가', 'is_target', 'is_college', 'remaining_clipped', 'is_valid', 'eta_minutes', 'projected_rate']
+
+
+class Interner:
+    """이름 -> 범주형 dtype (새 이름은 뒤에 추가해 기존 코드를 유지, 매핑 설정이 바뀌면 다시 만듦)"""
+
+    def __init__(self, seed=lambda: [], ordered=False):
+        self._seed = seed
+        self.ordered = ordered
+        self._lock = threading.Lock()
+        self._generation = None
+        self._extra = []        # 설정에 없지만 스냅샷에서 본 이름 (등장 순서)
+        self._codes = {}
+        self._dtype = None
+
+    def _rebuild(self, names):
+        self._codes = {name: i for i, name in enumerate(names)}
+        self._dtype = pd.CategoricalDtype(names, ordered=self.ordered)
+
+    def dtype(self, values=()):
+        """values를 모두 담는 dtype (새 이름이 없으면 같은 객체)"""
+        with self._lock:
+            if self._generation != mapping_db.DEFAULT.generation:
+                self._generation = mapping_db.DEFAULT.generation
+                self._rebuild(list(dict.fromkeys(list(self._seed()) + self._extra)))
+            new = [v for v in dict.fromkeys(values) if isinstance(v, str) and v not in self._codes]
+            if new:
+                self._extra += new
+                self._rebuild(list(self._dtype.categories) + new)
+            return self._dtype
+
+    def categorical(self, values):
+        values = list(values)
+        dtype = self.dtype(values)
+        codes = np.array([self._codes.get(v, -1) for v in values], dtype=_code_dtype(len(dtype.categories)))
+        return pd.Categorical.from_codes(_read_only(codes), dtype=dtype)
+
+
+COMMISSIONS = Interner(lambda: mapping_db.ORDER_LIST + [mapping_db.FALLBACK_COMMISSION], ordered=True)
+UNITS = Interner(lambda: list(mapping_db.ELECTION_DB) + mapping_db.TARGET_UNITS)
+SOURCES = Interner()
+CATEGORY_COLUMNS = {'담당 선관위': COMMISSIONS, '선거 단위': UNITS, 'source': SOURCES}
+
+
+def _code_dtype(n):
+    # pandas가 쓰는 코드 dtype과 같게 맞춰야 from_codes가 배열을 복사하지 않음 (복사본은 쓰기 가능)
+    return np.int8 if n < 127 else np.int16 if n < 32767 else np.int32
+
+
+def _read_only(arr):
+    arr.flags.writeable = False
+    return arr
+
+
+def _int_array(values):
+    num = pd.to_numeric(pd.Series(values, copy=False), errors='coerce')
+    mask = num.isna().to_numpy()
+    data = num.to_numpy(dtype='float64', na_value=0).round().astype(np.int32)
+    return pd.arrays.IntegerArray(_read_only(data), _read_only(mask))
+
+
+def _float_array(values):
+    return _read_only(pd.to_numeric(pd.Series(values, copy=False), errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan))
+
+
+def _bool_array(values):
+    return _read_only(pd.Series(values, copy=False).fillna(False).to_numpy(dtype=bool))
+
+
+def _column(name, values):
+    if not isinstance(values, pd.Series): values = pd.Series(values)
+    if name in CATEGORY_COLUMNS:
+        dtype = CATEGORY_COLUMNS[name].dtype()
+        if isinstance(values.dtype, pd.CategoricalDtype) and values.dtype.categories.equals(dtype.categories):  # 이미 공유 카테고리면 코드만 복사
+            return pd.Categorical.from_codes(_read_only(values.cat.codes.to_numpy().copy()), dtype=dtype)
+        return CATEGORY_COLUMNS[name].categorical(values.tolist())
+    if name in INT_COLUMNS: return _int_array(values)
+    if name in FLOAT_COLUMNS: return _float_array(values)
+    if name in BOOL_COLUMNS: return _bool_array(values)
+    return values.to_numpy(copy=True)
+
+
+def to_snapshot(data):
+    """스키마 dtype으로 맞춘 읽기 전용 표 (data: DataFrame 또는 {컬럼: 값 목록}, 인덱스는 0부터 다시 매김)"""
+    names = list(data.columns if isinstance(data, pd.DataFrame) else data)
+    cols = [c for c in SNAPSHOT_COLUMNS if c in names] + [c for c in names if c not in SNAPSHOT_COLUMNS]
+    length = len(data) if isinstance(data, pd.DataFrame) else len(data[names[0]]) if names else 0
+    return pd.DataFrame({c: _column(c, data[c]) for c in cols}, index=pd.RangeIndex(length), copy=False)
+
+
+def numeric_values(col):
+    """계산용 float64 배열 (숫자가 아니거나 결측이면 NaN) - 파생 컬럼(enrich.py)과 집계(aggregate.py)가 공유"""
+    return pd.to_numeric(col, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def map_units(units, fn):
+    """선거 단위 컬럼에 fn(이름)을 적용 (범주형이면 카테고리마다 한 번만 계산)"""
+    if isinstance(units.dtype, pd.CategoricalDtype):
+        lut = pd.Series([fn(name) for name in units.cat.categories], dtype=object)
+        codes = units.cat.codes.to_numpy()
+        return pd.Series(lut.to_numpy()[codes], index=units.index).where(codes >= 0, None)
+    return pd.Series([fn(name) for name in units.tolist()], index=units.index, dtype=object)
+
+
+# ==============================================================================
+# [보기] 필터/정렬 -> 행 번호 배열 (표 복사 없음)
+# ==============================================================================
+SORT_KEYS = {
+    "기본순": ("일련번호", True), "투표율 높은 순": ("투표율", False), "투표율 낮은 순": ("투표율", True),
+    "투표자 많은 순": ("투표자 수", False), "잔여 인원 적은 순": ("투표 성사 잔여 인원", True),
+    "성사 임박 순": ("eta_minutes", True), "가나다 순": ("선거 단위", True),
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _category_rank(dtype):
+    # 카테고리 이름의 사전순 순위 (공유 dtype마다 한 번만 계산)
+    return np.argsort(np.argsort(np.asarray(dtype.categories, dtype=object), kind='stable'), kind='stable')
+
+
+def _sort_key(col):
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        return np.where(codes >= 0, _category_rank(col.dtype)[codes], np.nan)
+    return pd.to_numeric(col, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def sort_rows(df, rows, sort_option):
+    """rows(행 번호)를 정렬 기준대로 재배열 (같은 값은 원래 순서 유지, 결측은 항상 맨 뒤)"""
+    column, ascending = SORT_KEYS.get(sort_option, SORT_KEYS["기본순"])
+    if column not in df.columns or len(rows) == 0: return rows
+    key = _sort_key(df[column])[rows]
+    present = ~np.isnan(key)
+    order = np.argsort(key[present] if ascending else -key[present], kind='stable')
+    return np.concatenate([rows[present][order], rows[~present]])
+
+
+def view_rows(df, commissions=(), sort_option="기본순"):
+    """(표시할 유효 행 번호(정렬됨), 정보가 부족한 행 번호) - df.take(...)로 표를 만듦"""
+    keep = df['담당 선관위'].isin(commissions).to_numpy() if commissions else np.ones(len(df), dtype=bool)
+    valid = df['is_valid'].to_numpy()
+    return sort_rows(df, np.flatnonzero(keep & valid), sort_option), np.flatnonzero(keep & ~valid)
+
+
+# ==============================================================================
+# [내보내기] 외부 형식(JSON/CSV/SQLite)용 값
+# ==============================================================================
+def round_rate(x, digits=2):
+    """float32 비율 값을 소수 digits자리 Python float로 (결측은 None)"""
+    return None if pd.isna(x) else round(float(x), digits)
+
+
+def plain_frame(df):
+    """범주형 -> 문자열, float32 -> 소수 둘째 자리 float64 (JSON/CSV에 40.130001 같은 값이 나오지 않도록)"""
+    out = {}
+    for c in df.columns:
+        col = df[c]
+        if isinstance(col.dtype, pd.CategoricalDtype): col = col.astype(object)
+        elif col.dtype == np.float32: col = col.astype('float64').round(2)
+        out[c] = col
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,320 @@
+import os
+import glob
+import time
+import hashlib
+import threading
+import traceback
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from card_parser import DEFAULT_PROFILE, parse_cards
+from crawler import CRAWL_CONCURRENCY, RATE_LIMITER, discover_pages, fetch_pages
+from driver_pool import USER_AGENT, DriverLaunchError, get_driver_pool
+from mapping_db import ORDER_LIST
+from resilience import CircuitOpenError, get_breaker, retry_call
+
+# ==============================================================================
+# [설정] 크롤링 대상 (정렬 순서 ORDER_LIST는 mapping_db에 있음)
+# ==============================================================================
+# ELECTION_VOTES_URL로 로컬 대역 서버(bench/serve_fixtures.py) 등을 지정할 수 있음
+VOTES_URL = os.environ.get("ELECTION_VOTES_URL", "https://election.yonsei.ac.kr/votes")
+
+# 단계별 시간 제한 (초): HTTP 연결/응답, Selenium 카드 대기, 수집 1회 전체(재시도 포함)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("ELECTION_HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("ELECTION_HTTP_READ_TIMEOUT", "10"))
+HTTP_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+CARD_WAIT_TIMEOUT = float(os.environ.get("ELECTION_CARD_WAIT_TIMEOUT", "10"))
+FETCH_DEADLINE = float(os.environ.get("ELECTION_FETCH_DEADLINE", "45"))
+
+# 수집 경로: "auto"(HTTP 우선, 실패 시 Selenium) | "http" | "browser" | "replay"(저장된 스냅샷 재생)
+FETCH_MODE = os.environ.get("ELECTION_FETCH_MODE", "auto")
+REPLAY_DIR = os.environ.get("ELECTION_REPLAY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "fixtures", "replay"))
+REPLAY_LOOP = os.environ.get("ELECTION_REPLAY_LOOP", "0") == "1"
+
+
+class FetchError(Exception):
+    """크롤링 실패 (UI 쪽에서 메시지를 표시)"""
+
+
+class TransientHTTPError(requests.HTTPError):
+    """잠시 뒤 다시 시도할 만한 HTTP 오류 (429, 5xx)"""
+
+
+# 재시도 대상: 연결 실패, 시간 초과, 서버 과부하 응답
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, TransientHTTPError)
+
+
+# ==============================================================================
+# [경량 수집] HTTP 세션 (연결 재사용)
+# ==============================================================================
+_http_session = None
+
+def get_http_session():
+    """프로세스 전체에서 재사용하는 requests 세션 (keep-alive 커넥션 풀)"""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "ko,ko_KR;q=0.9",
+        })
+        _http_session = session
+    return _http_session
+
+
+def fetch_html_http(url, log=print, detector=None):
+    """브라우저 없이 (html, 검증자) 가져오기 (304 Not Modified 이면 html이 None)"""
+    headers = detector.request_headers() if detector else {}
+    with metrics.span("http_fetch"):
+        res = get_http_session().get(url, timeout=HTTP_TIMEOUT, headers=headers)
+    if res.status_code == 304:
+        log("📭 서버 응답 304 (Not Modified)")
+        return None, None
+    if res.status_code == 429 or res.status_code >= 500:
+        raise TransientHTTPError(f"{res.status_code} {res.reason}: {url}", response=res)
+    res.raise_for_status()
+    if not res.encoding or res.encoding.lower() == "iso-8859-1": res.encoding = "utf-8"
+    return res.text, (res.headers.get("ETag"), res.headers.get("Last-Modified"))
+
+
+# ==============================================================================
+# [변경 감지] ETag / Last-Modified / 카드 영역 해시
+# ==============================================================================
+def page_digest(html, card_class="card-custom"):
+    """카드 영역(첫 card-custom 이후)의 해시 (페이지 상단의 동적 토큰은 무시)"""
+    start = html.find(card_class)
+    section = html[start:] if start >= 0 else html
+    return hashlib.blake2b(section.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ChangeDetector:
+    """직전 수집 결과와 비교해 변경이 없으면 파싱/후처리를 건너뛰도록 판단"""
+
+    def __init__(self):
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.skipped = 0      # 변경 없음으로 건너뛴 횟수
+        self.processed = 0    # 새 데이터로 처리한 횟수
+
+    def request_headers(self):
+        headers = {}
+        if self.etag: headers["If-None-Match"] = self.etag
+        if self.last_modified: headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_unchanged(self, digest):
+        return digest is not None and digest == self.digest
+
+    def mark_skipped(self):
+        self.skipped += 1
+
+    def invalidate(self):
+        """다음 응답은 내용이 같아도 다시 파싱 (매핑 설정이 바뀌었을 때)"""
+        self.digest = self.etag = self.last_modified = None
+
+    def mark_processed(self, digest, validators=None):
+        """카드 파싱에 성공한 응답만 기준으로 기억 (HTTP 검증자는 HTTP 경로에서만)"""
+        self.digest = digest
+        self.etag, self.last_modified = validators or (None, None)
+        self.processed += 1
+
+
+# ==============================================================================
+# [재생 수집] 저장된 페이지 스냅샷 (오프라인 벤치마크/회귀 확인용)
+# ==============================================================================
+class ReplaySource:
+    """디렉터리의 *.html을 파일 이름 순서대로 한 번에 하나씩 반환 (끝에 닿으면 마지막 파일 유지, loop면 처음부터)"""
+
+    def __init__(self, path, loop=False):
+        self.paths = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, "*.html")))
+        if not self.paths: raise FetchError(f"❌ 재생할 스냅샷(*.html)이 없습니다: {path}")
+        self.loop = loop
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next_page(self):
+        """(html, 파일 경로)"""
+        with self._lock:
+            path = self.paths[self._next]
+            if self._next + 1 < len(self.paths): self._next += 1
+            elif self.loop: self._next = 0
+        with open(path, encoding="utf-8") as f: return f.read(), path
+
+
+_replay_sources = {}
+
+def get_replay_source(path=None):
+    """경로별로 재생 위치를 유지하는 ReplaySource (프로세스 전체에서 공유)"""
+    path = os.path.abspath(path or REPLAY_DIR)
+    if path not in _replay_sources: _replay_sources[path] = ReplaySource(path, REPLAY_LOOP)
+    return _replay_sources[path]
+
+
+# ==============================================================================
+# [브라우저 수집] Selenium (자바스크립트 렌더링이 필요할 때만 사용)
+# ==============================================================================
+def fetch_html_selenium(url, log=print, card_class="card-custom", wait_timeout=CARD_WAIT_TIMEOUT):
+    """풀에서 꺼낸 헤드리스 Chromium으로 페이지를 렌더링한 뒤 (html, 페이지 제목) 반환"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    try:
+        with get_driver_pool().acquire(log) as pooled:
+            driver = pooled.driver
+            log(f"사이트 접속 시도: {url} (드라이버 사용 {pooled.uses + 1}회차)")
+            pooled.load(url)
+
+            try:
+                with metrics.span("card_wait"):
+                    WebDriverWait(driver, wait_timeout).until(EC.presence_of_element_located((By.CLASS_NAME, card_class)))
+                    log(f"✅ 요소('{card_class}') 로딩 감지 성공!")
+                    time.sleep(1)
+            except:
+                metrics.inc("card_wait_timeouts")
+                log(f"⚠️ 타임아웃: '{card_class}' 요소를 찾지 못했습니다. (로딩이 느리거나 구조가 다름)")
+                pass
+
+            return driver.page_source, driver.title
+    except DriverLaunchError as e:
+        raise FetchError(f"❌ 브라우저 실행 실패! 드라이버 설정을 확인하세요.\n{e}") from e
+
+
+# ==============================================================================
+# 크롤링 함수 (Streamlit 의존성 없음)
+# ==============================================================================
+def get_data_from_server(log=print, mode=None, detector=None, replay_dir=None, url=None, profile=None, table=None):
+    """선거 현황 DataFrame 반환 (detector 기준으로 변경이 없으면 None)
+    url/profile/table: 수집 대상별 주소, 페이지 구조(card_parser.ParserProfile), 매핑(mapping_db.MappingTable)
+    주소별 서킷 브레이커가 열려 있으면 사이트에 요청하지 않고 바로 FetchError"""
+    url = url or VOTES_URL
+    mode = mode or FETCH_MODE
+    if mode == "replay": return _fetch(log, mode, detector, replay_dir, url, profile, table)
+
+    breaker = get_breaker(url)
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        raise FetchError(f"⏸️ {e}") from e
+    try:
+        df = _fetch(log, mode, detector, replay_dir, url, profile, table)
+    except FetchError:
+        if breaker.record_failure():
+            log(f"⛔ 연속 실패로 {breaker.cooldown:.0f}초 동안 {url} 요청을 멈춥니다.")
+        raise
+    breaker.record_success()
+    return df
+
+
+def _fetch(log, mode, detector, replay_dir, url, profile, table):
+    profile = profile or DEFAULT_PROFILE
+    card_class = profile.card_class
+    deadline = time.monotonic() + FETCH_DEADLINE
+
+    def parse_if_changed(pages, path, t0, validators=None):
+        digest = page_digest("".join(page_digest(html, card_class) for html in pages)) if len(pages) > 1 else page_digest(pages[0], card_class)
+        if detector and detector.is_unchanged(digest):
+            detector.mark_skipped()
+            metrics.inc("unchanged_fetches")
+            log(f"⏱️ [수집 경로] {path} ({time.perf_counter() - t0:.2f}초) - 변경 없음, 파싱 생략")
+            return None, False
+        with metrics.span("parse"):
+            data_list = merge_rows([parse_cards(html, log, profile=profile, table=table) for html in pages])
+            df = build_dataframe(data_list, table.order if table else None) if data_list is not None else None
+        log(f"⏱️ [수집 경로] {path} ({time.perf_counter() - t0:.2f}초, {len(pages)}페이지)")
+        if df is None: return None, True
+        if detector: detector.mark_processed(digest, validators)
+        return df, False
+
+    try:
+        # 재생 모드: 네트워크/브라우저 없이 저장된 스냅샷을 순서대로 파싱
+        if mode == "replay":
+            t0 = time.perf_counter()
+            html, path = get_replay_source(replay_dir).next_page()
+            df, no_cards = parse_if_changed([html], f"Replay {os.path.basename(path)}", t0)
+            if no_cards:
+                raise FetchError(f"❌ 선거 정보 카드를 하나도 찾지 못했습니다! (재생 스냅샷: {path})")
+            return df
+
+        # 1단계: HTTP 경량 경로 (카드가 서버 렌더링되어 있으면 여기서 끝)
+        if mode in ("auto", "http"):
+            t0 = time.perf_counter()
+            http_error = None
+            try:
+                def fetch_listing():
+                    RATE_LIMITER.wait(url)  # 추가 페이지(crawler.fetch_pages)와 같은 호스트별 제한
+                    return fetch_html_http(url, log, detector)
+                html, validators = retry_call(fetch_listing, TRANSIENT_ERRORS, deadline=deadline, log=log)
+            except requests.RequestException as e:
+                log(f"⚠️ HTTP 요청 실패: {e}")
+                html, validators, http_error = "", None, e
+            if html is None:
+                detector.mark_skipped()
+                metrics.inc("unchanged_fetches")
+                log(f"⏱️ [수집 경로] HTTP ({time.perf_counter() - t0:.2f}초) - 변경 없음 (304)")
+                return None
+            if html:
+                pages = [html]
+                extra = discover_pages(html, url) if card_class in html else []
+                if extra:
+                    log(f"🔗 추가 페이지 {len(extra)}개 동시 수집 (최대 동시 {CRAWL_CONCURRENCY}개)")
+                    fetched = fetch_pages(extra, lambda u: fetch_html_http(u, log)[0], log=log)
+                    # 한 페이지라도 빠지면 일부 선거 단위가 사라진 표가 되므로 수집 실패로 처리 (직전 스냅샷 유지, 다음 주기에 재시도)
+                    missing = [u for u, page in fetched if not page]
+                    if missing: raise FetchError(f"❌ 추가 페이지 {len(missing)}/{len(extra)}개 수집 실패: {', '.join(missing)}")
+                    pages += [page for _, page in fetched]
+                    validators = None  # 목록 페이지의 304만으로는 추가 페이지 변경 여부를 알 수 없음
+                df, no_cards = parse_if_changed(pages, "HTTP", t0, validators)
+                if not no_cards: return df
+            log(f"⚠️ [수집 경로] HTTP 응답에 카드 없음 ({time.perf_counter() - t0:.2f}초)")
+            if mode == "http":
+                if http_error: raise FetchError(f"❌ HTTP 요청 실패: {http_error}")
+                raise FetchError("❌ 선거 정보 카드를 하나도 찾지 못했습니다! (HTTP 전용 모드)")
+            log("브라우저(Selenium) 경로로 전환합니다.")
+
+        # 2단계: Selenium 폴백
+        t0 = time.perf_counter()
+        html, title = fetch_html_selenium(url, log, card_class, max(1.0, min(CARD_WAIT_TIMEOUT, deadline - time.monotonic())))
+        df, no_cards = parse_if_changed([html], "Selenium", t0)
+        if no_cards:
+            raise FetchError(f"❌ 선거 정보 카드를 하나도 찾지 못했습니다! (빈 페이지거나 차단됨)\n현재 페이지 제목: {title}")
+        return df
+
+    except FetchError:
+        raise
+    except Exception as e:
+        log(traceback.format_exc())
+        raise FetchError(f"❌ 실행 중 치명적 오류 발생: {e}") from e
+
+
+def merge_rows(row_lists):
+    """여러 페이지의 파싱 결과를 합침 (같은 선거 단위는 값이 더 많이 채워진 행 우선, 첫 등장 순서 유지)"""
+    if len(row_lists) == 1: return row_lists[0]
+    if all(rows is None for rows in row_lists): return None
+    merged = {}
+    for rows in row_lists:
+        for row in rows or []:
+            key = row["선거 단위"]
+            prev = merged.get(key)
+            if prev is None or sum(v is not None for v in row.values()) > sum(v is not None for v in prev.values()):
+                merged[key] = row
+    return list(merged.values())
+
+
+def build_dataframe(data_list, order=None):
+    """파싱 결과를 선관위 순서(기본: ORDER_LIST)로 정렬된 읽기 전용 스냅샷 표(schema.to_snapshot)로 변환"""
+    import pandas as pd
+    from schema import to_snapshot
+    if not data_list: return pd.DataFrame()
+    order = order or ORDER_LIST
+    rank = {name: i for i, name in enumerate(order)}
+    # 안정 정렬: 같은 선관위 안에서는 페이지 순서 유지, 목록에 없는 선관위는 맨 뒤
+    rows = sorted(data_list, key=lambda row: rank.get(row['담당 선관위'], len(order)))
+    columns = {'일련번호': range(1, len(rows) + 1)}
+    columns.update({col: [row.get(col) for row in rows] for col in rows[0]})
+    return to_snapshot(columns)
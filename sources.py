@@ -0,0 +1,243 @@
+import os
+import time
+import threading
+from typing import NamedTuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+import metrics
+import mapping_db
+import scraper
+from card_parser import PROFILES
+from resilience import CircuitBreaker, backoff_delay, get_breaker
+from scraper import FetchError, ChangeDetector, get_data_from_server
+
+# ==============================================================================
+# [수집 대상] 여러 선거 사이트(캠퍼스/기관)를 한 워커에서 동시에 수집해 하나의 표로 합침
+# ==============================================================================
+# - 대상 목록은 sources.toml (대상마다 주소, 페이지 구조, 매핑 설정, 수집 주기)
+# - SourceScheduler.fetch()는 워커의 수집 함수 자리에 들어가며, 주기가 된 대상만 스레드 풀에서 동시에 수집
+# - 한 라운드는 이번에 시작한 수집 중 하나가 끝날 때까지만(최대 SOURCE_ROUND_TIMEOUT초) 기다림:
+#   나머지(느린 대상, 이전 라운드부터 수집 중인 대상)는 끝나는 대로 워커를 깨워 다음 라운드에 합침
+#   (다른 대상의 갱신을 붙잡지 않음)
+# - 실패한 대상은 interval * 2^(연속 실패 - 1) ~ 그 두 배 사이(지터, 최대 SOURCE_BACKOFF_MAX초) 뒤에 재시도하고,
+#   그동안은 마지막으로 성공한 표를 그대로 합침 (주소별 서킷 브레이커가 열려 있으면 닫힐 때까지 대기)
+# - 대상마다 변경 감지(ChangeDetector)를 따로 두므로, 바뀐 대상이 하나도 없으면 새 스냅샷을 만들지 않음
+
+SOURCES_PATH = os.environ.get("ELECTION_SOURCES_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources.toml")
+SOURCE_ROUND_TIMEOUT = float(os.environ.get("ELECTION_SOURCE_ROUND_TIMEOUT", "30"))
+SOURCE_BACKOFF_MAX = 600
+
+
+class Source(NamedTuple):
+    id: str
+    label: str
+    url: str = None          # None: scraper.VOTES_URL
+    mode: str = None         # None: scraper.FETCH_MODE
+    parser: str = "yonsei"   # card_parser.PROFILES 이름
+    config: str = None       # 매핑 설정 파일 (None: election_config.toml)
+    interval: int = None     # 수집 주기 (None: 워커 주기)
+    replay_dir: str = None
+
+
+DEFAULT_SOURCE = Source(id="sinchon", label="신촌")
+
+
+def load_sources(path=None):
+    """sources.toml -> [Source] (파일이 없으면 기본 대상 하나, 형식이 틀리면 ValueError)"""
+    path = path or SOURCES_PATH
+    if not os.path.exists(path): return [DEFAULT_SOURCE]
+    with open(path, "rb") as f: entries = tomllib.load(f).get("sources", [])
+    if not entries: raise ValueError(f"{path}: [[sources]] 항목이 없습니다.")
+
+    base = os.path.dirname(os.path.abspath(path))
+    sources, seen = [], set()
+    for entry in entries:
+        unknown = set(entry) - set(Source._fields)
+        if unknown: raise ValueError(f"{path}: 알 수 없는 항목 {sorted(unknown)}")
+        if not entry.get("id"): raise ValueError(f"{path}: id가 없는 수집 대상이 있습니다.")
+        if entry["id"] in seen: raise ValueError(f"{path}: 중복된 id {entry['id']!r}")
+        if entry.get("parser", "yonsei") not in PROFILES:
+            raise ValueError(f"{path}: 알 수 없는 parser {entry['parser']!r} (가능: {', '.join(PROFILES)})")
+        seen.add(entry["id"])
+        for key in ("config", "replay_dir"):
+            if entry.get(key): entry[key] = os.path.join(base, entry[key])
+        sources.append(Source(**{"label": entry["id"], **entry}))
+    return sources
+
+
+class SourceState:
+    """대상 하나의 수집 상태 (스케줄러 스레드에서만 갱신)"""
+
+    def __init__(self):
+        self.detector = ChangeDetector()
+        self.frame = None        # 마지막으로 성공한 표 (정리 전, 대상 기준)
+        self.future = None       # 진행 중인 수집
+        self.next_due = 0.0      # 다음 수집 시각 (time.monotonic 기준)
+        self.failures = 0        # 연속 실패 횟수
+        self.error = None
+        self.last_ok = None      # 마지막 성공 시각 (time.monotonic 기준)
+
+
+class SourceScheduler:
+    def __init__(self, sources, interval=60, wake=None, round_timeout=SOURCE_ROUND_TIMEOUT):
+        self.sources = list(sources)
+        self.interval = interval
+        self.round_timeout = round_timeout
+        self.wake = wake                       # 라운드가 끝난 뒤 늦게 끝난 수집이 있으면 호출 (워커 깨우기)
+        self.states = {s.id: SourceState() for s in self.sources}
+        self._pool = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="election-source")
+        self._in_round = threading.Event()
+        self.round_ok = False                  # 직전 라운드에서 수집에 성공한 대상이 있었는지 (변경 없음 포함)
+
+    # --------------------------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------------------------
+    def table(self, source):
+        return mapping_db.get_table(source.config)
+
+    def interval_of(self, source):
+        return source.interval or self.interval
+
+    def breaker(self, source):
+        return None if (source.mode or scraper.FETCH_MODE) == "replay" else get_breaker(source.url or scraper.VOTES_URL)
+
+    def seconds_until_due(self):
+        """가장 먼저 수집할 대상까지 남은 시간 (수집 중인 대상은 제외)"""
+        now = time.monotonic()
+        waits = [st.next_due - now for st in self.states.values() if st.future is None]
+        return max(0.0, min(waits)) if waits else self.interval
+
+    def stale_labels(self):
+        """마지막 수집이 실패해 이전 표를 대신 보여주고 있는 대상의 표시 이름"""
+        return [s.label for s in self.sources if self.states[s.id].failures and self.states[s.id].frame is not None]
+
+    def failing(self):
+        """마지막 수집이 실패한 대상 [(표시 이름, 오류, 마지막 성공 후 경과 초 또는 None)]"""
+        now = time.monotonic()
+        return [(s.label, st.error, None if st.last_ok is None else now - st.last_ok)
+                for s, st in ((s, self.states[s.id]) for s in self.sources) if st.failures]
+
+    def stats(self):
+        """(처리된 갱신 수, 변경 없음으로 건너뛴 갱신 수) - 모든 대상 합계"""
+        return (sum(st.detector.processed for st in self.states.values()),
+                sum(st.detector.skipped for st in self.states.values()))
+
+    def invalidate(self):
+        for st in self.states.values(): st.detector.invalidate()
+
+    def status_rows(self):
+        """[(표시 이름, 상태, 연속 실패, 마지막 성공 후 경과 초, 오류)]"""
+        now = time.monotonic()
+        rows = []
+        for source in self.sources:
+            st = self.states[source.id]
+            breaker = self.breaker(source)
+            if st.future: state = "수집 중"
+            elif breaker and breaker.state == CircuitBreaker.OPEN: state = "요청 중단"
+            else: state = "실패" if st.failures else "정상"
+            age = None if st.last_ok is None else now - st.last_ok
+            rows.append((source.label, state, st.failures, age, st.error))
+        return rows
+
+    # --------------------------------------------------------------------------
+    # 수집
+    # --------------------------------------------------------------------------
+    def _fetch_one(self, source, log):
+        prefix = f"[{source.label}] " if len(self.sources) > 1 else ""
+        return get_data_from_server(lambda msg: log(prefix + msg), mode=source.mode, detector=self.states[source.id].detector,
+                                    replay_dir=source.replay_dir, url=source.url, profile=PROFILES[source.parser],
+                                    table=self.table(source))
+
+    def _on_done(self, future):
+        if not self._in_round.is_set() and self.wake: self.wake()
+
+    def _collect(self, source, log, now):
+        """끝난 수집 결과를 상태에 반영 -> 새 표를 받았으면 True"""
+        st = self.states[source.id]
+        future, st.future = st.future, None
+        try:
+            df = future.result()
+        except Exception as e:
+            st.failures += 1
+            st.error = str(e) if isinstance(e, FetchError) else f"❌ 실행 중 치명적 오류 발생: {e}"
+            backoff = 2 * backoff_delay(st.failures - 1, self.interval_of(source), SOURCE_BACKOFF_MAX / 2)
+            # 브레이커가 열렸으면 다시 시도할 수 있을 때까지는 수집하지 않음
+            backoff = max(backoff, getattr(e.__cause__, "retry_in", 0.0))
+            st.next_due = now + backoff
+            metrics.inc("fetch_errors")  # 대상별 실패 (모든 대상이 실패해 워커가 받는 FetchError는 따로 세지 않음)
+            log(f"⚠️ [{source.label}] 수집 실패 ({st.failures}회 연속, {backoff:.0f}초 뒤 재시도): {st.error}")
+            return False
+        st.failures, st.error, st.last_ok = 0, None, now
+        self.round_ok = True
+        st.next_due = now + self.interval_of(source)
+        if df is None or df.empty: return False
+        st.frame = df
+        return True
+
+    def fetch(self, log=print, force=False):
+        """주기가 된 대상을 동시에 수집해 합친 표 반환 (바뀐 대상이 없으면 None)
+        force: 수집 주기와 상관없이 모든 대상 수집 (실패 후 대기 중인 대상은 제외)"""
+        now = time.monotonic()
+        self.round_ok = False
+        self._in_round.set()
+        try:
+            submitted = []
+            for source in self.sources:
+                st = self.states[source.id]
+                if st.future is None and (st.next_due <= now or (force and not st.failures)):
+                    st.future = self._pool.submit(self._fetch_one, source, log)
+                    st.future.add_done_callback(self._on_done)
+                    submitted.append(st.future)
+            # 이번 라운드에 시작한 수집 중 하나라도 끝나면 바로 합침 (이전 라운드부터 수집 중인 대상은 기다리지 않음)
+            # 나머지는 끝나는 대로 _on_done이 워커를 깨워 다음 라운드에 합침
+            in_flight = [st.future for st in self.states.values() if st.future is not None]
+            if submitted and not any(f.done() for f in in_flight):
+                wait(submitted, timeout=self.round_timeout, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            changed = False
+            for source in self.sources:
+                st = self.states[source.id]
+                if st.future is not None and st.future.done(): changed = self._collect(source, log, now) or changed
+        finally:
+            self._in_round.clear()
+        # 결과를 모은 직후에 끝난 수집은 _on_done이 놓칠 수 있으므로 여기서 한 번 더 확인
+        if self.wake and any(st.future is not None and st.future.done() for st in self.states.values()): self.wake()
+
+        if changed: return self.merge()
+        if all(st.frame is None and st.failures for st in self.states.values()):
+            raise FetchError("\n".join(st.error for st in self.states.values() if st.error))
+        return None
+
+    def wait_pending(self, timeout):
+        """수집 중인 대상이 모두 끝날 때까지 최대 timeout초 대기 -> 아직 끝나지 않은 대상의 표시 이름 (한 번 실행용)"""
+        pending = [st.future for st in self.states.values() if st.future is not None]
+        if pending: wait(pending, timeout=max(0.0, timeout))
+        return [s.label for s in self.sources if self.states[s.id].future is not None and not self.states[s.id].future.done()]
+
+    def merge(self):
+        """대상별 마지막 표를 sources 순서로 합침 ('source' 컬럼 추가, 일련번호 다시 매김)
+        다른 대상과 이름이 겹치는 선거 단위는 '이름 (대상 표시 이름)'으로 구분"""
+        import pandas as pd
+        frames, seen = [], set()
+        for source in self.sources:
+            df = self.states[source.id].frame
+            if df is None: continue
+            table = self.table(source)
+            units = df['선거 단위'].tolist()
+            # 합산 대상 여부는 대상별 매핑으로 판별 (이름을 구분하기 전에 계산)
+            is_target = [table.lookup(name).is_target for name in units]
+            names = [f"{name} ({source.label})" if name in seen else name for name in units]
+            seen.update(units)
+            frames.append(df.assign(**{'선거 단위': names, 'is_target': is_target, 'source': source.id}))
+        merged = pd.concat(frames, ignore_index=True)
+        merged['일련번호'] = range(1, len(merged) + 1)
+        return merged
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,230 @@
+import os
+import time
+import threading
+from datetime import datetime
+
+import pytz
+
+import metrics
+
+# ==============================================================================
+# [공유 수집기] 프로세스 전체에서 하나만 도는 백그라운드 크롤러
+# ==============================================================================
+# 모든 Streamlit 세션은 이 워커가 발행한 최신 스냅샷을 읽기만 합니다.
+# 브라우저 실행 횟수는 접속자 수와 무관하게 폴링 주기에 의해서만 결정됩니다.
+# fetch_fn을 주지 않으면 sources.toml의 수집 대상을 SourceScheduler로 동시에 수집합니다.
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 마지막으로 수집에 성공한 지 이 시간(초)이 지나면 화면에 '오래된 데이터'로 표시 (0이면 폴링 주기의 2배)
+STALE_AFTER = float(os.environ.get("ELECTION_STALE_AFTER", "0"))
+
+
+class FetchWorker:
+    def __init__(self, interval=60, idle_timeout=600, fetch_fn=None, store=None, sources=None):
+        self.interval = interval              # 폴링 주기 (초, 대상별 interval이 없을 때의 기본값)
+        self.idle_timeout = idle_timeout      # 이 시간 동안 접속자가 없으면 폴링 중단
+        self._fetch_fn = fetch_fn
+        self.sources = sources                # [sources.Source] (None이면 sources.toml)
+        self.scheduler = None
+        self._force = False
+        self.store = store                    # history.SnapshotStore (선택)
+        self.forecaster = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_seen = time.monotonic()
+        self._idle = False
+
+        # 발행 상태 (읽기 전용으로 공유)
+        self.data = None
+        self.version = 0
+        self.last_updated = "-"
+        self.last_error = None
+        self.last_ok_at = None                # 마지막으로 수집에 성공한 시각 (변경 없음 포함, time.time - 수집 대상이 여럿이면 하나라도 성공한 시각)
+        self.fetch_count = 0
+        self.detector = None
+        self._listeners = []
+
+    # --------------------------------------------------------------------------
+    # 세션 쪽 API
+    # --------------------------------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="election-fetch-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread: self._thread.join(timeout)
+        if self.scheduler: self.scheduler.shutdown()
+        if self.store: self.store.close()
+
+    def touch(self):
+        """세션이 살아있음을 알림 (유휴 상태면 즉시 깨움)"""
+        idle = time.monotonic() - self._last_seen > self.idle_timeout
+        self._last_seen = time.monotonic()
+        if idle: self._wake.set()
+
+    def request_refresh(self):
+        """수동 업데이트 요청 (여러 세션의 요청은 한 번의 수집으로 합쳐짐)"""
+        self.touch()
+        self._force = True
+        self._wake.set()
+
+    def wait_for_update(self, version, timeout=60):
+        """version 이후의 새 스냅샷(또는 오류)이 나올 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        fetch_count = self.fetch_count
+        while time.monotonic() < deadline:
+            if self.version != version or self.fetch_count != fetch_count: return True
+            time.sleep(0.2)
+        return False
+
+    def snapshot(self):
+        """(data, version, last_updated, last_error) 를 한 번에 읽기"""
+        with self._lock:
+            return self.data, self.version, self.last_updated, self.last_error
+
+    def freshness(self):
+        """(마지막 성공 후 경과 초 또는 None, 오래된 데이터인지, 이전 표를 대신 보여주는 대상 목록)
+        수집이 실패하는 동안에도 마지막 스냅샷은 그대로 두고 백그라운드에서 계속 다시 확인함"""
+        age = None if self.last_ok_at is None else time.time() - self.last_ok_at
+        # 실패 중인 대상이 있으면 그 대상의 표(가장 오래전에 성공한 것) 기준으로 나이를 셈
+        failing = [a for _, _, a in self.scheduler.failing() if a is not None] if self.scheduler else []
+        if failing: age = max([age or 0.0] + failing)
+        stale = age is not None and age > (STALE_AFTER or 2 * self.interval)
+        return age, stale, self.scheduler.stale_labels() if self.scheduler else []
+
+    def _source_errors(self):
+        """실패 중인 수집 대상의 오류 메시지 (스케줄러를 쓰지 않거나 모두 정상이면 None)"""
+        if self.scheduler is None: return None
+        many = len(self.scheduler.sources) > 1
+        return "\n".join(f"[{label}] {error}" if many else error for label, error, _ in self.scheduler.failing()) or None
+
+    def subscribe(self, fn):
+        """새 스냅샷이 발행될 때마다 fn(data, version, last_updated) 호출 (워커 스레드에서 실행)"""
+        self._listeners.append(fn)
+        return fn
+
+    def log(self, msg):
+        print(msg)
+
+    # --------------------------------------------------------------------------
+    # 워커 루프
+    # --------------------------------------------------------------------------
+    def refresh_stats(self):
+        """(처리된 갱신 수, 변경 없음으로 건너뛴 갱신 수)"""
+        if self.scheduler: return self.scheduler.stats()
+        if self.detector is None: return 0, 0
+        return self.detector.processed, self.detector.skipped
+
+    def _fetch(self):
+        if self._fetch_fn: return self._fetch_fn(self.log, detector=self.detector)
+        force, self._force = self._force, False
+        return self.scheduler.fetch(self.log, force=force)
+
+    def _next_wait(self):
+        """다음 수집까지 기다릴 시간 (대상별 주기/재시도 대기 중 가장 이른 것)"""
+        if self.scheduler is None: return self.interval
+        return min(self.interval, self.scheduler.seconds_until_due())
+
+    def _reload_mapping(self):
+        """election_config.toml이 바뀌었으면 다시 읽고, 같은 페이지라도 새 매핑으로 다시 파싱"""
+        import mapping_db
+        error = mapping_db.LAST_RELOAD_ERROR
+        if mapping_db.maybe_reload():
+            self.log(f"🔁 매핑 설정을 다시 읽었습니다 (version {mapping_db.CONFIG_VERSION})")
+            self.detector.invalidate()
+            if self.scheduler: self.scheduler.invalidate()
+        elif mapping_db.LAST_RELOAD_ERROR and mapping_db.LAST_RELOAD_ERROR != error:
+            self.log(f"⚠️ 매핑 설정 오류로 직전 설정을 유지합니다: {mapping_db.LAST_RELOAD_ERROR}")
+
+    def run_once(self):
+        """한 번 수집해서 발행 (새 스냅샷이 발행되면 True)"""
+        from scraper import FetchError, ChangeDetector
+        from enrich import enrich_snapshot
+        from forecast import TurnoutForecaster
+        from schema import to_snapshot
+        from aggregate import rollup
+        if self.detector is None: self.detector = ChangeDetector()
+        if self.forecaster is None: self.forecaster = TurnoutForecaster()
+        try:
+            # 수집 대상 목록(sources.toml)/매핑 설정 오류도 수집 실패로 기록하고 다음 주기에 다시 시도
+            if self._fetch_fn is None and self.scheduler is None:
+                from sources import SourceScheduler, load_sources
+                self.scheduler = SourceScheduler(self.sources or load_sources(), self.interval, wake=self._wake.set)
+            self._reload_mapping()
+            with metrics.span("fetch"): new_data = self._fetch()
+        except FetchError as e:
+            if self.scheduler is None: metrics.inc("fetch_errors")  # 스케줄러는 대상별로 이미 셈
+            metrics.export()
+            with self._lock:
+                self.last_error = str(e)
+                self.fetch_count += 1
+            return False
+        except Exception as e:
+            self.log(f"❌ 수집 워커 오류: {e}")
+            metrics.inc("fetch_errors")
+            metrics.export()
+            with self._lock:
+                self.last_error = f"❌ 실행 중 치명적 오류 발생: {e}"
+                self.fetch_count += 1
+            return False
+
+        # 변경 없음: 현재 스냅샷(version)을 그대로 유지해 세션들이 다시 그리지 않음
+        # 스케줄러는 실패한 대상이 있어도 이전 표로 None을 돌려주므로, 이번 라운드에 성공한 대상이 있을 때만 성공 시각을 갱신
+        if new_data is None or new_data.empty:
+            metrics.export()
+            with self._lock:
+                self.last_error = self._source_errors()
+                if self.scheduler is None or self.scheduler.round_ok: self.last_ok_at = time.time()
+                self.fetch_count += 1
+            return False
+
+        with metrics.span("enrich"): new_data = enrich_snapshot(new_data, self.data)
+        # 발행하는 스냅샷은 고정 dtype + 읽기 전용: 모든 세션이 복사 없이 같은 객체를 읽음 (schema.to_snapshot)
+        with metrics.span("forecast"): new_data = to_snapshot(self.forecaster.update(new_data))
+        # 선관위/구분별 집계는 발행 전에 한 번 계산 (구독자와 세션은 같은 결과를 읽음)
+        with metrics.span("aggregate"): rollup(new_data)
+        # 이력 저장을 발행보다 먼저: 새 버전으로 계산한 구간 증가분(app.window_snapshot)에 이번 스냅샷이 빠지지 않도록
+        if self.store:
+            try:
+                with metrics.span("history"): self.store.append(new_data)
+            except Exception as e: self.log(f"⚠️ 이력 저장 실패: {e}")
+        with self._lock:
+            self.data = new_data
+            self.version += 1
+            self.last_updated = datetime.now(KST).strftime("%m월 %d일 %H시 %M분 %S초")
+            self.last_error = self._source_errors()
+            self.last_ok_at = time.time()
+            self.fetch_count += 1
+
+        for fn in list(self._listeners):
+            try: fn(new_data, self.version, self.last_updated)
+            except Exception as e: self.log(f"⚠️ 스냅샷 구독자 오류: {e}")
+        metrics.inc("snapshots_published")
+        metrics.export()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_seen <= self.idle_timeout:
+                self._idle = False
+                try:
+                    self.run_once()
+                except Exception as e:  # 예상하지 못한 오류로 워커 스레드가 멈추지 않도록 (다음 주기에 다시 시도)
+                    self.log(f"❌ 수집 워커 오류: {e}")
+                    with self._lock:
+                        self.last_error = f"❌ 실행 중 치명적 오류 발생: {e}"
+                        self.fetch_count += 1
+            elif not self._idle:
+                self._idle = True
+                self.log("💤 접속자가 없어 폴링을 일시 중지합니다.")
+            self._wake.wait(self.interval if self._idle else self._next_wait())
+            self._wake.clear()